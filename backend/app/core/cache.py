@@ -0,0 +1,61 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class TTLCache:
+    """
+    Cache em memória do processo, com expiração (TTL) e limite de tamanho (LRU).
+    Thread-safe: as rotas síncronas do FastAPI rodam em um pool de threads.
+
+    Cada worker/processo tem o seu; por isso toda escrita relevante precisa
+    invalidar a chave (ver os hooks em crud/) e o TTL limita o que escapar disso.
+    """
+
+    def __init__(self, ttl_segundos: float, max_itens: int):
+        self.ttl_segundos = ttl_segundos
+        self.max_itens = max_itens
+        self._itens: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, chave: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                return default
+
+            expira_em, valor = item
+            if expira_em <= time.monotonic():
+                del self._itens[chave]
+                return default
+
+            self._itens.move_to_end(chave)
+            return valor
+
+    def set(self, chave: Hashable, valor: Any) -> None:
+        if self.ttl_segundos <= 0 or self.max_itens <= 0:
+            return  # cache desligado por configuração
+
+        with self._lock:
+            self._itens[chave] = (time.monotonic() + self.ttl_segundos, valor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def invalidate(self, chave: Hashable) -> None:
+        with self._lock:
+            self._itens.pop(chave, None)
+
+    def invalidate_where(self, predicado: Callable[[Hashable], bool]) -> None:
+        """Remove todas as chaves para as quais `predicado(chave)` é verdadeiro."""
+        with self._lock:
+            for chave in [c for c in self._itens if predicado(c)]:
+                del self._itens[chave]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._itens.clear()
+
+    def __len__(self) -> int:
+        return len(self._itens)
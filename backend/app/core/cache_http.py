@@ -0,0 +1,60 @@
+"""
+Cache HTTP (ETag / If-None-Match / Cache-Control) das rotas de leitura.
+
+O ETag vem de um contador de versão gravado no banco (ligas.ranking_versao,
+versao_tabela), não de um hash do corpo: dá para responder 304 sem montar a
+resposta. Quem escreve incrementa a versão na mesma transação.
+
+Dados de referência (times, competições, temporadas) mudam poucas vezes por ano,
+mas as rotas exigem login: saem com Cache-Control privado (só o navegador guarda,
+nunca CDN/proxy) e são revalidadas pelo ETag a cada uso, então a edição de um
+admin aparece na hora e o que não mudou custa um 304.
+"""
+
+import os
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+
+from app.crud.versao_tabela import versao_tabela
+from app.database import get_db
+
+# Segundos que o navegador usa a cópia sem revalidar (0 = revalida sempre). Com
+# valor > 0, a edição de um admin pode levar até isso para aparecer.
+REFERENCIA_CACHE_MAX_AGE = int(os.getenv("REFERENCIA_CACHE_MAX_AGE", "0"))
+
+# private: as rotas exigem login, então cache compartilhado (CDN, proxy) não pode
+# servir a resposta a quem não mandou Authorization
+CACHE_CONTROL_REFERENCIA = (
+    f"private, max-age={REFERENCIA_CACHE_MAX_AGE}" if REFERENCIA_CACHE_MAX_AGE > 0 else "private, no-cache"
+)
+
+
+def nao_modificado(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in (t.strip() for t in if_none_match.split(","))
+
+
+def resposta_304(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def cache_referencia(tabela: str):
+    """
+    Dependência das rotas GET de uma tabela de referência: ETag pela versão da
+    tabela e Cache-Control privado. If-None-Match igual responde 304 sem
+    executar a rota. Declare depois da autenticação:
+
+        def listar(..., usuario_logado=Depends(get_current_user), _=Depends(cache_referencia("times"))):
+    """
+
+    def dependencia(request: Request, response: Response, db: Session = Depends(get_db)) -> None:
+        etag = f'"{tabela}-v{versao_tabela(db, tabela)}"'
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL_REFERENCIA}
+        if nao_modificado(request, etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+
+    return dependencia
@@ -0,0 +1,77 @@
+"""
+Compressão gzip das respostas (GZipMiddleware do Starlette), só acima de
+COMPRESSION_MIN_BYTES e se o cliente aceitar gzip. O GZipMiddleware já faz
+streaming, Vary: Accept-Encoding e não mexe em respostas que já têm
+Content-Encoding.
+
+ETags fortes: a versão comprimida é outra representação, então o ETag ganha o
+sufixo da codificação ("times-v3" -> "times-v3-gzip"). Na entrada, o sufixo é
+tirado do If-None-Match, e as rotas comparam com o próprio ETag sem saber da
+compressão; o 304 devolve o ETag com o sufixo que o cliente mandou.
+"""
+
+import os
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware
+
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+# 6 é o padrão do gzip: o 9 do Starlette custa bem mais CPU para quase nada em JSON
+GZIP_COMPRESSLEVEL = int(os.getenv("GZIP_COMPRESSLEVEL", "6"))
+
+CODIFICACAO = "gzip"
+_SUFIXO = f'-{CODIFICACAO}"'
+
+
+def _com_sufixo(etag: str) -> str:
+    if etag.startswith("W/") or not etag.endswith('"'):
+        return etag  # fraco: a comparação fraca já ignora a codificação
+    return etag[:-1] + _SUFIXO
+
+
+def _sem_sufixo(etag: str) -> tuple[str, bool]:
+    if not etag.startswith("W/") and etag.endswith(_SUFIXO):
+        return etag[: -len(_SUFIXO)] + '"', True
+    return etag, False
+
+
+class CompressaoMiddleware:
+    """Middleware ASGI: GZipMiddleware acima de minimum_size bytes, com ETag por codificação."""
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_BYTES):
+        self.app = GZipMiddleware(app, minimum_size=minimum_size, compresslevel=GZIP_COMPRESSLEVEL)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        aceita_gzip = CODIFICACAO in headers.get("accept-encoding", "")
+
+        # If-None-Match com ETags da versão comprimida: a rota só conhece o ETag base
+        cliente_mandou_sufixo = False
+        if_none_match = headers.get("if-none-match")
+        if if_none_match:
+            etags = []
+            for etag in if_none_match.split(","):
+                base, com_sufixo = _sem_sufixo(etag.strip())
+                etags.append(base)
+                cliente_mandou_sufixo = cliente_mandou_sufixo or com_sufixo
+            # troca no próprio scope (não numa cópia): o roteador grava scope["route"]
+            # nele e o MetricasHTTPMiddleware lê depois
+            scope["headers"] = [(k, v) for k, v in scope["headers"] if k != b"if-none-match"]
+            scope["headers"].append((b"if-none-match", ", ".join(etags).encode("latin-1")))
+
+        async def send_com_etag(message):
+            if message["type"] == "http.response.start":
+                saida = MutableHeaders(raw=message["headers"])
+                etag = saida.get("etag")
+                if etag and aceita_gzip:
+                    if saida.get("content-encoding") == CODIFICACAO:
+                        saida["etag"] = _com_sufixo(etag)
+                    elif message["status"] == 304 and cliente_mandou_sufixo:
+                        saida["etag"] = _com_sufixo(etag)
+            await send(message)
+
+        await self.app(scope, receive, send_com_etag)
@@ -1,34 +1,77 @@
 from fastapi import Depends, HTTPException, status
 from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app import database
+from app.database import get_async_db, get_async_read_db, get_db
 from app.models.usuario import Usuario
 from app.core.security import oauth2_scheme, SECRET_KEY, ALGORITHM
-from app.crud.usuario import buscar_usuario_por_id
+from app.core.user_cache import obter_usuario, obter_usuario_async
 
 
-def get_current_user(
-        token: str = Depends(oauth2_scheme),
-        db: Session = Depends(get_db)
-) -> Usuario:
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Não foi possível validar as credenciais",
         headers={"WWW-Autenticate": "bearer"},
         )
-    
+
+
+async def get_token_payload(token: str = Depends(oauth2_scheme)) -> dict:
+    """
+    Payload do JWT já validado (assinatura, exp e sub), sem tocar no banco.
+    async: só CPU, roda no event loop em vez de ocupar uma thread do pool.
+    """
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=ALGORITHM)
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
     except JWTError:
-        raise credentials_exception
-    
-    usuario = buscar_usuario_por_id(db, int(user_id))
+        raise _credentials_exception()
+
+    user_id = payload.get("sub")
+    if user_id is None or not str(user_id).isdigit():
+        raise _credentials_exception()
+
+    return payload
+
+
+def get_current_user(
+        payload: dict = Depends(get_token_payload),
+        db: Session = Depends(get_db)
+) -> Usuario:
+    # cache em memória por id (ver core/user_cache.py); invalidado pelo crud de usuário
+    usuario = obter_usuario(db, int(payload["sub"]))
+    if usuario is None:
+        raise _credentials_exception()
+
+    return usuario
+
+
+async def get_current_user_async(
+        payload: dict = Depends(get_token_payload),
+        db: AsyncSession = Depends(get_async_db)
+) -> Usuario:
+    """get_current_user para rotas async def (mesma AsyncSession da rota)."""
+    usuario = await obter_usuario_async(db, int(payload["sub"]))
+    if usuario is None:
+        raise _credentials_exception()
+
+    return usuario
+
+
+async def get_current_user_async_read(
+        payload: dict = Depends(get_token_payload),
+        db: AsyncSession = Depends(get_async_read_db)
+) -> Usuario:
+    """
+    get_current_user_async para rotas que leem com get_async_read_db: usa a mesma
+    sessão da rota, então a requisição ocupa uma conexão só (e não uma do primário
+    mais uma da leitura). Sem réplica configurada a sessão é do primário e pode
+    preencher o cache normalmente.
+    """
+    sem_replica = database.ASYNC_DATABASE_READ_URL is None
+    usuario = await obter_usuario_async(db, int(payload["sub"]), guardar=sem_replica)
     if usuario is None:
-        raise credentials_exception
-    
+        raise _credentials_exception()
 
     return usuario
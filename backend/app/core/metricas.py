@@ -0,0 +1,385 @@
+"""
+Métricas do processo no formato de texto do Prometheus (exposition format 0.0.4).
+
+Registro próprio, sem prometheus_client: contadores, medidores e histogramas
+com rótulos, thread-safe (rotas síncronas rodam num pool de threads). O GET
+/metrics (app/routes/metricas.py) devolve renderizar(); o worker de push pode
+expor o mesmo registro numa porta própria com servir_metricas().
+
+O que é medido:
+  - HTTP (MetricasHTTPMiddleware): latência por método/rota/status e
+    requisições em andamento;
+  - pool do banco (registrar_pool, chamado em app/database.py): checkouts,
+    conexões novas, invalidações e timeouts, mais o estado do pool
+    (em uso, overflow, livres) lido na hora da coleta;
+  - alertas de push (app/services/push_scheduler.py): jogos varridos, envios,
+    tokens desativados, offsets pulados, reenvios, descartes, falhas e duração de cada tick.
+
+Os valores são por processo: com vários workers do uvicorn, cada scrape cai num
+deles. Para somar, raspe cada processo (ou rode um worker por container).
+"""
+
+import math
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Token exigido em Authorization: Bearer <token> no /metrics. Vazio: aberto.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+BUCKETS_PADRAO = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _formatar_rotulos(nomes: tuple[str, ...], valores: tuple, extra: str = "") -> str:
+    pares = [f'{n}="{_escapar(v)}"' for n, v in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+def _formatar_valor(valor: float) -> str:
+    if math.isinf(valor):
+        return "+Inf" if valor > 0 else "-Inf"
+    if float(valor).is_integer():
+        return str(int(valor))
+    return repr(float(valor))
+
+
+class _Metrica:
+    tipo = ""
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Iterable[str] = ()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._valores: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+        if not self.rotulos and self.tipo != "histogram":
+            self._valores[()] = 0  # série única: aparece zerada desde o primeiro scrape
+
+    def _chave(self, rotulos: dict) -> tuple:
+        if set(rotulos) != set(self.rotulos):
+            raise ValueError(f"{self.nome}: rótulos esperados {self.rotulos}, recebidos {tuple(rotulos)}")
+        return tuple(str(rotulos[n]) for n in self.rotulos)
+
+    def _amostras(self) -> list[str]:
+        raise NotImplementedError
+
+    def renderizar(self) -> list[str]:
+        return [f"# HELP {self.nome} {self.ajuda}", f"# TYPE {self.nome} {self.tipo}", *self._amostras()]
+
+
+class Contador(_Metrica):
+    tipo = "counter"
+
+    def inc(self, valor: float = 1, **rotulos) -> None:
+        if valor < 0:
+            raise ValueError("contador só aumenta")
+        chave = self._chave(rotulos)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+
+    def _amostras(self) -> list[str]:
+        with self._lock:
+            itens = sorted(self._valores.items())
+        return [f"{self.nome}{_formatar_rotulos(self.rotulos, k)} {_formatar_valor(v)}" for k, v in itens]
+
+
+class Medidor(_Metrica):
+    tipo = "gauge"
+
+    def set(self, valor: float, **rotulos) -> None:
+        chave = self._chave(rotulos)
+        with self._lock:
+            self._valores[chave] = valor
+
+    def inc(self, valor: float = 1, **rotulos) -> None:
+        chave = self._chave(rotulos)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+
+    def dec(self, valor: float = 1, **rotulos) -> None:
+        self.inc(-valor, **rotulos)
+
+    _amostras = Contador._amostras
+
+
+class Histograma(_Metrica):
+    tipo = "histogram"
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Iterable[str] = (), buckets: Iterable[float] = BUCKETS_PADRAO):
+        super().__init__(nome, ajuda, rotulos)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, valor: float, **rotulos) -> None:
+        chave = self._chave(rotulos)
+        with self._lock:
+            serie = self._valores.get(chave)
+            if serie is None:
+                # [contagem por bucket (não cumulativa)..., +Inf, soma]
+                serie = self._valores[chave] = [0] * (len(self.buckets) + 1) + [0.0]
+            i = 0
+            while i < len(self.buckets) and valor > self.buckets[i]:
+                i += 1
+            serie[i] += 1
+            serie[-1] += valor
+
+    def _amostras(self) -> list[str]:
+        with self._lock:
+            itens = sorted((k, list(v)) for k, v in self._valores.items())
+
+        linhas = []
+        for chave, serie in itens:
+            acumulado = 0
+            for limite, contagem in zip((*self.buckets, math.inf), serie[:-1]):
+                acumulado += contagem
+                le = 'le="' + _formatar_valor(limite) + '"'
+                linhas.append(f"{self.nome}_bucket{_formatar_rotulos(self.rotulos, chave, le)} {acumulado}")
+            rotulos = _formatar_rotulos(self.rotulos, chave)
+            linhas.append(f"{self.nome}_sum{rotulos} {_formatar_valor(serie[-1])}")
+            linhas.append(f"{self.nome}_count{rotulos} {acumulado}")
+        return linhas
+
+
+class Registro:
+    """Métricas registradas + coletores chamados a cada scrape (valores lidos na hora)."""
+
+    def __init__(self):
+        self._metricas: dict[str, _Metrica] = {}
+        self._coletores: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def _registrar(self, metrica: _Metrica) -> _Metrica:
+        with self._lock:
+            if metrica.nome in self._metricas:
+                raise ValueError(f"métrica já registrada: {metrica.nome}")
+            self._metricas[metrica.nome] = metrica
+        return metrica
+
+    def contador(self, nome: str, ajuda: str, rotulos: Iterable[str] = ()) -> Contador:
+        return self._registrar(Contador(nome, ajuda, rotulos))
+
+    def medidor(self, nome: str, ajuda: str, rotulos: Iterable[str] = ()) -> Medidor:
+        return self._registrar(Medidor(nome, ajuda, rotulos))
+
+    def histograma(self, nome: str, ajuda: str, rotulos: Iterable[str] = (), buckets: Iterable[float] = BUCKETS_PADRAO) -> Histograma:
+        return self._registrar(Histograma(nome, ajuda, rotulos, buckets))
+
+    def coletor(self, funcao: Callable[[], None]) -> None:
+        with self._lock:
+            self._coletores.append(funcao)
+
+    def renderizar(self) -> str:
+        with self._lock:
+            coletores = list(self._coletores)
+            metricas = list(self._metricas.values())
+        for coletar in coletores:
+            coletar()
+        linhas = []
+        for metrica in metricas:
+            linhas.extend(metrica.renderizar())
+        return "\n".join(linhas) + "\n"
+
+
+REGISTRO = Registro()
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+HTTP_DURACAO = REGISTRO.histograma(
+    "http_request_duration_seconds",
+    "Latência das requisições HTTP, por método, rota (template) e status.",
+    ("method", "route", "status"),
+)
+HTTP_EM_ANDAMENTO = REGISTRO.medidor(
+    "http_requests_in_progress",
+    "Requisições HTTP sendo atendidas agora, por método.",
+    ("method",),
+)
+
+# rota sem match (404) ou fora do roteador: um rótulo só, para não explodir a cardinalidade
+ROTA_DESCONHECIDA = "desconhecida"
+
+
+def _rota(scope) -> str:
+    rota = scope.get("route")
+    return getattr(rota, "path", None) or ROTA_DESCONHECIDA
+
+
+class MetricasHTTPMiddleware:
+    """Middleware ASGI: latência por rota (template, não o caminho com ids) e requisições em andamento."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metodo = scope["method"]
+        status = {"codigo": 500}
+
+        async def send_com_status(message):
+            if message["type"] == "http.response.start":
+                status["codigo"] = message["status"]
+            await send(message)
+
+        HTTP_EM_ANDAMENTO.inc(method=metodo)
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_com_status)
+        except PoolTimeoutError:
+            DB_POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            HTTP_EM_ANDAMENTO.dec(method=metodo)
+            HTTP_DURACAO.observe(
+                time.perf_counter() - inicio,
+                method=metodo,
+                route=_rota(scope),
+                status=status["codigo"],
+            )
+
+
+# ---------------------------------------------------------------------------
+# Pool do banco
+# ---------------------------------------------------------------------------
+
+DB_POOL_CHECKOUTS = REGISTRO.contador(
+    "db_pool_checkouts_total", "Conexões retiradas do pool.", ("engine",)
+)
+DB_POOL_CONEXOES = REGISTRO.contador(
+    "db_pool_connections_created_total", "Conexões novas abertas com o banco.", ("engine",)
+)
+DB_POOL_INVALIDADAS = REGISTRO.contador(
+    "db_pool_invalidations_total", "Conexões invalidadas (queda, pre-ping falhou).", ("engine",)
+)
+DB_POOL_TIMEOUTS = REGISTRO.contador(
+    "db_pool_timeouts_total",
+    "Requisições que falharam esperando conexão livre (pool_timeout estourado).",
+)
+DB_POOL_EM_USO = REGISTRO.medidor(
+    "db_pool_checked_out", "Conexões do pool em uso agora.", ("engine",)
+)
+DB_POOL_OVERFLOW = REGISTRO.medidor(
+    "db_pool_overflow", "Conexões abertas além de pool_size (max_overflow).", ("engine",)
+)
+DB_POOL_LIVRES = REGISTRO.medidor(
+    "db_pool_checked_in", "Conexões ociosas no pool.", ("engine",)
+)
+DB_POOL_TAMANHO = REGISTRO.medidor(
+    "db_pool_size", "pool_size configurado.", ("engine",)
+)
+
+_pools: dict[str, object] = {}
+
+
+def registrar_pool(engine, nome: str) -> None:
+    """Conta os eventos do pool de um engine e inclui o estado dele em cada scrape."""
+    event.listen(engine, "checkout", lambda *_: DB_POOL_CHECKOUTS.inc(engine=nome))
+    event.listen(engine, "connect", lambda *_: DB_POOL_CONEXOES.inc(engine=nome))
+    event.listen(engine, "invalidate", lambda *_: DB_POOL_INVALIDADAS.inc(engine=nome))
+    _pools[nome] = engine.pool
+
+
+def _coletar_pools() -> None:
+    for nome, pool in _pools.items():
+        # NullPool/StaticPool não têm esses contadores: só os eventos valem para eles
+        if hasattr(pool, "checkedout"):
+            DB_POOL_EM_USO.set(pool.checkedout(), engine=nome)
+        if hasattr(pool, "overflow"):
+            # QueuePool conta overflow negativo enquanto o pool não encheu
+            DB_POOL_OVERFLOW.set(max(0, pool.overflow()), engine=nome)
+        if hasattr(pool, "checkedin"):
+            DB_POOL_LIVRES.set(pool.checkedin(), engine=nome)
+        if hasattr(pool, "size"):
+            DB_POOL_TAMANHO.set(pool.size(), engine=nome)
+
+
+REGISTRO.coletor(_coletar_pools)
+
+
+# ---------------------------------------------------------------------------
+# Alertas de push (run_missing_bet_alerts)
+# ---------------------------------------------------------------------------
+
+PUSH_TICKS = REGISTRO.contador("push_alerts_ticks_total", "Execuções de run_missing_bet_alerts.")
+PUSH_FALHAS = REGISTRO.contador("push_alerts_tick_failures_total", "Execuções que terminaram em exceção.")
+PUSH_JOGOS = REGISTRO.contador("push_alerts_games_scanned_total", "Jogos com alerta vencido processados.")
+PUSH_ENVIADOS = REGISTRO.contador("push_alerts_sent_total", "Pushes entregues ao FCM sem erro.")
+PUSH_TOKENS_DESATIVADOS = REGISTRO.contador(
+    "push_alerts_tokens_disabled_total", "Tokens desativados por não estarem mais registrados."
+)
+PUSH_OFFSETS_PULADOS = REGISTRO.contador(
+    "push_alerts_skipped_offsets_total", "Alertas vencidos baixados sem envio porque um offset mais próximo do jogo também venceu."
+)
+PUSH_REENVIOS = REGISTRO.contador(
+    "push_alerts_retries_total", "Alertas cujo envio falhou e voltaram para a fila."
+)
+PUSH_DESCARTADOS = REGISTRO.contador(
+    "push_alerts_dropped_total", "Alertas abandonados depois de PUSH_MAX_TENTATIVAS falhas."
+)
+PUSH_DURACAO = REGISTRO.histograma(
+    "push_alerts_tick_duration_seconds",
+    "Duração de cada execução de run_missing_bet_alerts.",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+
+
+def registrar_tick_push(duracao: float, stats: dict | None) -> None:
+    """stats é o dict devolvido por run_missing_bet_alerts; None se o tick falhou."""
+    PUSH_TICKS.inc()
+    PUSH_DURACAO.observe(duracao)
+    if stats is None:
+        PUSH_FALHAS.inc()
+        return
+    PUSH_JOGOS.inc(stats.get("jogos", 0))
+    PUSH_ENVIADOS.inc(stats.get("enviados", 0))
+    PUSH_TOKENS_DESATIVADOS.inc(stats.get("tokens_desativados", 0))
+    PUSH_OFFSETS_PULADOS.inc(stats.get("offsets_pulados", 0))
+    PUSH_REENVIOS.inc(stats.get("reenvios", 0))
+    PUSH_DESCARTADOS.inc(stats.get("descartados", 0))
+
+
+# ---------------------------------------------------------------------------
+# Servidor próprio (processos sem FastAPI, como o worker de push)
+# ---------------------------------------------------------------------------
+
+class _HandlerMetricas(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        if METRICS_TOKEN and self.headers.get("Authorization") != f"Bearer {METRICS_TOKEN}":
+            self.send_error(401)
+            return
+        corpo = REGISTRO.renderizar().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, format, *args):
+        pass  # um scrape a cada 15s não precisa ir para o log
+
+
+def servir_metricas(porta: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Sobe GET /metrics numa thread daemon; devolve o servidor (shutdown() para parar)."""
+    servidor = ThreadingHTTPServer((host, porta), _HandlerMetricas)
+    threading.Thread(target=servidor.serve_forever, name="metricas", daemon=True).start()
+    return servidor
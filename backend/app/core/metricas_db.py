@@ -0,0 +1,127 @@
+"""
+Consultas SQL por requisição: quantidade e tempo acumulado no banco.
+
+Os hooks de cursor (registrar_metricas, chamado em app/database.py para cada
+engine) somam em EstatisticasConsultas da requisição atual, guardada num
+ContextVar. O MetricasDBMiddleware abre esse contexto e devolve os totais nos
+cabeçalhos X-DB-Queries / X-DB-Time-Ms / Server-Timing.
+
+Fora de requisição (workers, scripts), use contar_consultas() para medir um
+trecho. Consultas acima de SLOW_QUERY_MS vão para o log em qualquer caso.
+"""
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# Consultas mais lentas que isso são logadas (WARNING). 0 desliga.
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+
+# Expor os totais nos cabeçalhos das respostas
+DB_METRICS_HEADERS = os.getenv("DB_METRICS_HEADERS", "true").lower() == "true"
+
+
+@dataclass
+class EstatisticasConsultas:
+    consultas: int = 0
+    tempo_ms: float = 0.0
+    rota: str | None = None
+
+
+_atual: ContextVar[EstatisticasConsultas | None] = ContextVar("estatisticas_consultas", default=None)
+
+
+def estatisticas_atuais() -> EstatisticasConsultas | None:
+    return _atual.get()
+
+
+@contextmanager
+def contar_consultas(rota: str | None = None):
+    """
+    Conta as consultas feitas dentro do bloco (na mesma thread/task ou em threads
+    que herdaram o contexto, como as rotas síncronas do FastAPI).
+
+        with contar_consultas() as est:
+            run_missing_bet_alerts(db)
+        assert est.consultas <= 6
+    """
+    estatisticas = EstatisticasConsultas(rota=rota)
+    token = _atual.set(estatisticas)
+    try:
+        yield estatisticas
+    finally:
+        _atual.reset(token)
+
+
+def _antes(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("inicio_consultas", []).append(time.perf_counter())
+
+
+def _depois(conn, cursor, statement, parameters, context, executemany):
+    inicios = conn.info.get("inicio_consultas")
+    if not inicios:
+        return
+    duracao_ms = (time.perf_counter() - inicios.pop()) * 1000
+
+    estatisticas = _atual.get()
+    if estatisticas is not None:
+        estatisticas.consultas += 1
+        estatisticas.tempo_ms += duracao_ms
+
+    if SLOW_QUERY_MS > 0 and duracao_ms >= SLOW_QUERY_MS:
+        logger.warning(
+            "Consulta lenta (%.1f ms)%s: %s",
+            duracao_ms,
+            f" em {estatisticas.rota}" if estatisticas is not None and estatisticas.rota else "",
+            " ".join(statement.split())[:1000],
+        )
+
+
+def _erro(contexto_excecao):
+    # sem after_cursor_execute quando o statement falha: descarta o início pendente
+    conn = contexto_excecao.connection
+    inicios = conn.info.get("inicio_consultas") if conn is not None else None
+    if inicios:
+        inicios.pop()
+
+
+def registrar_metricas(engine) -> None:
+    """Liga os hooks de contagem/tempo num engine (síncrono ou o sync_engine de um async)."""
+    event.listen(engine, "before_cursor_execute", _antes)
+    event.listen(engine, "after_cursor_execute", _depois)
+    event.listen(engine, "handle_error", _erro)
+
+
+class MetricasDBMiddleware:
+    """Middleware ASGI: um EstatisticasConsultas por requisição HTTP, totais nos cabeçalhos."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with contar_consultas(rota=f"{scope['method']} {scope['path']}") as estatisticas:
+
+            async def send_com_metricas(message):
+                if message["type"] == "http.response.start" and DB_METRICS_HEADERS:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-db-queries", str(estatisticas.consultas).encode()))
+                    headers.append((b"x-db-time-ms", f"{estatisticas.tempo_ms:.1f}".encode()))
+                    headers.append((
+                        b"server-timing",
+                        f'db;dur={estatisticas.tempo_ms:.1f};desc="{estatisticas.consultas} consultas"'.encode(),
+                    ))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_com_metricas)
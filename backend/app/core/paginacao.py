@@ -0,0 +1,74 @@
+import base64
+import json
+from typing import Any, Callable, Sequence
+
+from fastapi import HTTPException, Query
+from sqlalchemy import literal, tuple_
+
+LIMITE_PADRAO = 50
+LIMITE_MAXIMO = 200
+
+
+class ParametrosPagina:
+    """
+    Dependência das rotas paginadas. Sem `limit` nem `cursor` a rota devolve a
+    lista completa (formato antigo); com qualquer um deles devolve uma Pagina.
+    """
+
+    def __init__(
+        self,
+        limit: int | None = Query(None, ge=1, le=LIMITE_MAXIMO),
+        cursor: str | None = Query(None, description="next_cursor da página anterior"),
+    ):
+        self.paginado = limit is not None or cursor is not None
+        self.limit = limit or LIMITE_PADRAO
+        self.cursor = cursor
+
+    def chave(self, *tipos: Callable[[Any], Any]) -> list | None:
+        """
+        Valores do cursor convertidos por `tipos` (um por coluna da chave; None é
+        mantido), ou None na primeira página.
+        """
+        if self.cursor is None:
+            return None
+
+        valores = decodificar_cursor(self.cursor, len(tipos))
+        try:
+            return [None if v is None else tipo(v) for tipo, v in zip(tipos, valores)]
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Cursor inválido.")
+
+
+def codificar_cursor(valores: Sequence[Any]) -> str:
+    """Chave (keyset) do último item da página, opaca para o cliente."""
+    bruto = json.dumps([v.isoformat() if hasattr(v, "isoformat") else v for v in valores], separators=(",", ":"))
+    return base64.urlsafe_b64encode(bruto.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str, tamanho: int) -> list:
+    """Valores da chave, na ordem em que foram codificados (datas voltam como str ISO)."""
+    try:
+        valores = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        valores = None
+    if not isinstance(valores, list) or len(valores) != tamanho:
+        raise HTTPException(status_code=400, detail="Cursor inválido.")
+    return valores
+
+
+def depois_de(colunas: Sequence, valores: Sequence):
+    """WHERE (c1, c2, ...) > (v1, v2, ...): continua a ordenação ascendente pelas colunas."""
+    if len(colunas) == 1:
+        return colunas[0] > valores[0]
+    return tuple_(*colunas) > tuple_(*(literal(v, c.type) for c, v in zip(colunas, valores)))
+
+
+def montar_pagina(itens: list, limit: int, chave: Callable[[Any], Sequence[Any]]) -> dict:
+    """`itens` deve vir com limit + 1 linhas: a sobra só indica que há próxima página."""
+    tem_mais = len(itens) > limit
+    itens = itens[:limit]
+    return {
+        "items": itens,
+        "next_cursor": codificar_cursor(chave(itens[-1])) if tem_mais else None,
+        "limit": limit,
+    }
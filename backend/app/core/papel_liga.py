@@ -0,0 +1,90 @@
+import os
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.liga_roles import LigaRole
+from app.models.liga_membro import LigaMembro
+
+# 0 desliga o cache entre requisições (o memo da requisição continua valendo)
+LIGA_PAPEL_CACHE_TTL_SECONDS = float(os.getenv("LIGA_PAPEL_CACHE_TTL_SECONDS", "30"))
+LIGA_PAPEL_CACHE_MAX_SIZE = int(os.getenv("LIGA_PAPEL_CACHE_MAX_SIZE", "50000"))
+
+_cache = TTLCache(LIGA_PAPEL_CACHE_TTL_SECONDS, LIGA_PAPEL_CACHE_MAX_SIZE)
+
+# chave do memo da requisição em Session.info (uma sessão por requisição, via get_db)
+_MEMO = "papeis_liga"
+
+_AUSENTE = object()
+
+
+def _memo(db: Session | AsyncSession) -> dict:
+    return db.info.setdefault(_MEMO, {})
+
+
+def _select_papel(liga_id: int, usuario_id: int):
+    return select(LigaMembro.papel).where(
+        LigaMembro.liga_id == liga_id,
+        LigaMembro.usuario_id == usuario_id,
+    )
+
+
+def _guardar(memo: dict, chave: tuple[int, int], papel) -> LigaRole | None:
+    if papel is not None and not isinstance(papel, LigaRole):
+        papel = LigaRole(papel)
+    _cache.set(chave, papel)
+    memo[chave] = papel
+    return papel
+
+
+def obter_papel_liga(db: Session, liga_id: int, usuario_id: int) -> LigaRole | None:
+    """
+    Papel do usuário na liga (None se não for membro).
+
+    Ordem: memo da requisição -> cache do processo (TTL) -> banco. O resultado
+    negativo também é guardado; entrar_liga invalida a chave.
+    """
+    chave = (liga_id, usuario_id)
+
+    memo = _memo(db)
+    if chave in memo:
+        return memo[chave]
+
+    papel = _cache.get(chave, _AUSENTE)
+    if papel is not _AUSENTE:
+        memo[chave] = papel
+        return papel
+
+    return _guardar(memo, chave, db.execute(_select_papel(liga_id, usuario_id)).scalar())
+
+
+async def obter_papel_liga_async(db: AsyncSession, liga_id: int, usuario_id: int) -> LigaRole | None:
+    """Versão de obter_papel_liga para as rotas async (mesmo memo e mesmo cache)."""
+    chave = (liga_id, usuario_id)
+
+    memo = _memo(db)
+    if chave in memo:
+        return memo[chave]
+
+    papel = _cache.get(chave, _AUSENTE)
+    if papel is not _AUSENTE:
+        memo[chave] = papel
+        return papel
+
+    return _guardar(memo, chave, (await db.execute(_select_papel(liga_id, usuario_id))).scalar())
+
+
+def invalidar_papel_liga(db: Session, liga_id: int, usuario_id: int) -> None:
+    """Chamar depois de qualquer escrita em liga_membros daquele (liga, usuário)."""
+    _memo(db).pop((liga_id, usuario_id), None)
+    _cache.invalidate((liga_id, usuario_id))
+
+
+def invalidar_papeis_da_liga(db: Session, liga_id: int) -> None:
+    """Remove todos os papéis em cache de uma liga (ex.: liga excluída)."""
+    memo = _memo(db)
+    for chave in [c for c in memo if c[0] == liga_id]:
+        del memo[chave]
+    _cache.invalidate_where(lambda chave: chave[0] == liga_id)
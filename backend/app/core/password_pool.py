@@ -0,0 +1,106 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+logger = logging.getLogger(__name__)
+
+# Custo do bcrypt; ao mudar, os hashes antigos são refeitos no próximo login (needs_update)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+
+def _cpus_disponiveis() -> int:
+    # respeita o cpuset do container/taskset, que os.cpu_count() ignora
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover (macOS/Windows)
+        return os.cpu_count() or 2
+
+
+# Processos dedicados a hash/verify (0 = roda na thread atual, útil em scripts).
+# O padrão tem teto: cada processo é uma cópia do app, e com vários workers do
+# uvicorn por máquina um pool por CPU em cada um disputaria as mesmas CPUs.
+PASSWORD_POOL_WORKERS = int(os.getenv("PASSWORD_POOL_WORKERS", str(min(_cpus_disponiveis(), 4))))
+
+# Máximo de operações na fila + em execução; acima disso responde 503
+PASSWORD_POOL_MAX_PENDING = int(os.getenv("PASSWORD_POOL_MAX_PENDING", str(8 * max(1, PASSWORD_POOL_WORKERS))))
+
+# Fica neste módulo leve (só passlib) porque é importado nos processos do pool
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+_vagas = threading.BoundedSemaphore(max(1, PASSWORD_POOL_MAX_PENDING))
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def iniciar_pool() -> None:
+    """
+    Cria o pool e já sobe os processos. No servidor roda no startup (main.py),
+    antes de existir qualquer thread: fork com threads vivas pode copiar um lock
+    tomado por outra thread (logging, pool do banco) e travar o filho.
+    """
+    if PASSWORD_POOL_WORKERS > 0:
+        # com fork, o primeiro submit cria todos os processos antes da thread gerente do pool
+        _get_pool().submit(int).result()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # fork: spawn/forkserver reimportariam o __main__ (quebra seed.py e
+                # scripts sem guarda). O filho só executa passlib, não usa o banco.
+                # Criação tardia só sobra para scripts sem o startup do app.
+                _pool = ProcessPoolExecutor(
+                    max_workers=PASSWORD_POOL_WORKERS,
+                    mp_context=multiprocessing.get_context("fork"),
+                )
+    return _pool
+
+
+def _executar(fn, *args):
+    if PASSWORD_POOL_WORKERS <= 0:
+        return fn(*args)
+
+    if not _vagas.acquire(blocking=False):
+        logger.warning("Pool de senhas saturado (%s pendentes), recusando requisição", PASSWORD_POOL_MAX_PENDING)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servidor ocupado, tente novamente em instantes.",
+            headers={"Retry-After": "1"},
+        )
+
+    try:
+        return _get_pool().submit(fn, *args).result()
+    finally:
+        _vagas.release()
+
+
+def hash_senha(password: str) -> str:
+    return _executar(_hash, password)
+
+
+def verificar_e_atualizar_senha(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """(senha confere, novo hash se o custo/esquema mudou — senão None)."""
+    return _executar(_verify_and_update, plain_password, hashed_password)
+
+
+def encerrar_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
@@ -1,27 +1,53 @@
+from dataclasses import dataclass
+
 from fastapi import Depends, HTTPException, status
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, get_token_payload
+from app.core.security import AUTH_TRUST_TOKEN_FUNCAO
 from app.models.usuario import Usuario
-from app.models.liga_membro import LigaMembro
 from sqlalchemy.orm import Session
 
 from app.core.liga_roles import LigaRole
+from app.core.papel_liga import obter_papel_liga
 from app.database import get_db
 
 
-def require_admin(
-        usuario: Usuario = Depends(get_current_user)
-):
-    if usuario.funcao != "admin":
-        raise HTTPException(
+def _permissao_insuficiente() -> HTTPException:
+    return HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Permissão insuficiente"
         )
-    
-    return usuario
+
+
+@dataclass(frozen=True)
+class Admin:
+    """O que require_admin devolve nas duas variantes (com ou sem ida ao banco)."""
+    id: int
+    funcao: str
+
+
+def _require_admin_pelo_usuario(
+        usuario: Usuario = Depends(get_current_user)
+) -> Admin:
+    if usuario.funcao != "admin":
+        raise _permissao_insuficiente()
+
+    return Admin(id=usuario.id, funcao=usuario.funcao)
+
+
+def _require_admin_pelo_token(
+        payload: dict = Depends(get_token_payload)
+) -> Admin:
+    # AUTH_TRUST_TOKEN_FUNCAO: decide pela claim do login, sem ir ao banco.
+    if payload.get("funcao") != "admin":
+        raise _permissao_insuficiente()
+
+    return Admin(id=int(payload["sub"]), funcao=payload["funcao"])
+
+
+require_admin = _require_admin_pelo_token if AUTH_TRUST_TOKEN_FUNCAO else _require_admin_pelo_usuario
 
 def get_papel_liga(db: Session, liga_id: int, usuario_id: int) -> str | None:
-    membro = db.query(LigaMembro).filter(LigaMembro.liga_id == liga_id, LigaMembro.usuario_id == usuario_id).first()
-    return membro.papel if membro else None
+    return obter_papel_liga(db, liga_id, usuario_id)
 
 def require_liga_papel(db: Session, liga_id: int, usuario_id: int, roles: list[LigaRole]) -> LigaRole:
     papel = get_papel_liga(db, liga_id, usuario_id)
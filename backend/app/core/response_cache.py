@@ -0,0 +1,86 @@
+import json
+import logging
+import os
+from typing import Any, Hashable, Protocol
+
+from app.core.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# As chaves incluem ligas.ranking_versao: uma escrita nova muda a chave, então o
+# TTL só serve para liberar memória das versões antigas. 0 desliga o cache.
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "600"))
+RESPONSE_CACHE_MAX_SIZE = int(os.getenv("RESPONSE_CACHE_MAX_SIZE", "2000"))
+
+# Se definido (ex.: redis://localhost:6379/0), o cache é compartilhado entre workers
+RESPONSE_CACHE_REDIS_URL = os.getenv("RESPONSE_CACHE_REDIS_URL")
+
+
+class ResponseCache(Protocol):
+    def get(self, chave: Hashable) -> Any | None: ...
+
+    def set(self, chave: Hashable, valor: Any) -> None: ...
+
+
+class MemoriaResponseCache:
+    """LRU em memória do processo (cada worker tem o seu)."""
+
+    def __init__(self, ttl_segundos: float, max_itens: int):
+        self._cache = TTLCache(ttl_segundos, max_itens)
+
+    def get(self, chave: Hashable) -> Any | None:
+        return self._cache.get(chave)
+
+    def set(self, chave: Hashable, valor: Any) -> None:
+        self._cache.set(chave, valor)
+
+
+class RedisResponseCache:
+    """
+    Mesmo contrato, num Redis (ou compatível). Os valores são guardados como JSON,
+    então só servem payloads serializáveis (listas/dicts, como os das rotas de ranking).
+    Falhas do Redis viram miss: a rota recalcula em vez de responder 500.
+    """
+
+    def __init__(self, url: str, ttl_segundos: float, prefixo: str = "bolao:resp:"):
+        import redis  # opcional: só é necessário com RESPONSE_CACHE_REDIS_URL
+
+        self._redis = redis.Redis.from_url(url)
+        self._ttl = max(1, int(ttl_segundos))
+        self._prefixo = prefixo
+
+    def _chave(self, chave: Hashable) -> str:
+        return self._prefixo + ":".join(str(p) for p in chave) if isinstance(chave, tuple) else self._prefixo + str(chave)
+
+    def get(self, chave: Hashable) -> Any | None:
+        try:
+            bruto = self._redis.get(self._chave(chave))
+        except Exception:
+            logger.warning("Falha ao ler do cache Redis", exc_info=True)
+            return None
+        return None if bruto is None else json.loads(bruto)
+
+    def set(self, chave: Hashable, valor: Any) -> None:
+        try:
+            self._redis.setex(self._chave(chave), self._ttl, json.dumps(valor, default=str))
+        except Exception:
+            logger.warning("Falha ao gravar no cache Redis", exc_info=True)
+
+
+_cache: ResponseCache | None = None
+
+
+def get_response_cache() -> ResponseCache:
+    global _cache
+    if _cache is None:
+        if RESPONSE_CACHE_REDIS_URL and RESPONSE_CACHE_TTL_SECONDS > 0:
+            _cache = RedisResponseCache(RESPONSE_CACHE_REDIS_URL, RESPONSE_CACHE_TTL_SECONDS)
+        else:
+            _cache = MemoriaResponseCache(RESPONSE_CACHE_TTL_SECONDS, RESPONSE_CACHE_MAX_SIZE)
+    return _cache
+
+
+def set_response_cache(cache: ResponseCache) -> None:
+    """Troca o backend (ex.: outro cliente compatível com Redis)."""
+    global _cache
+    _cache = cache
@@ -0,0 +1,59 @@
+"""
+Resposta JSON rápida para listas grandes já montadas pelo serviço.
+
+Normalmente o FastAPI valida o retorno contra o response_model (um objeto
+Pydantic por item), converte de volta para dict e só então serializa com o json
+da stdlib. Para listas de dicts que o próprio serviço monta com os campos
+exatos do schema, isso é trabalho repetido: a rota pode devolver
+JSONRapidaResponse(dados) direto, que serializa com orjson sem passar pelo
+response_model (ele continua no decorator, para a documentação).
+
+Só use com dados confiáveis: nada é filtrado nem convertido, então chaves a
+mais vazam para o cliente. Datas saem no mesmo formato do Pydantic (UTC com "Z").
+Sem orjson instalado, cai no json da stdlib com o mesmo resultado.
+"""
+
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson  # opcional: acelera, mas o fallback gera o mesmo JSON
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def _padrao(valor: Any):
+    if isinstance(valor, datetime):
+        texto = valor.isoformat()
+        return texto[:-6] + "Z" if texto.endswith("+00:00") else texto
+    if isinstance(valor, date):
+        return valor.isoformat()
+    if hasattr(valor, "tolist"):  # escalares e arrays numpy (séries com cumsum)
+        return valor.tolist()
+    raise TypeError(f"Tipo não serializável em JSON: {type(valor).__name__}")
+
+
+def serializar_json(conteudo: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(
+            conteudo,
+            default=_padrao,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+    return json.dumps(
+        conteudo,
+        default=_padrao,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class JSONRapidaResponse(JSONResponse):
+    """JSONResponse serializado com orjson (ver o docstring do módulo)."""
+
+    def render(self, content: Any) -> bytes:
+        return serializar_json(content)
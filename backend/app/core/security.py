@@ -1,10 +1,12 @@
 from datetime import datetime, timedelta, timezone
 import os
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 
+# bcrypt roda num pool de processos dedicado (ver core/password_pool.py)
+from app.core.password_pool import pwd_context, hash_senha, verificar_e_atualizar_senha  # noqa: F401
+
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
@@ -19,16 +21,23 @@ if not ALGORITHM:
 if not ACCESS_TOKEN_EXPIRE_MINUTES:
     raise RuntimeError("ACCESS_TOKEN_EXPIRE_MINUTES não definido")
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Se "true", require_admin confia na claim "funcao" do JWT (gravada no login) e
+# não carrega o usuário. Contrapartida: rebaixar um admin só vale quando o token expirar.
+AUTH_TRUST_TOKEN_FUNCAO = os.getenv("AUTH_TRUST_TOKEN_FUNCAO", "false").lower() == "true"
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 # senha
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return hash_senha(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    valido, _ = verificar_e_atualizar_senha(plain_password, hashed_password)
+    return valido
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Como verify_password, mas devolve também o novo hash quando o custo do bcrypt mudou."""
+    return verificar_e_atualizar_senha(plain_password, hashed_password)
 
 
 # token
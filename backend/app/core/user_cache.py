@@ -0,0 +1,75 @@
+import os
+
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, defer, make_transient_to_detached
+
+from app.core.cache import TTLCache
+from app.models.usuario import Usuario
+
+# 0 desliga o cache
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+
+_cache = TTLCache(USER_CACHE_TTL_SECONDS, USER_CACHE_MAX_SIZE)
+
+# só as colunas; objetos ORM não podem ser compartilhados entre sessões.
+# O hash da senha fica fora: só o login lê (routes/auth.py, com consulta própria),
+# e assim ele não passa o TTL inteiro na memória de cada processo.
+_COLUNAS = tuple(c.key for c in inspect(Usuario).column_attrs if c.key != "senha")
+
+
+def obter_usuario(db: Session, usuario_id: int) -> Usuario | None:
+    """
+    Usuário pelo id, usando o cache em memória antes do banco.
+
+    No acerto, o snapshot vira uma instância persistente da sessão atual via
+    merge(load=False), sem SELECT; ela pode ser alterada e commitada normalmente.
+    `senha` vem sempre não carregada (deferred): ler dispara um SELECT, gravar
+    funciona como de costume.
+    """
+    dados = _cache.get(usuario_id)
+
+    if dados is None:
+        usuario = db.query(Usuario).options(defer(Usuario.senha)).filter(Usuario.id == usuario_id).first()
+        _guardar(usuario)
+        return usuario
+
+    return db.merge(_destacado(dados), load=False)
+
+
+async def obter_usuario_async(db: AsyncSession, usuario_id: int, guardar: bool = True) -> Usuario | None:
+    """
+    Versão de obter_usuario para as rotas async. Com guardar=False (sessão da
+    réplica) o cache é lido mas não preenchido: uma réplica atrasada não pode
+    repor no cache um usuário que acabou de ser invalidado.
+    """
+    dados = _cache.get(usuario_id)
+
+    if dados is None:
+        stmt = select(Usuario).options(defer(Usuario.senha)).where(Usuario.id == usuario_id)
+        usuario = (await db.execute(stmt)).scalar_one_or_none()
+        if guardar:
+            _guardar(usuario)
+        return usuario
+
+    return await db.merge(_destacado(dados), load=False)
+
+
+def _guardar(usuario: Usuario | None) -> None:
+    if usuario is not None:
+        _cache.set(usuario.id, {c: getattr(usuario, c) for c in _COLUNAS})
+
+
+def _destacado(dados: dict) -> Usuario:
+    usuario = Usuario(**dados)
+    make_transient_to_detached(usuario)
+    return usuario
+
+
+def invalidar_usuario(usuario_id: int) -> None:
+    _cache.invalidate(usuario_id)
+
+
+def limpar_cache_usuarios() -> None:
+    _cache.clear()
@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session
+from app.crud.versao_tabela import incrementar_versao
 from app.models.competicao import Competicao
 from app.schemas.competicao import CompeticaoCreate, CompeticaoUpdate
 
@@ -9,6 +10,7 @@ def criar_competicao(db: Session, body: CompeticaoCreate) -> Competicao:
         tipo=body.tipo.strip() if body.tipo else None,
     )
     db.add(obj)
+    incrementar_versao(db, "competicoes")
     db.commit()
     db.refresh(obj)
     return obj
@@ -27,10 +29,13 @@ def atualizar_competicao(db: Session, obj: Competicao, body: CompeticaoUpdate) -
     if body.tipo is not None:
         obj.tipo = body.tipo.strip() if body.tipo else None
 
+    incrementar_versao(db, "competicoes")
     db.commit()
     db.refresh(obj)
     return obj
 
 def deletar_competicao(db: Session, obj: Competicao) -> None:
     db.delete(obj)
+    # as temporadas da competição vão junto (cascade)
+    incrementar_versao(db, "competicoes", "temporadas")
     db.commit()
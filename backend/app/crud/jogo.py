@@ -1,11 +1,16 @@
 from datetime import datetime
 from zoneinfo import ZoneInfo
-from sqlalchemy import case, func
+from sqlalchemy import case, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, selectinload
+from app.core.paginacao import depois_de
 from app.models.jogo import Jogo
-from app.schemas.jogo import JogoCreate, JogoUpdate, JogoResultadoUpdate
+from app.schemas.jogo import JogoCreate, JogoUpdate, JogoResultadoUpdate, JogoResultadoLoteItem
 from app.models.palpite import Palpite
-from app.services.palpites import calcular_pontuacao 
+from app.services.palpites import pontuar_jogos
+from app.services.classificacao import estornar_jogos, invalidar_ranking_por_jogos
+from app.services.evolucao_ranking import atualizar_snapshots_rodadas
+from app.crud.push_alert_schedule import agendar_alertas_jogo
 
 
 TZ_SP = ZoneInfo("America/Sao_Paulo")
@@ -44,25 +49,53 @@ def criar_jogo(db: Session, body: JogoCreate) -> Jogo:
 
     jogo = Jogo(**data)
     db.add(jogo)
+    db.flush()
+
+    agendar_alertas_jogo(db, jogo)
+
     db.commit()
     db.refresh(jogo)
     return jogo
 
 
-def listar_jogos(db: Session, temporada_id: int | None = None, rodada: int | None = None):
-    q = (
-        db.query(Jogo)
+def _select_listar_jogos(
+    temporada_id: int | None = None,
+    rodada: int | None = None,
+    limite: int | None = None,
+    apos: list | None = None,
+):
+    stmt = (
+        select(Jogo)
         .options(
             selectinload(Jogo.time_casa),
             selectinload(Jogo.time_fora),
         )
     )
     if temporada_id is not None:
-        q = q.filter(Jogo.temporada_id == temporada_id)
+        stmt = stmt.where(Jogo.temporada_id == temporada_id)
     if rodada is not None:
-        q = q.filter(Jogo.rodada == rodada)
+        stmt = stmt.where(Jogo.rodada == rodada)
+
+    if limite is None:
+        return stmt.order_by(Jogo.data_hora.asc())
+
+    # paginado: chave (data_hora, id), jogos sem data no fim (ix_jogos_data_hora_id)
+    if apos is not None:
+        data_hora, jogo_id = apos
+        if data_hora is None:
+            stmt = stmt.where(Jogo.data_hora.is_(None), Jogo.id > jogo_id)
+        else:
+            stmt = stmt.where(or_(depois_de([Jogo.data_hora, Jogo.id], apos), Jogo.data_hora.is_(None)))
+
+    return stmt.order_by(Jogo.data_hora.asc().nulls_last(), Jogo.id.asc()).limit(limite)
 
-    return q.order_by(Jogo.data_hora.asc()).all()
+
+def listar_jogos(db: Session, temporada_id: int | None = None, rodada: int | None = None, limite: int | None = None, apos: list | None = None):
+    return db.execute(_select_listar_jogos(temporada_id, rodada, limite, apos)).scalars().all()
+
+
+async def listar_jogos_async(db: AsyncSession, temporada_id: int | None = None, rodada: int | None = None, limite: int | None = None, apos: list | None = None):
+    return (await db.execute(_select_listar_jogos(temporada_id, rodada, limite, apos))).scalars().all()
 
 
 def buscar_jogo(db: Session, jogo_id: int) -> Jogo | None:
@@ -85,6 +118,17 @@ def atualizar_jogo(db: Session, jogo: Jogo, body: JogoUpdate) -> Jogo:
     for k, v in data.items():
         setattr(jogo, k, v)
 
+    # horário ou status mudou: refaz a agenda de alertas de palpite pendente
+    if "data_hora" in data or "status" in data:
+        agendar_alertas_jogo(db, jogo)
+
+    # status mudou (ex.: jogo "desfinalizado" ou cancelado): muda jogos encerrados
+    # e aproveitamento no ranking, e a rodada pode ter fechado ou reaberto
+    if "status" in data:
+        db.flush()
+        invalidar_ranking_por_jogos(db, [jogo.id])
+        atualizar_snapshots_rodadas(db, jogo.temporada_id, {jogo.rodada})
+
     db.commit()
     db.refresh(jogo)
     return jogo
@@ -97,29 +141,62 @@ def atualizar_resultado(db: Session, jogo: Jogo, body: JogoResultadoUpdate) -> J
     jogo.gols_fora = body.gols_fora
     jogo.status = "finalizado"
 
-    palpites = db.query(Palpite).filter(Palpite.jogo_id == jogo.id).all()
-
-    for p in palpites:
-        p.pontos = calcular_pontuacao(p.placar_casa, p.placar_fora, jogo.gols_casa, jogo.gols_fora)
+    # pontua todos os palpites do jogo num único UPDATE e atualiza a classificação
+    # na mesma transação
+    pontuar_jogos(db, [jogo.id])
 
     db.commit()
     db.refresh(jogo)
     return jogo
 
+def buscar_jogos_por_ids(db: Session, jogo_ids: list[int]) -> list[Jogo]:
+    return (
+        db.query(Jogo)
+        .options(
+            selectinload(Jogo.time_casa),
+            selectinload(Jogo.time_fora),
+        )
+        .filter(Jogo.id.in_(jogo_ids))
+        .all()
+    )
+
+
+def atualizar_resultados(db: Session, jogos: list[Jogo], itens: list[JogoResultadoLoteItem]) -> list[Jogo]:
+    """
+    Lança o resultado de vários jogos (ex.: a rodada inteira) de uma vez:
+    um UPDATE pontua os palpites de todos eles e há um único commit.
+    """
+    por_id = {j.id: j for j in jogos}
+
+    for item in itens:
+        jogo = por_id[item.jogo_id]
+        jogo.gols_casa = item.gols_casa
+        jogo.gols_fora = item.gols_fora
+        jogo.status = "finalizado"
+
+    jogo_ids = [item.jogo_id for item in itens]
+    pontuar_jogos(db, jogo_ids)
+
+    db.commit()
+
+    # recarrega com os times numa só ida ao banco (o commit expira os objetos)
+    por_id = {j.id: j for j in buscar_jogos_por_ids(db, jogo_ids)}
+    return [por_id[jogo_id] for jogo_id in jogo_ids]
+
 def deletar_jogo(db: Session, jogo: Jogo) -> None:
+    estornar_jogos(db, [jogo.id])
+    temporada_id, rodada = jogo.temporada_id, jogo.rodada
     db.delete(jogo)
+    db.flush()
+    # sem o jogo, a rodada pode ter fechado ou mudado de pontuação
+    atualizar_snapshots_rodadas(db, temporada_id, {rodada})
     db.commit()
 
 
-def buscar_rodada_atual(db: Session, temporada_id: int) -> int:
-    """
-    Retorna o número da rodada cujo jogo tem data_hora mais próxima de agora
-    (considera passado e futuro — menor distância absoluta vence).
-    Retorna 1 como fallback se não houver jogos com data_hora definida.
-    """
-    jogo = (
-        db.query(Jogo)
-        .filter(
+def _select_rodada_atual(temporada_id: int):
+    return (
+        select(Jogo.rodada)
+        .where(
             Jogo.temporada_id == temporada_id,
             Jogo.data_hora.isnot(None),
         )
@@ -129,36 +206,19 @@ def buscar_rodada_atual(db: Session, temporada_id: int) -> int:
                 - func.extract("epoch", func.now())
             )
         )
-        .first()
+        .limit(1)
     )
- 
-    return jogo.rodada if jogo is not None else 1
 
 
-def buscar_info_rodadas(db: Session, temporada_id: int) -> dict:
-    """
-    Retorna em uma única passagem pelo banco:
-    - ultima_existente : maior número de rodada que tem ao menos 1 jogo cadastrado
-    - ultima_finalizada: maior rodada onde TODOS os jogos têm status 'finalizado'
-                         (ignora rodadas com jogos adiados/pendentes no meio do campeonato)
-    - rodada_atual     : rodada com jogo de data_hora mais próxima de agora
- 
-    Queries independentes para que um jogo adiado em uma rodada intermediária
-    não bloqueie o reconhecimento das rodadas posteriores já finalizadas.
-    """
- 
-    # 1. Maior rodada com ao menos 1 jogo cadastrado
-    ultima_existente: int = (
-        db.query(func.max(Jogo.rodada))
-        .filter(Jogo.temporada_id == temporada_id)
-        .scalar()
-    ) or 0
- 
-    # 2. Maior rodada em que TODOS os jogos estão finalizados.
-    #    Subquery: rodadas onde total de jogos == total de jogos finalizados.
+def _select_ultima_existente(temporada_id: int):
+    return select(func.max(Jogo.rodada)).where(Jogo.temporada_id == temporada_id)
+
+
+def _select_ultima_finalizada(temporada_id: int):
+    # Subquery: rodadas onde total de jogos == total de jogos finalizados.
     rodadas_completas_sq = (
-        db.query(Jogo.rodada)
-        .filter(Jogo.temporada_id == temporada_id)
+        select(Jogo.rodada)
+        .where(Jogo.temporada_id == temporada_id)
         .group_by(Jogo.rodada)
         .having(
             func.count(Jogo.id)
@@ -166,20 +226,58 @@ def buscar_info_rodadas(db: Session, temporada_id: int) -> dict:
         )
         .subquery()
     )
-    ultima_finalizada: int = (
-        db.query(func.max(rodadas_completas_sq.c.rodada)).scalar()
-    ) or 0
- 
-    # 3. Rodada atual (jogo com data_hora mais próxima de agora)
-    rodada_atual: int = buscar_rodada_atual(db, temporada_id)
- 
-    # 4. Rodada padrão para o seletor: última totalmente finalizada,
-    #    ou a atual se ainda nenhuma foi finalizada.
+    return select(func.max(rodadas_completas_sq.c.rodada))
+
+
+def _info_rodadas(ultima_existente: int | None, ultima_finalizada: int | None, rodada_atual: int | None) -> dict:
+    ultima_existente = ultima_existente or 0
+    ultima_finalizada = ultima_finalizada or 0
+    rodada_atual = rodada_atual if rodada_atual is not None else 1
+
+    # Rodada padrão para o seletor: última totalmente finalizada,
+    # ou a atual se ainda nenhuma foi finalizada.
     default_rodada = ultima_finalizada if ultima_finalizada > 0 else max(rodada_atual, 1)
- 
+
     return {
         "ultima_existente": ultima_existente,
         "ultima_finalizada": ultima_finalizada,
         "rodada_atual": rodada_atual,
         "default_rodada": default_rodada,
     }
+
+
+def buscar_rodada_atual(db: Session, temporada_id: int) -> int:
+    """
+    Retorna o número da rodada cujo jogo tem data_hora mais próxima de agora
+    (considera passado e futuro — menor distância absoluta vence).
+    Retorna 1 como fallback se não houver jogos com data_hora definida.
+    """
+    rodada = db.execute(_select_rodada_atual(temporada_id)).scalar()
+    return rodada if rodada is not None else 1
+
+
+def buscar_info_rodadas(db: Session, temporada_id: int) -> dict:
+    """
+    Retorna em uma única passagem pelo banco:
+    - ultima_existente : maior número de rodada que tem ao menos 1 jogo cadastrado
+    - ultima_finalizada: maior rodada onde TODOS os jogos têm status 'finalizado'
+                         (ignora rodadas com jogos adiados/pendentes no meio do campeonato)
+    - rodada_atual     : rodada com jogo de data_hora mais próxima de agora
+ 
+    Queries independentes para que um jogo adiado em uma rodada intermediária
+    não bloqueie o reconhecimento das rodadas posteriores já finalizadas.
+    """
+    return _info_rodadas(
+        db.execute(_select_ultima_existente(temporada_id)).scalar(),
+        db.execute(_select_ultima_finalizada(temporada_id)).scalar(),
+        db.execute(_select_rodada_atual(temporada_id)).scalar(),
+    )
+
+
+async def buscar_info_rodadas_async(db: AsyncSession, temporada_id: int) -> dict:
+    """Versão async de buscar_info_rodadas (mesmas queries)."""
+    return _info_rodadas(
+        (await db.execute(_select_ultima_existente(temporada_id))).scalar(),
+        (await db.execute(_select_ultima_finalizada(temporada_id))).scalar(),
+        (await db.execute(_select_rodada_atual(temporada_id))).scalar(),
+    )
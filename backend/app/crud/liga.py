@@ -9,6 +9,8 @@ import logging
 
 from app.schemas.liga import LigaUpdate
 from app.core.liga_roles import LigaRole
+from app.core.papel_liga import invalidar_papel_liga, invalidar_papeis_da_liga
+from app.services.classificacao import invalidar_ranking_ligas
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +54,7 @@ def criar_liga(db: Session, id_dono: int, nome: str, temporada_id: int) -> tuple
     membro = LigaMembro(liga_id=liga.id, usuario_id=id_dono, papel=LigaRole.dono)
     db.add(membro)
     db.commit()
+    invalidar_papel_liga(db, liga.id, id_dono)
     return liga
 
 def entrar_liga(db: Session, usuario_id: int, codigo_convite: str) -> Liga:
@@ -70,7 +73,9 @@ def entrar_liga(db: Session, usuario_id: int, codigo_convite: str) -> Liga:
     
     membro = LigaMembro(liga_id=liga.id, usuario_id=usuario_id, papel="membro")
     db.add(membro)
+    invalidar_ranking_ligas(db, [liga.id])
     db.commit()
+    invalidar_papel_liga(db, liga.id, usuario_id)
 
     return liga, "entrou"
 
@@ -94,5 +99,7 @@ def atualizar_liga(db: Session, liga: Liga, dados: LigaUpdate) -> Liga:
     return liga
 
 def deletar_liga(db: Session, liga: Liga) -> None:
+    liga_id = liga.id
     db.delete(liga)
     db.commit()
+    invalidar_papeis_da_liga(db, liga_id)
@@ -2,6 +2,8 @@ from sqlalchemy.orm import Session
 from app.models.liga_membro import LigaMembro
 from app.core.liga_roles import LigaRole
 from app.models.usuario import Usuario
+from app.core.papel_liga import invalidar_papel_liga
+from app.services.classificacao import invalidar_ranking_ligas
 
 def atualizar_papel_membro(
         db: Session,
@@ -20,6 +22,7 @@ def atualizar_papel_membro(
     
     membro.papel = novo_papel
     db.commit()
+    invalidar_papel_liga(db, liga_id, usuario_id)
     db.refresh(membro)
 
     return membro
@@ -45,7 +48,9 @@ def remover_membro_liga(db: Session, liga_id: int, usuario_id: int) -> bool:
         return False
     
     db.delete(membro)
+    invalidar_ranking_ligas(db, [liga_id])
     db.commit()
+    invalidar_papel_liga(db, liga_id, usuario_id)
 
     return True
 
@@ -3,6 +3,7 @@ from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
+from app.core.paginacao import depois_de
 from app.models.pagamentos import LigaPagamento
 from app.models.cobranca_mes import LigaCobrancaMes
 from app.schemas.pagamentos import LigaPagamentoUpsert
@@ -12,7 +13,10 @@ def listar_pagamentos(
     db: Session,
     liga_id: int,
     usuario_id: Optional[int] = None,
+    limite: Optional[int] = None,
+    apos: Optional[list] = None,
 ) -> List[LigaPagamento]:
+    """`limite`/`apos` (chave: usuario_id, mes do último da página anterior) para a listagem paginada."""
     q = (
         db.query(LigaPagamento)
         .filter(LigaPagamento.liga_id == liga_id)
@@ -20,6 +24,10 @@ def listar_pagamentos(
     )
     if usuario_id is not None:
         q = q.filter(LigaPagamento.usuario_id == usuario_id)
+    if apos is not None:
+        q = q.filter(depois_de([LigaPagamento.usuario_id, LigaPagamento.mes], apos))
+    if limite is not None:
+        q = q.limit(limite)
     return q.all()
 
 
@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.jogo import Jogo
+from app.models.push_alert_schedule import PushAlertSchedule
+
+# minutos antes do jogo
+ALERT_OFFSETS_MIN = [480, 240, 120, 60, 30, 15, 10, 5, 2, 1]  # 8h, 4h, 2h, 1h, 30m, 15m, 10m, 5m, 2m, 1m
+
+
+def to_utc(dt: datetime) -> datetime:
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def agendar_alertas(db: Session, jogos: list[Jogo], agora: datetime | None = None) -> None:
+    """
+    (Re)gera a agenda de alertas dos jogos: apaga as linhas existentes e cria uma
+    por offset ainda no futuro. Jogos sem data_hora ou fora de "agendado" ficam sem agenda.
+    Não faz commit: roda na transação de quem chamou.
+    """
+    if not jogos:
+        return
+
+    agora = agora or datetime.now(timezone.utc)
+
+    db.query(PushAlertSchedule).filter(
+        PushAlertSchedule.jogo_id.in_([j.id for j in jogos])
+    ).delete(synchronize_session=False)
+
+    rows = []
+    for jogo in jogos:
+        if jogo.status != "agendado" or jogo.data_hora is None:
+            continue
+
+        inicio = to_utc(jogo.data_hora)
+        for offset in ALERT_OFFSETS_MIN:
+            due_at = inicio - timedelta(minutes=offset)
+            if due_at <= agora:
+                continue
+            rows.append({"jogo_id": jogo.id, "offset_min": offset, "due_at": due_at})
+
+    if rows:
+        db.execute(insert(PushAlertSchedule), rows)
+
+
+def agendar_alertas_jogo(db: Session, jogo: Jogo) -> None:
+    agendar_alertas(db, [jogo])
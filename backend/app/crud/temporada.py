@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session
+from app.crud.versao_tabela import incrementar_versao
 from app.models.temporada import Temporada
 from app.schemas.temporada import TemporadaCreate, TemporadaUpdate
 
@@ -11,6 +12,7 @@ def criar_temporada(db: Session, body: TemporadaCreate) -> Temporada:
         status=body.status or "planejada",
     )
     db.add(obj)
+    incrementar_versao(db, "temporadas")
     db.commit()
     db.refresh(obj)
     return obj
@@ -34,10 +36,12 @@ def atualizar_temporada(db: Session, obj: Temporada, body: TemporadaUpdate) -> T
     if body.status is not None:
         obj.status = body.status
 
+    incrementar_versao(db, "temporadas")
     db.commit()
     db.refresh(obj)
     return obj
 
 def deletar_temporada(db: Session, obj: Temporada) -> None:
     db.delete(obj)
+    incrementar_versao(db, "temporadas")
     db.commit()
@@ -1,4 +1,6 @@
 from sqlalchemy.orm import Session
+from app.core.paginacao import depois_de
+from app.crud.versao_tabela import incrementar_versao
 from app.models.time import Time
 from app.schemas.time import TimeCreate, TimeUpdate
 
@@ -15,14 +17,21 @@ def criar_time(db: Session, body: TimeCreate) -> Time:
     )
 
     db.add(time)
+    incrementar_versao(db, "times")
     db.commit()
     db.refresh(time)
 
     return time
 
 
-def listar_times(db: Session) -> list[Time]:
-    return db.query(Time).order_by(Time.nome.asc()).all()
+def listar_times(db: Session, limite: int | None = None, apos: list | None = None) -> list[Time]:
+    """`limite`/`apos` (chave: nome, id do último da página anterior) para a listagem paginada."""
+    q = db.query(Time).order_by(Time.nome.asc(), Time.id.asc())
+    if apos is not None:
+        q = q.filter(depois_de([Time.nome, Time.id], apos))
+    if limite is not None:
+        q = q.limit(limite)
+    return q.all()
 
 
 def buscar_time(db: Session, time_id: int) -> Time | None:
@@ -44,6 +53,7 @@ def atualizar_time(db: Session, time: Time, body: TimeUpdate) -> Time:
     if body.escudo_url is not None:
         time.escudo_url = body.escudo_url
 
+    incrementar_versao(db, "times")
     db.commit()
     db.refresh(time)
 
@@ -52,4 +62,5 @@ def atualizar_time(db: Session, time: Time, body: TimeUpdate) -> Time:
 
 def deletar_time(db: Session, time: Time) -> None:
     db.delete(time)
+    incrementar_versao(db, "times")
     db.commit()
@@ -2,6 +2,9 @@ from sqlalchemy.orm import Session
 from app.models.usuario import Usuario
 from app.schemas.usuario import UsuarioCreate, UsuarioMeUpdate
 from app.core.security import get_password_hash
+from app.core.paginacao import depois_de
+from app.core.user_cache import invalidar_usuario
+from app.services.classificacao import invalidar_ranking_por_usuario
 
 def criar_usuario(db: Session, usuario: UsuarioCreate):
    senha_hash = get_password_hash(usuario.senha)
@@ -23,8 +26,14 @@ def criar_usuario(db: Session, usuario: UsuarioCreate):
        raise 
    
 
-def listar_usuarios(db: Session):
-    return db.query(Usuario).all()
+def listar_usuarios(db: Session, limite: int | None = None, apos: list | None = None):
+    """`limite`/`apos` (chave: id do último da página anterior) para a listagem paginada."""
+    q = db.query(Usuario).order_by(Usuario.id.asc())
+    if apos is not None:
+        q = q.filter(depois_de([Usuario.id], apos))
+    if limite is not None:
+        q = q.limit(limite)
+    return q.all()
 
 def buscar_usuario_por_id(db: Session, usuario_id: int):
     return db.query(Usuario).filter(Usuario.id == usuario_id).first()
@@ -34,10 +43,15 @@ def atualizar_usuario(db: Session, usuario_id: int, dados):
     if not usuario:
         return None
     
-    for campo, valor in dados.model_dump(exclude_unset=True).items():
+    payload = dados.model_dump(exclude_unset=True)
+    for campo, valor in payload.items():
         setattr(usuario, campo, valor)
 
+    if "nome" in payload:
+        invalidar_ranking_por_usuario(db, usuario_id)
+
     db.commit()
+    invalidar_usuario(usuario_id)
     db.refresh(usuario)
 
     return usuario
@@ -53,7 +67,11 @@ def atualizar_me_usuario(db: Session, usuario: Usuario, dados: UsuarioMeUpdate):
     for campo, valor in payload.items():
         setattr(usuario, campo, valor)
 
+    if "nome" in payload:
+        invalidar_ranking_por_usuario(db, usuario.id)
+
     db.commit()
+    invalidar_usuario(usuario.id)
     db.refresh(usuario)
 
     return usuario
@@ -63,7 +81,9 @@ def deletar_usuario(db: Session, usuario_id: int):
     if not usuario:
         return None
     
+    invalidar_ranking_por_usuario(db, usuario_id)
     db.delete(usuario)
     db.commit()
+    invalidar_usuario(usuario_id)
 
     return True
\ No newline at end of file
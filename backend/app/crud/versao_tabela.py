@@ -0,0 +1,25 @@
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.versao_tabela import VersaoTabela
+
+# tabelas de referência (mudam poucas vezes por ano) servidas com ETag + max-age
+TABELAS_REFERENCIA = ("times", "competicoes", "temporadas")
+
+
+def incrementar_versao(db: Session, *tabelas: str) -> None:
+    """Chamar em toda escrita nessas tabelas, antes do commit. Não faz commit."""
+    for tabela in tabelas:
+        atualizadas = db.execute(
+            update(VersaoTabela)
+            .where(VersaoTabela.tabela == tabela)
+            .values(versao=VersaoTabela.versao + 1)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not atualizadas:
+            # banco criado sem a migração (create_all): a linha nasce na primeira escrita
+            db.execute(insert(VersaoTabela).values(tabela=tabela, versao=1))
+
+
+def versao_tabela(db: Session, tabela: str) -> int:
+    return db.execute(select(VersaoTabela.versao).where(VersaoTabela.tabela == tabela)).scalar() or 0
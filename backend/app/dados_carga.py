@@ -0,0 +1,300 @@
+"""
+Base sintética para benchmarks e para o orçamento de consultas dos testes.
+
+  - gerar_base: competição/temporada própria (identificada por `tag`) com os
+    380 jogos do Brasileirão, usuários, ligas, palpites pontuados, tokens de
+    push e a agenda de alertas (CLI: scripts/gerar_dados_carga.py)
+  - Cenario: dados sorteados de uma base gerada e a requisição de cada rota
+    quente (usado por scripts/bench_api.py e tests/test_orcamento_consultas.py)
+  - rearmar_alertas: deixa alertas vencidos para a próxima chamada de envia_alertas
+"""
+
+import os
+import random
+import secrets
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.password_pool import pwd_context
+from app.crud.push_alert_schedule import agendar_alertas
+from app.crud.versao_tabela import TABELAS_REFERENCIA, incrementar_versao
+from app.models import (
+    Competicao, Jogo, Liga, LigaMembro, Palpite, PushAlertLog, PushAlertSchedule, PushToken, Temporada, Time, Usuario,
+)
+from app.services.palpites import pontuar_jogos
+
+N_TIMES = 20
+LOTE_INSERT = 5000
+
+# distribuição dos gols de um time num palpite/resultado (0..4)
+PESOS_GOLS = [30, 35, 20, 10, 5]
+
+
+def _nome_competicao(tag: str) -> str:
+    return f"Brasileirão ({tag})"
+
+
+def _rodadas_round_robin(n_times: int) -> list[list[tuple[int, int]]]:
+    """Método do círculo: n-1 rodadas no turno, returno com mando invertido."""
+    indices = list(range(n_times))
+    turno = []
+    for r in range(n_times - 1):
+        jogos = []
+        for i in range(n_times // 2):
+            casa, fora = indices[i], indices[n_times - 1 - i]
+            jogos.append((casa, fora) if r % 2 == 0 else (fora, casa))
+        turno.append(jogos)
+        indices = [indices[0], indices[-1], *indices[1:-1]]
+    returno = [[(fora, casa) for casa, fora in jogos] for jogos in turno]
+    return turno + returno
+
+
+def _inserir_em_lotes(db: Session, model, rows: list[dict]) -> None:
+    for i in range(0, len(rows), LOTE_INSERT):
+        db.execute(insert(model), rows[i:i + LOTE_INSERT])
+
+
+def _gols(rnd: random.Random) -> int:
+    return rnd.choices(range(len(PESOS_GOLS)), PESOS_GOLS)[0]
+
+
+def gerar_base(
+    db: Session,
+    *,
+    tag: str = "carga",
+    usuarios: int = 2000,
+    ligas: int = 50,
+    membros: int = 30,
+    rodadas_encerradas: int = 19,
+    taxa_palpite: float = 0.8,
+    taxa_tokens: float = 0.6,
+    ano: int | None = None,
+    senha: str = "carga123",
+    seed: int = 42,
+    progresso: Callable[[str], None] = lambda _: None,
+) -> int:
+    """
+    Gera a base `tag` com inserts em lote e faz commit. Devolve o id da temporada.
+
+    As primeiras `rodadas_encerradas` rodadas já vêm finalizadas e pontuadas pelo
+    mesmo caminho de atualizar_resultado; a seguinte começa em ~2 dias. Cada
+    membro palpita até essa rodada com probabilidade `taxa_palpite` por jogo.
+    Todos os usuários têm a mesma senha. Levanta ValueError se a tag já existe.
+    """
+    if membros > usuarios:
+        raise ValueError("membros por liga não pode ser maior que usuarios")
+
+    rnd = random.Random(seed)
+    agora = datetime.now(timezone.utc)
+    ano = ano or agora.year
+
+    if db.execute(select(Competicao.id).where(Competicao.nome == _nome_competicao(tag))).first():
+        raise ValueError(f"Já existe uma base com a tag '{tag}'")
+
+    comp = Competicao(nome=_nome_competicao(tag), pais="Brasil", tipo="liga")
+    db.add(comp)
+    db.flush()
+    temporada = Temporada(competicao_id=comp.id, ano=ano, status="ativa")
+    db.add(temporada)
+    db.flush()
+    temporada_id = temporada.id
+
+    # times
+    _inserir_em_lotes(db, Time, [{"nome": f"{tag} Time {i + 1:02d}"} for i in range(N_TIMES)])
+    time_ids = list(db.execute(
+        select(Time.id).where(Time.nome.like(f"{tag} Time %")).order_by(Time.nome)
+    ).scalars())
+
+    # usuários: um hash só, calculado uma vez (bcrypt por linha levaria minutos)
+    senha_hash = pwd_context.hash(senha)
+    _inserir_em_lotes(db, Usuario, [
+        {
+            "nome": f"Usuário {tag} {i + 1}",
+            "email_login": f"{tag}.{i + 1}@carga.local",
+            "senha": senha_hash,
+            "funcao": "user",
+        }
+        for i in range(usuarios)
+    ])
+    usuario_ids = list(db.execute(
+        select(Usuario.id).where(Usuario.email_login.like(f"{tag}.%@carga.local")).order_by(Usuario.id)
+    ).scalars())
+    progresso(f"✅ {len(usuario_ids)} usuários, {len(time_ids)} times")
+
+    # jogos: rodada r acontece (r - rodadas_encerradas - 1) semanas depois da próxima
+    proxima = agora + timedelta(days=2)
+    jogos_rows = []
+    for r, confrontos in enumerate(_rodadas_round_robin(N_TIMES), start=1):
+        data_rodada = proxima + timedelta(weeks=r - rodadas_encerradas - 1)
+        for k, (casa, fora) in enumerate(confrontos):
+            encerrado = r <= rodadas_encerradas
+            jogos_rows.append({
+                "temporada_id": temporada_id,
+                "rodada": r,
+                "time_casa_id": time_ids[casa],
+                "time_fora_id": time_ids[fora],
+                "data_hora": data_rodada + timedelta(hours=k % 4 * 2),
+                "status": "finalizado" if encerrado else "agendado",
+                "gols_casa": _gols(rnd) if encerrado else None,
+                "gols_fora": _gols(rnd) if encerrado else None,
+            })
+    _inserir_em_lotes(db, Jogo, jogos_rows)
+    jogos = db.execute(
+        select(Jogo.id, Jogo.rodada, Jogo.status).where(Jogo.temporada_id == temporada_id)
+    ).all()
+    progresso(f"✅ {len(jogos)} jogos ({rodadas_encerradas} rodadas encerradas)")
+
+    # ligas e membros (o dono é o primeiro membro sorteado)
+    membros_por_liga = {}
+    ligas_rows = []
+    for i in range(ligas):
+        sorteados = rnd.sample(usuario_ids, membros)
+        membros_por_liga[i] = sorteados
+        ligas_rows.append({
+            "nome": f"Liga {tag} {i + 1}",
+            "temporada_id": temporada_id,
+            "codigo_convite": secrets.token_urlsafe(6),
+            "id_dono": sorteados[0],
+        })
+    _inserir_em_lotes(db, Liga, ligas_rows)
+    liga_ids = list(db.execute(
+        select(Liga.id).where(Liga.temporada_id == temporada_id).order_by(Liga.id)
+    ).scalars())
+
+    _inserir_em_lotes(db, LigaMembro, [
+        {"liga_id": liga_id, "usuario_id": u, "papel": "dono" if j == 0 else "membro", "data_ingresso": agora}
+        for i, liga_id in enumerate(liga_ids)
+        for j, u in enumerate(membros_por_liga[i])
+    ])
+    progresso(f"✅ {len(liga_ids)} ligas × {membros} membros")
+
+    # palpites até a próxima rodada (a que ainda aceita palpites)
+    jogos_com_palpite = [j.id for j in jogos if j.rodada <= rodadas_encerradas + 1]
+    palpites_rows = [
+        {
+            "liga_id": liga_id,
+            "usuario_id": u,
+            "jogo_id": jogo_id,
+            "placar_casa": _gols(rnd),
+            "placar_fora": _gols(rnd),
+            "data_criacao": agora,
+            "ultima_atualizacao": agora,
+        }
+        for i, liga_id in enumerate(liga_ids)
+        for u in membros_por_liga[i]
+        for jogo_id in jogos_com_palpite
+        if rnd.random() < taxa_palpite
+    ]
+    _inserir_em_lotes(db, Palpite, palpites_rows)
+    progresso(f"✅ {len(palpites_rows)} palpites")
+
+    # pontua pelo caminho real (palpites, liga_classificacao, ranking_versao, snapshots)
+    inicio = time.perf_counter()
+    pontuar_jogos(db, [j.id for j in jogos if j.status == "finalizado"])
+    progresso(f"✅ jogos encerrados pontuados em {time.perf_counter() - inicio:.1f}s")
+
+    tokens_rows = [
+        {"user_id": u, "token": f"{tag}-{u}-{secrets.token_hex(8)}", "platform": "web", "is_active": True}
+        for u in usuario_ids
+        if rnd.random() < taxa_tokens
+    ]
+    _inserir_em_lotes(db, PushToken, tokens_rows)
+
+    agendar_alertas(db, db.query(Jogo).filter(Jogo.temporada_id == temporada_id, Jogo.status == "agendado").all())
+    progresso(f"✅ {len(tokens_rows)} tokens de push e agenda de alertas")
+
+    # competição, temporada e times novos: invalida o cache HTTP dos dados de referência
+    incrementar_versao(db, *TABELAS_REFERENCIA)
+    db.commit()
+    return temporada_id
+
+
+class Cenario:
+    """Dados sorteados da base `tag` e a requisição de cada rota."""
+
+    def __init__(self, db: Session, tag: str, rnd: random.Random):
+        # aqui e não no topo: gerar_base não depende da configuração do JWT
+        from app.core.security import create_access_token
+
+        self.temporada_id = db.execute(
+            select(Temporada.id)
+            .join(Competicao, Competicao.id == Temporada.competicao_id)
+            .where(Competicao.nome == _nome_competicao(tag))
+        ).scalar()
+        if self.temporada_id is None:
+            raise ValueError(f"Base '{tag}' não encontrada")
+
+        self.membros = db.execute(
+            select(LigaMembro.liga_id, LigaMembro.usuario_id)
+            .join(Liga, Liga.id == LigaMembro.liga_id)
+            .where(Liga.temporada_id == self.temporada_id)
+        ).all()
+
+        ultima_encerrada = db.execute(
+            select(func.max(Jogo.rodada)).where(Jogo.temporada_id == self.temporada_id, Jogo.status == "finalizado")
+        ).scalar() or 0
+        self.rodadas = list(range(1, ultima_encerrada + 2))
+
+        agora = datetime.now(timezone.utc)
+        self.jogos_abertos = [
+            j for (j, data_hora) in db.execute(
+                select(Jogo.id, Jogo.data_hora).where(Jogo.temporada_id == self.temporada_id, Jogo.status == "agendado")
+            )
+            if data_hora is not None and (data_hora if data_hora.tzinfo else data_hora.replace(tzinfo=timezone.utc)) > agora
+        ]
+
+        self.rnd = rnd
+        self._tokens = {}
+        self._criar_token = create_access_token
+
+    def _auth(self, usuario_id: int) -> dict:
+        token = self._tokens.get(usuario_id)
+        if token is None:
+            token = self._tokens[usuario_id] = self._criar_token({"sub": str(usuario_id), "funcao": "user"})
+        return {"Authorization": f"Bearer {token}"}
+
+    def requisicao(self, rota: str) -> tuple[str, str, dict, dict | None]:
+        """(método, caminho, headers, corpo json)."""
+        liga_id, usuario_id = self.rnd.choice(self.membros)
+        headers = self._auth(usuario_id)
+
+        if rota == "ranking":
+            return "GET", f"/servicos/{liga_id}/ranking", headers, None
+        if rota == "palpites_rodada":
+            rodada = self.rnd.choice(self.rodadas)
+            return "GET", f"/palpites/{liga_id}/rodadas/{rodada}/usuarios/me/palpites", headers, None
+        if rota == "upsert_palpite":
+            jogo_id = self.rnd.choice(self.jogos_abertos)
+            corpo = {"placar_casa": self.rnd.randint(0, 4), "placar_fora": self.rnd.randint(0, 4)}
+            return "PUT", f"/palpites/ligas/{liga_id}/jogos/{jogo_id}/meu", headers, corpo
+        if rota == "info_rodadas":
+            return "GET", f"/jogos/info-rodadas?temporada_id={self.temporada_id}", headers, None
+        if rota == "envia_alertas":
+            return "POST", "/push/envia_alertas", {"X-Cron-Secret": os.environ["PUSH_CRON_SECRET"]}, None
+        raise ValueError(rota)
+
+
+def rearmar_alertas(db: Session, temporada_id: int, n_jogos: int) -> None:
+    """Deixa uma janela de alerta vencida para os próximos `n_jogos` jogos, sem logs de envio. Faz commit."""
+    jogo_ids = list(db.execute(
+        select(Jogo.id)
+        .where(Jogo.temporada_id == temporada_id, Jogo.status == "agendado")
+        .order_by(Jogo.data_hora, Jogo.id)
+        .limit(n_jogos)
+    ).scalars())
+    db.execute(delete(PushAlertLog).where(PushAlertLog.jogo_id.in_(jogo_ids)))
+    db.execute(
+        update(PushAlertSchedule)
+        .where(PushAlertSchedule.jogo_id.in_(jogo_ids), PushAlertSchedule.offset_min == 480)
+        .values(
+            due_at=datetime.now(timezone.utc) - timedelta(seconds=1),
+            sent_at=None,
+            claimed_at=None,
+            tokens_pendentes=None,
+        )
+    )
+    db.commit()
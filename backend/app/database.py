@@ -2,41 +2,83 @@ import os
 import logging
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import NullPool
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.core.metricas import registrar_pool
+from app.core.metricas_db import registrar_metricas
 
 logger = logging.getLogger(__name__)
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./bolao.db")
 
-connect_args = {}
-engine_kwargs = {}
+# Réplica de leitura (opcional). Sem ela, as rotas de leitura usam o primário.
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
 
-if DATABASE_URL.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
-else:
-    connect_args = {
-        "prepare_threshold": None,  # Necessário para pgbouncer/supabase pooler
-        "connect_timeout": 10,
-        # Keepalives para evitar conexões mortas em idle
-        "keepalives": 1,
-        "keepalives_idle": 60,
-        "keepalives_interval": 10,
-        "keepalives_count": 5,
-    }
-
-    # Se estiver no Render free tier (app hiberna), NullPool é mais seguro
-    USE_NULL_POOL = os.getenv("USE_NULL_POOL", "false").lower() == "true"
-
-    if USE_NULL_POOL:
-        engine_kwargs["poolclass"] = NullPool
+
+def _opcoes_engine(url: str, assincrono: bool = False) -> tuple[dict, dict]:
+    """
+    connect_args e opções do pool. Os pools síncrono e assíncrono do mesmo banco
+    somam conexões, então cada um tem o seu tamanho (DB_* e DB_ASYNC_*): com os
+    padrões, o processo abre no máximo 4 conexões por banco (sync 1+2, async 1+0).
+    """
+    connect_args = {}
+    engine_kwargs = {}
+
+    if url.startswith("sqlite"):
+        connect_args = {"check_same_thread": False}
     else:
-        engine_kwargs.update({
-            "pool_pre_ping": True,
-            "pool_size": int(os.getenv("DB_POOL_SIZE", "1")),       # Reduzido: Supabase free tem limite
-            "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "2")), # Reduzido também
-            "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "10")),
-            "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "120")),  # ✅ 4 min (abaixo do timeout do Supabase)
-        })
+        connect_args = {
+            "prepare_threshold": None,  # Necessário para pgbouncer/supabase pooler
+            "connect_timeout": 10,
+            # Keepalives para evitar conexões mortas em idle
+            "keepalives": 1,
+            "keepalives_idle": 60,
+            "keepalives_interval": 10,
+            "keepalives_count": 5,
+        }
+
+        # Se estiver no Render free tier (app hiberna), NullPool é mais seguro
+        USE_NULL_POOL = os.getenv("USE_NULL_POOL", "false").lower() == "true"
+
+        if USE_NULL_POOL:
+            engine_kwargs["poolclass"] = NullPool
+        else:
+            if assincrono:
+                pool_size = int(os.getenv("DB_ASYNC_POOL_SIZE", "1"))
+                max_overflow = int(os.getenv("DB_ASYNC_MAX_OVERFLOW", "0"))
+            else:
+                pool_size = int(os.getenv("DB_POOL_SIZE", "1"))       # Reduzido: Supabase free tem limite
+                max_overflow = int(os.getenv("DB_MAX_OVERFLOW", "2")) # Reduzido também
+
+            engine_kwargs.update({
+                "pool_pre_ping": True,
+                "pool_size": pool_size,
+                "max_overflow": max_overflow,
+                "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "10")),
+                "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "120")),  # ✅ 4 min (abaixo do timeout do Supabase)
+            })
+
+    return connect_args, engine_kwargs
+
+
+def _registrar_logs(engine, nome: str) -> None:
+    # ✅ Log para debugar quando conexões são descartadas/recriadas
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        logger.info(f"Nova conexão estabelecida com o banco ({nome})")
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        logger.debug("Conexão retirada do pool")
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        logger.warning(f"Conexão invalidada ({nome}): {exception}")
+
+
+connect_args, engine_kwargs = _opcoes_engine(DATABASE_URL)
 
 engine = create_engine(
     DATABASE_URL,
@@ -44,19 +86,23 @@ engine = create_engine(
     future=True,
     **engine_kwargs,
 )
+_registrar_logs(engine, "primário")
+registrar_pool(engine, "primario")
+registrar_metricas(engine)
 
-# ✅ Log para debugar quando conexões são descartadas/recriadas
-@event.listens_for(engine, "connect")
-def on_connect(dbapi_connection, connection_record):
-    logger.info("Nova conexão estabelecida com o banco")
-
-@event.listens_for(engine, "checkout")
-def on_checkout(dbapi_connection, connection_record, connection_proxy):
-    logger.debug("Conexão retirada do pool")
-
-@event.listens_for(engine, "invalidate")
-def on_invalidate(dbapi_connection, connection_record, exception):
-    logger.warning(f"Conexão invalidada: {exception}")
+if DATABASE_READ_URL:
+    read_connect_args, read_engine_kwargs = _opcoes_engine(DATABASE_READ_URL)
+    read_engine = create_engine(
+        DATABASE_READ_URL,
+        connect_args=read_connect_args,
+        future=True,
+        **read_engine_kwargs,
+    )
+    _registrar_logs(read_engine, "réplica")
+    registrar_pool(read_engine, "replica")
+    registrar_metricas(read_engine)
+else:
+    read_engine = engine
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -75,4 +121,126 @@ def get_db():
     finally:
         db.close()
 
-Base = declarative_base()
\ No newline at end of file
+
+# ---------------------------------------------------------------------------
+# Engine assíncrono (rotas de leitura quentes: ranking, jogos, palpites da rodada)
+#
+# Mesmo banco do engine síncrono, com driver async: psycopg 3 (já usado no sync)
+# no PostgreSQL e aiosqlite no SQLite local. Criado só no primeiro uso.
+# ---------------------------------------------------------------------------
+
+def _url_async(url: str) -> str:
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql+psycopg2:"):
+        return url.replace("postgresql+psycopg2:", "postgresql+psycopg:", 1)
+    if url.startswith("postgresql:") or url.startswith("postgres:"):
+        return "postgresql+psycopg:" + url.split(":", 1)[1]
+    return url
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _url_async(DATABASE_URL)
+
+_async_engine = None
+_AsyncSessionLocal = None
+
+def get_async_engine():
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        async_connect_args, async_engine_kwargs = _opcoes_engine(DATABASE_URL, assincrono=True)
+        _async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            connect_args={} if ASYNC_DATABASE_URL.startswith("sqlite") else async_connect_args,
+            **async_engine_kwargs,
+        )
+        registrar_metricas(_async_engine.sync_engine)
+        registrar_pool(_async_engine.sync_engine, "primario_async")
+        _AsyncSessionLocal = async_sessionmaker(
+            bind=_async_engine,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _async_engine
+
+async def get_async_db():
+    get_async_engine()
+    async with _AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+
+# ---------------------------------------------------------------------------
+# Sessões de leitura (réplica). Só para rotas que não escrevem e toleram o atraso
+# de replicação; fluxos que leem o que acabaram de gravar ficam no primário.
+# ---------------------------------------------------------------------------
+
+ReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=read_engine,
+)
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.rollback()
+        db.close()
+
+ASYNC_DATABASE_READ_URL = os.getenv("ASYNC_DATABASE_READ_URL") or (
+    _url_async(DATABASE_READ_URL) if DATABASE_READ_URL else None
+)
+
+_async_read_engine = None
+_AsyncReadSessionLocal = None
+
+def get_async_read_engine():
+    global _async_read_engine, _AsyncReadSessionLocal
+    if ASYNC_DATABASE_READ_URL is None:
+        return get_async_engine()
+
+    if _async_read_engine is None:
+        read_connect_args, read_engine_kwargs = _opcoes_engine(DATABASE_READ_URL, assincrono=True)
+        _async_read_engine = create_async_engine(
+            ASYNC_DATABASE_READ_URL,
+            connect_args={} if ASYNC_DATABASE_READ_URL.startswith("sqlite") else read_connect_args,
+            **read_engine_kwargs,
+        )
+        registrar_metricas(_async_read_engine.sync_engine)
+        registrar_pool(_async_read_engine.sync_engine, "replica_async")
+        _AsyncReadSessionLocal = async_sessionmaker(
+            bind=_async_read_engine,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _async_read_engine
+
+async def get_async_read_db():
+    if ASYNC_DATABASE_READ_URL is None:
+        get_async_engine()
+        fabrica = _AsyncSessionLocal
+    else:
+        get_async_read_engine()
+        fabrica = _AsyncReadSessionLocal
+
+    async with fabrica() as db:
+        try:
+            yield db
+        finally:
+            await db.rollback()
+
+Base = declarative_base()
+
+
+def dialect_insert(db, model):
+    """
+    Retorna o insert() do dialeto da sessão, que expõe on_conflict_do_update
+    tanto no SQLite quanto no PostgreSQL.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
\ No newline at end of file
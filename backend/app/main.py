@@ -8,14 +8,22 @@ load_dotenv(ROOT_ENV)
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.database import engine, Base
-from app.routes import usuario, auth, liga, liga_membro, liga_services, time, competicao, temporada, jogo, palpite, pagamentos, push
+from app.routes import usuario, auth, liga, liga_membro, liga_services, time, competicao, temporada, jogo, palpite, pagamentos, push, metricas
 from app import models
+from app.core.password_pool import encerrar_pool, iniciar_pool
+from app.core.metricas_db import MetricasDBMiddleware
+from app.core.metricas import MetricasHTTPMiddleware
+from app.core.compressao import CompressaoMiddleware
 
 
 
 
 app = FastAPI(title=" API FutBolão")
 
+# processos do bcrypt criados no startup, antes das threads do servidor (ver password_pool.py)
+app.add_event_handler("startup", iniciar_pool)
+app.add_event_handler("shutdown", encerrar_pool)
+
 origins = [
     "http://localhost:3000",
     "http://127.0.0.1:3000",
@@ -28,8 +36,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-DB-Queries", "X-DB-Time-Ms", "Server-Timing", "ETag"],
 )
 
+# gzip acima de COMPRESSION_MIN_BYTES (dentro das métricas: a latência inclui a compressão)
+app.add_middleware(CompressaoMiddleware)
+
+# contagem/tempo de SQL por requisição (cabeçalhos X-DB-* e log de consultas lentas)
+app.add_middleware(MetricasDBMiddleware)
+
+# latência por rota e requisições em andamento, expostas em GET /metrics
+app.add_middleware(MetricasHTTPMiddleware)
+
 
 app.include_router(usuario.router)
 app.include_router(auth.router)
@@ -43,6 +61,7 @@ app.include_router(jogo.router)
 app.include_router(palpite.router)
 app.include_router(pagamentos.router)
 app.include_router(push.router)
+app.include_router(metricas.router)
 
 
 
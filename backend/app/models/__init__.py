@@ -10,5 +10,9 @@ from app.models.pagamentos import LigaPagamento
 from app.models.cobranca_mes import LigaCobrancaMes
 from app.models.push_token import PushToken
 from app.models.push_alert_log import PushAlertLog
+from app.models.liga_classificacao import LigaClassificacao
+from app.models.push_alert_schedule import PushAlertSchedule
+from app.models.liga_rodada_snapshot import LigaRodadaSnapshot
+from app.models.versao_tabela import VersaoTabela
 
 
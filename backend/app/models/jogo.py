@@ -1,15 +1,21 @@
 from datetime import datetime
-from sqlalchemy import CheckConstraint, Column, ForeignKey, Integer, String, DateTime, UniqueConstraint
+from sqlalchemy import CheckConstraint, Column, ForeignKey, Index, Integer, String, DateTime, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 
 from app.database import Base
 
+# Status que fecham a rodada para os snapshots da evolução do ranking: um jogo
+# cancelado não vai ter resultado, então não segura a rodada aberta. O seletor de
+# rodada (info-rodadas) continua exigindo todos os jogos 'finalizado'.
+STATUS_ENCERRADOS = ("finalizado", "cancelado")
+
 class Jogo(Base):
     __tablename__ = "jogos"
 
     id = Column(Integer, primary_key=True, index=True)
     
-    temporada_id = Column(Integer, ForeignKey("temporadas.id"), nullable=False, index=True)
+    # índice: prefixo de uq_jogo_temporada_rodada_times e de ix_jogos_temporada_status
+    temporada_id = Column(Integer, ForeignKey("temporadas.id"), nullable=False)
     rodada = Column(Integer, nullable=False, index=True)
 
     time_casa_id = Column(Integer, ForeignKey("times.id"), nullable=False, index=True)
@@ -20,16 +26,28 @@ class Jogo(Base):
 
     data_hora = Column(DateTime(timezone=True), nullable=True)
 
-    # agendado / finalizado 
+    # agendado / em_andamento / finalizado / cancelado
     status = Column(String, nullable=False, default="agendado", index=True)
 
     # Relacionamento
     palpites = relationship("Palpite", back_populates="jogo", cascade="all, delete-orphan")
+    alertas_agendados = relationship("PushAlertSchedule", back_populates="jogo", cascade="all, delete-orphan")
     temporada = relationship("Temporada")
     time_casa = relationship("Time", foreign_keys=[time_casa_id])
     time_fora = relationship("Time", foreign_keys=[time_fora_id])
 
     __table_args__ = (
         UniqueConstraint("temporada_id", "rodada", "time_casa_id", "time_fora_id", name="uq_jogo_temporada_rodada_times"),
-        CheckConstraint("time_casa_id != time_fora_id", name= "ck_jogo_times_diferentes")
+        CheckConstraint("time_casa_id != time_fora_id", name= "ck_jogo_times_diferentes"),
+        # contagem de jogos finalizados da temporada (ranking, pontuação acumulada)
+        Index("ix_jogos_temporada_status", "temporada_id", "status"),
+        # listagem paginada de GET /jogos (keyset em data_hora, id)
+        Index("ix_jogos_data_hora_id", "data_hora", "id"),
+        # jogos ainda por acontecer (agenda de alertas de push)
+        Index(
+            "ix_jogos_agendados_data_hora",
+            "data_hora",
+            postgresql_where=text("status = 'agendado'"),
+            sqlite_where=text("status = 'agendado'"),
+        ),
     )
\ No newline at end of file
@@ -18,6 +18,10 @@ class Liga(Base):
 
     data_criacao = Column(DateTime, default=datetime.now(timezone.utc), nullable=False)
 
+    # Incrementada a cada mudança que altera ranking/pontuação da liga (ETag e cache
+    # das rotas de ranking; ver services/classificacao.py)
+    ranking_versao = Column(Integer, nullable=False, default=0, server_default="0")
+
     #Relacionamentos
 
     dono = relationship("Usuario", back_populates="ligas_criadas")
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint, Index
+
+from app.database import Base
+
+
+class LigaClassificacao(Base):
+    __tablename__ = "liga_classificacao"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    liga_id = Column(Integer, ForeignKey("ligas.id", ondelete="CASCADE"), nullable=False)
+    usuario_id = Column(Integer, ForeignKey("usuarios.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    # Totais mantidos por delta em atualizar_resultado (ver services/classificacao.py)
+    pontos = Column(Integer, nullable=False, default=0)
+    acertos_placar = Column(Integer, nullable=False, default=0)
+    acertos_saldo = Column(Integer, nullable=False, default=0)
+    acertos_resultado = Column(Integer, nullable=False, default=0)
+    erros = Column(Integer, nullable=False, default=0)
+
+    # palpites já pontuados (jogos com resultado lançado)
+    palpites_feitos = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("liga_id", "usuario_id", name="uq_liga_classificacao_liga_usuario"),
+        Index("ix_liga_classificacao_liga_pontos", "liga_id", "pontos"),
+    )
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint
+
+from app.database import Base
+
+
+class LigaRodadaSnapshot(Base):
+    __tablename__ = "liga_rodada_snapshot"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    liga_id = Column(Integer, ForeignKey("ligas.id", ondelete="CASCADE"), nullable=False)
+    rodada = Column(Integer, nullable=False)
+    usuario_id = Column(Integer, ForeignKey("usuarios.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    # Posição e totais acumulados até o fim da rodada (gravados quando o último
+    # jogo da rodada é finalizado ou cancelado; ver services/evolucao_ranking.py)
+    posicao = Column(Integer, nullable=False)
+    pontos = Column(Integer, nullable=False, default=0)
+    pontos_rodada = Column(Integer, nullable=False, default=0)
+    acertos_placar = Column(Integer, nullable=False, default=0)
+    acertos_saldo = Column(Integer, nullable=False, default=0)
+    acertos_resultado = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # também atende a leitura da evolução (liga_id, rodada)
+        UniqueConstraint("liga_id", "rodada", "usuario_id", name="uq_liga_rodada_snapshot_liga_rodada_usuario"),
+    )
@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from sqlalchemy import CheckConstraint, Column, Integer, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import CheckConstraint, Column, Index, Integer, DateTime, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -10,9 +10,10 @@ class Palpite(Base):
 
     id = Column(Integer, primary_key=True, index=True)
 
-    liga_id = Column(Integer, ForeignKey("ligas.id", ondelete="CASCADE"), nullable=False, index=True)
+    # liga_id e jogo_id são indexados pelos compostos abaixo (prefixo)
+    liga_id = Column(Integer, ForeignKey("ligas.id", ondelete="CASCADE"), nullable=False)
     usuario_id = Column(Integer, ForeignKey("usuarios.id", ondelete="CASCADE"), nullable=False, index=True)
-    jogo_id = Column(Integer, ForeignKey("jogos.id", ondelete="CASCADE"), nullable=False, index=True)
+    jogo_id = Column(Integer, ForeignKey("jogos.id", ondelete="CASCADE"), nullable=False)
 
     placar_casa = Column(Integer, nullable=False)
     placar_fora = Column(Integer, nullable=False)
@@ -32,4 +33,13 @@ class Palpite(Base):
         UniqueConstraint("liga_id", "usuario_id", "jogo_id", name="uq_palpite_liga_usuario_jogo"),
         CheckConstraint("placar_casa >= 0", name="ck_palpite_placar_casa_nao_negativo"),
         CheckConstraint("placar_fora >= 0", name="ck_palpite_placar_fora_nao_negativo"),
+        # palpites de um jogo (pontuação, palpites do jogo na liga, alerta de palpite pendente);
+        # no Postgres cobre também placar/pontos para index-only scan
+        Index(
+            "ix_palpites_jogo_liga_usuario",
+            "jogo_id",
+            "liga_id",
+            "usuario_id",
+            postgresql_include=["placar_casa", "placar_fora", "pontos"],
+        ),
     )
@@ -0,0 +1,41 @@
+from sqlalchemy import JSON, Column, Integer, DateTime, ForeignKey, UniqueConstraint, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.database import Base
+
+class PushAlertSchedule(Base):
+    """
+    Outbox dos alertas de palpite pendente: uma linha por (jogo, offset),
+    gerada quando o jogo é criado ou tem data_hora alterada.
+
+    O worker reivindica a linha (claimed_at) antes de enviar e só grava sent_at
+    depois do envio; se o envio falha ou o worker morre, a linha volta a ficar
+    disponível (ver services/push_scheduler.py). Tokens que falharam ficam em
+    tokens_pendentes, e a nova tentativa vai só para eles.
+    """
+    __tablename__ = "push_alert_schedule"
+
+    id = Column(Integer, primary_key=True)
+    jogo_id = Column(Integer, ForeignKey("jogos.id", ondelete="CASCADE"), nullable=False, index=True)
+    offset_min = Column(Integer, nullable=False)  # minutos antes do jogo
+
+    due_at = Column(DateTime(timezone=True), nullable=False)
+    sent_at = Column(DateTime(timezone=True), nullable=True)  # NULL = pendente
+    claimed_at = Column(DateTime(timezone=True), nullable=True)  # envio em andamento (expira); NULL fora dele
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    # [{"ligas": [...], "tokens": [...]}] da tentativa anterior; NULL = ninguém para reenviar
+    tokens_pendentes = Column(JSON(none_as_null=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    jogo = relationship("Jogo", back_populates="alertas_agendados")
+
+    __table_args__ = (
+        UniqueConstraint("jogo_id", "offset_min", name="uq_push_alert_schedule_jogo_offset"),
+        # só as linhas pendentes interessam ao worker
+        Index(
+            "ix_push_alert_schedule_pendentes",
+            "due_at",
+            postgresql_where=sent_at.is_(None),
+            sqlite_where=sent_at.is_(None),
+        ),
+    )
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String
+
+from app.database import Base
+
+
+class VersaoTabela(Base):
+    __tablename__ = "versao_tabela"
+
+    # nome da tabela (__tablename__): times, competicoes, temporadas
+    tabela = Column(String(50), primary_key=True)
+
+    # Incrementada a cada escrita na tabela (ETag das rotas de dados de
+    # referência; ver crud/versao_tabela.py)
+    versao = Column(Integer, nullable=False, default=0, server_default="0")
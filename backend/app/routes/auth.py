@@ -5,7 +5,8 @@ from fastapi.security import OAuth2PasswordRequestForm
 from app.database import get_db
 from app.models.usuario import Usuario
 from app.schemas.auth import Token
-from app.core.security import verify_password, create_access_token
+from app.core.security import verify_and_update_password, create_access_token
+from app.core.user_cache import invalidar_usuario
 
 
 router = APIRouter(prefix="/auth", tags=["Autenticação"])
@@ -18,8 +19,17 @@ def login(
 ):
     usuario = (db.query(Usuario).filter(Usuario.email_login == form_data.username).first())
 
-    if not usuario or not verify_password(form_data.password, usuario.senha):
+    if not usuario:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Login ou senha incorretos")
+
+    senha_ok, novo_hash = verify_and_update_password(form_data.password, usuario.senha)
+    if not senha_ok:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Login ou senha incorretos")
+
+    # custo do bcrypt mudou (BCRYPT_ROUNDS): regrava o hash; get_db faz o commit
+    if novo_hash:
+        usuario.senha = novo_hash
+        invalidar_usuario(usuario.id)
     
     token =  create_access_token(
         data={
@@ -1,24 +1,50 @@
+from datetime import datetime
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
-from app.core.permissions import require_admin
-from app.schemas.jogo import JogoCreate, JogoUpdate, JogoResultadoUpdate, JogoResponse
-from app.crud.jogo import criar_jogo, listar_jogos, buscar_jogo, atualizar_jogo, atualizar_resultado, deletar_jogo, buscar_rodada_atual, buscar_info_rodadas
+from app.database import get_async_read_db, get_db
+from app.core.permissions import Admin, require_admin
+from app.schemas.jogo import JogoCreate, JogoUpdate, JogoResultadoUpdate, JogoResultadoLoteItem, JogoResponse
+from app.crud.jogo import criar_jogo, listar_jogos_async, buscar_jogo, atualizar_jogo, atualizar_resultado, atualizar_resultados, buscar_jogos_por_ids, deletar_jogo, buscar_rodada_atual, buscar_info_rodadas_async
 
+from app.models.jogo import Jogo
 from app.models.temporada import Temporada
 from app.models.time import Time
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, get_current_user_async_read
+from app.core.paginacao import ParametrosPagina, montar_pagina
+from app.core.respostas import JSONRapidaResponse
+from app.schemas.paginacao import Pagina
 
 
 
 router = APIRouter(prefix="/jogos", tags=["Jogos"])
 
+
+def _time_dict(time: Time) -> dict:
+    return {"id": time.id, "nome": time.nome, "sigla": time.sigla, "escudo_url": time.escudo_url}
+
+
+def _jogo_dict(jogo: Jogo) -> dict:
+    """Mesmos campos de JogoResponse, para a lista completa sair sem validar jogo a jogo."""
+    return {
+        "id": jogo.id,
+        "temporada_id": jogo.temporada_id,
+        "rodada": jogo.rodada,
+        "time_casa": _time_dict(jogo.time_casa),
+        "time_fora": _time_dict(jogo.time_fora),
+        "gols_casa": jogo.gols_casa,
+        "gols_fora": jogo.gols_fora,
+        "data_hora": jogo.data_hora,
+        "status": jogo.status,
+    }
+
 @router.post("", response_model=JogoResponse, status_code=status.HTTP_201_CREATED)
 def cria_jogo(
     body: JogoCreate,
     db: Session = Depends(get_db),
-    admin=Depends(require_admin),
+    admin: Admin = Depends(require_admin),
 ):
     if body.time_casa_id == body.time_fora_id:
         raise HTTPException(400, detail="Time da casa e fora não podem ser iguais.")
@@ -34,14 +60,26 @@ def cria_jogo(
 
     return criar_jogo(db, body)
 
-@router.get("", response_model=list[JogoResponse])
-def lista_jogos(
+@router.get("", response_model=list[JogoResponse] | Pagina[JogoResponse])
+async def lista_jogos(
     temporada_id: int | None = None,
     rodada: int | None = None,
-    db: Session = Depends(get_db),
-    usuario_logado = Depends(get_current_user)
+    pagina: ParametrosPagina = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
+    usuario_logado = Depends(get_current_user_async_read)
 ):
-    return listar_jogos(db, temporada_id=temporada_id, rodada=rodada)
+    if not pagina.paginado:
+        jogos = await listar_jogos_async(db, temporada_id=temporada_id, rodada=rodada)
+        return JSONRapidaResponse([_jogo_dict(j) for j in jogos])
+
+    jogos = await listar_jogos_async(
+        db,
+        temporada_id=temporada_id,
+        rodada=rodada,
+        limite=pagina.limit + 1,
+        apos=pagina.chave(datetime.fromisoformat, int),
+    )
+    return montar_pagina(jogos, pagina.limit, lambda j: (j.data_hora, j.id))
 
 @router.get("/rodada-atual")
 def rodada_atual(
@@ -52,12 +90,12 @@ def rodada_atual(
     return {"rodada": buscar_rodada_atual(db, temporada_id)}
 
 @router.get("/info-rodadas")
-def info_rodadas(
+async def info_rodadas(
     temporada_id: int,
-    db: Session = Depends(get_db),
-    usuario_logado=Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db),
+    usuario_logado=Depends(get_current_user_async_read),
 ):
-    return buscar_info_rodadas(db, temporada_id)
+    return await buscar_info_rodadas_async(db, temporada_id)
 
 @router.get("/{jogo_id}", response_model=JogoResponse)
 def busca_jogo(jogo_id: int, db: Session = Depends(get_db), usuario_logado = Depends(get_current_user)):
@@ -71,7 +109,7 @@ def atualiza_jogo(
     jogo_id: int,
     body: JogoUpdate,
     db: Session = Depends(get_db),
-    admin=Depends(require_admin),
+    admin: Admin = Depends(require_admin),
 ):
     jogo = buscar_jogo(db, jogo_id)
     if not jogo:
@@ -83,19 +121,39 @@ def atualiza_resultado(
     jogo_id: int,
     body: JogoResultadoUpdate,
     db: Session = Depends(get_db),
-    admin=Depends(require_admin),
+    admin: Admin = Depends(require_admin),
 ):
     jogo = buscar_jogo(db, jogo_id)
     if not jogo:
         raise HTTPException(404, detail="Jogo não encontrado.")
     return atualizar_resultado(db, jogo, body)
 
+@router.patch("/resultados", response_model=list[JogoResponse])
+def atualiza_resultados(
+    body: list[JogoResultadoLoteItem],
+    db: Session = Depends(get_db),
+    admin: Admin = Depends(require_admin),
+):
+    jogo_ids = [item.jogo_id for item in body]
+    if not jogo_ids:
+        raise HTTPException(400, detail="Informe ao menos um resultado.")
+    if len(set(jogo_ids)) != len(jogo_ids):
+        raise HTTPException(400, detail="Jogo repetido na lista de resultados.")
+
+    jogos = buscar_jogos_por_ids(db, jogo_ids)
+    encontrados = {j.id for j in jogos}
+    faltando = [jogo_id for jogo_id in jogo_ids if jogo_id not in encontrados]
+    if faltando:
+        raise HTTPException(404, detail=f"Jogos não encontrados: {faltando}")
+
+    return atualizar_resultados(db, jogos, body)
+
 
 @router.delete("/{jogo_id}", status_code=status.HTTP_204_NO_CONTENT)
 def exclui_jogo(
     jogo_id: int,
     db: Session = Depends(get_db),
-    admin=Depends(require_admin),
+    admin: Admin = Depends(require_admin),
 ):
     jogo = buscar_jogo(db, jogo_id)
     if not jogo:
@@ -1,19 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from typing import List, Optional, Union
 
-from app.schemas.liga import LigaResponse, TransferirPosse, RankingLigaResponse, RankingLigaRodadaResponse, PontuacaoAcumuladaResponse, PontuacaoAcumuladaSerie, PontuacaoAcumuladaSeriesResponse
-from app.database import get_db
+from app.schemas.liga import LigaResponse, TransferirPosse, RankingLigaResponse, RankingLigaRodadaResponse, PontuacaoAcumuladaResponse, PontuacaoAcumuladaSerie, PontuacaoAcumuladaSeriesResponse, EvolucaoRankingResponse
+from app.database import get_async_read_db, get_db, get_read_db
 from app.core.liga_roles import LigaRole
 from app.core.permissions import require_liga_roles
-from app.core.dependencies import get_current_user, get_db
+from app.core.dependencies import get_current_user, get_current_user_async_read, get_db
+from app.core.cache_http import nao_modificado, resposta_304
+from app.core.response_cache import get_response_cache
+from app.core.respostas import JSONRapidaResponse
 from app.models.usuario import Usuario
-from app.services.liga_service import pontuacao_acumulada_todos, transferir_posse_liga, ranking_liga, ranking_liga_rodada, pontuacao_acumulada_por_usuario
+from app.services.liga_service import pontuacao_acumulada_series_todos, pontuacao_acumulada_todos, transferir_posse_liga, ranking_liga_async, ranking_liga_rodada, pontuacao_acumulada_por_usuario
+from app.services.classificacao import versao_ranking, versao_ranking_async
+from app.services.evolucao_ranking import evolucao_ranking
 
 
 router = APIRouter(prefix="/servicos", tags=["Serviços Liga"])
 
+# O cliente pode guardar, mas revalida sempre (If-None-Match -> 304 sem recalcular)
+CACHE_CONTROL_RANKING = "private, no-cache"
+
+
+def _etag_ranking(liga_id: int, versao: int) -> str:
+    return f'"liga-{liga_id}-v{versao}"'
+
+
+def _cabecalhos_ranking(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL_RANKING
+
+
+def _resposta_304(etag: str) -> Response:
+    return resposta_304(etag, CACHE_CONTROL_RANKING)
+
+
 def to_series(flat_rows: list[dict], max_rodada: int):
     by_name: dict[str, list[int]] = {}
     for r in flat_rows:
@@ -44,17 +67,67 @@ def transferir_posse(
 
 @router.get("/{liga_id}/ranking", response_model=list[RankingLigaResponse])
 
-def ranking_da_liga(liga_id: int, db: Session = Depends(get_db), usuario_logado = Depends(get_current_user)):
-    return ranking_liga(db=db, liga_id=liga_id)
+async def ranking_da_liga(liga_id: int, request: Request, db: AsyncSession = Depends(get_async_read_db), usuario_logado = Depends(get_current_user_async_read)):
+    versao = await versao_ranking_async(db, liga_id)
+    if versao is None:
+        return JSONRapidaResponse(await ranking_liga_async(db=db, liga_id=liga_id))
+
+    etag = _etag_ranking(liga_id, versao)
+    if nao_modificado(request, etag):
+        return _resposta_304(etag)
+
+    cache = get_response_cache()
+    chave = ("ranking", liga_id, versao)
+    dados = cache.get(chave)
+    if dados is None:
+        dados = await ranking_liga_async(db=db, liga_id=liga_id)
+        cache.set(chave, dados)
+    # _montar_ranking já devolve os campos de RankingLigaResponse: serializa direto
+    return JSONRapidaResponse(dados, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL_RANKING})
 
 @router.get("/{liga_id}/{rodada}/ranking_por_rodada", response_model=list[RankingLigaRodadaResponse])
 
-def ranking_da_liga_por_rodada(liga_id: int, rodada: int, db: Session = Depends(get_db), usuario_logado = Depends(get_current_user)):
-    return ranking_liga_rodada(db=db, liga_id=liga_id, rodada=rodada)
+def ranking_da_liga_por_rodada(liga_id: int, rodada: int, request: Request, response: Response, db: Session = Depends(get_read_db), usuario_logado = Depends(get_current_user)):
+    versao = versao_ranking(db, liga_id)
+    if versao is None:
+        return ranking_liga_rodada(db=db, liga_id=liga_id, rodada=rodada)
+
+    etag = _etag_ranking(liga_id, versao)
+    if nao_modificado(request, etag):
+        return _resposta_304(etag)
+    _cabecalhos_ranking(response, etag)
+
+    cache = get_response_cache()
+    chave = ("ranking_por_rodada", liga_id, versao, rodada)
+    dados = cache.get(chave)
+    if dados is None:
+        dados = [dict(r._mapping) for r in ranking_liga_rodada(db=db, liga_id=liga_id, rodada=rodada)]
+        cache.set(chave, dados)
+    return dados
+
+@router.get("/{liga_id}/evolucao_ranking", response_model=EvolucaoRankingResponse)
+
+def evolucao_do_ranking(liga_id: int, request: Request, response: Response, db: Session = Depends(get_read_db), usuario_logado = Depends(get_current_user)):
+    versao = versao_ranking(db, liga_id)
+    if versao is None:
+        raise HTTPException(status_code=404, detail="Liga não encontrada.")
+
+    etag = _etag_ranking(liga_id, versao)
+    if nao_modificado(request, etag):
+        return _resposta_304(etag)
+    _cabecalhos_ranking(response, etag)
+
+    cache = get_response_cache()
+    chave = ("evolucao_ranking", liga_id, versao)
+    dados = cache.get(chave)
+    if dados is None:
+        dados = evolucao_ranking(db, liga_id)
+        cache.set(chave, dados)
+    return dados
 
 @router.get("/{liga_id}/pontuacao_acumulada", response_model=Union[list[PontuacaoAcumuladaResponse], PontuacaoAcumuladaSeriesResponse])
 
-def pontucao_acumulada_usuario(liga_id: int, usuario_nome: str,rodada: Optional[int] = Query(None), format: str = Query(default="flat", pattern="^(flat|series)$"), db: Session = Depends(get_db), usuario_logado = Depends(get_current_user)):
+def pontucao_acumulada_usuario(liga_id: int, usuario_nome: str,rodada: Optional[int] = Query(None), format: str = Query(default="flat", pattern="^(flat|series)$"), db: Session = Depends(get_read_db), usuario_logado = Depends(get_current_user)):
     flat = pontuacao_acumulada_por_usuario(db, liga_id=liga_id, nome_usuario=usuario_nome, rodada=rodada)
 
     if not flat:
@@ -66,13 +139,29 @@ def pontucao_acumulada_usuario(liga_id: int, usuario_nome: str,rodada: Optional[
 
 @router.get("/{liga_id}/pontuacao_acumulada/todos", response_model=Union[list[PontuacaoAcumuladaResponse], PontuacaoAcumuladaSeriesResponse])
 
-def pontuacao_acumulada_geral(liga_id: int, rodada: Optional[int] = Query(None), format: str = Query(default="flat", pattern="^(flat|series)$"), db: Session = Depends(get_db), ususario_logado = Depends(get_current_user)):
-    flat = pontuacao_acumulada_todos(db=db, liga_id=liga_id, rodada=rodada)
-
-    if not flat:
-        return {"max_rodada": 0, "series": []} if format == "series" else []
-
-    max_rodada_eff = max(int(r["rodada"]) for r in flat)
-    return to_series(flat, max_rodada_eff) if format == "series" else flat
-
-
+def pontuacao_acumulada_geral(liga_id: int, request: Request, rodada: Optional[int] = Query(None), format: str = Query(default="flat", pattern="^(flat|series)$"), db: Session = Depends(get_read_db), ususario_logado = Depends(get_current_user)):
+    versao = versao_ranking(db, liga_id)
+    headers = {}
+    if versao is None:
+        dados = _calcular_pontuacao_acumulada_todos(db, liga_id, rodada, format)
+    else:
+        etag = _etag_ranking(liga_id, versao)
+        if nao_modificado(request, etag):
+            return _resposta_304(etag)
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL_RANKING}
+
+        cache = get_response_cache()
+        chave = ("pontuacao_acumulada_todos", liga_id, versao, rodada, format)
+        dados = cache.get(chave)
+        if dados is None:
+            dados = _calcular_pontuacao_acumulada_todos(db, liga_id, rodada, format)
+            cache.set(chave, dados)
+
+    # já está no formato final (só ints/strs): serializa direto, sem validar item a item
+    return JSONRapidaResponse(dados, headers=headers)
+
+
+def _calcular_pontuacao_acumulada_todos(db: Session, liga_id: int, rodada: int | None, format: str):
+    if format == "series":
+        return pontuacao_acumulada_series_todos(db=db, liga_id=liga_id, rodada=rodada)
+    return pontuacao_acumulada_todos(db=db, liga_id=liga_id, rodada=rodada)
@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import Response
+
+from app.core.metricas import CONTENT_TYPE, METRICS_TOKEN, REGISTRO
+
+router = APIRouter(tags=["Métricas"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics(authorization: str | None = Header(default=None)):
+    """Métricas deste processo no formato de texto do Prometheus (ver app/core/metricas.py)."""
+    if METRICS_TOKEN and authorization != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Token de métricas inválido.")
+    return Response(content=REGISTRO.renderizar(), media_type=CONTENT_TYPE)
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
@@ -13,7 +13,9 @@ from app.schemas.pagamentos import LigaPagamentoResponse, LigaPagamentoUpsert
 
 from app.crud.cobranca_mes import listar_cobranca_meses, upsert_cobranca_mes
 from app.crud.pagamentos import listar_pagamentos, upsert_pagamento
-from app.models.liga_membro import LigaMembro
+from app.core.papel_liga import obter_papel_liga
+from app.core.paginacao import ParametrosPagina, montar_pagina
+from app.schemas.paginacao import Pagina
 
 
 
@@ -25,13 +27,7 @@ def exigir_admin_liga(db: Session, liga_id: int, current_user_id: int) -> None:
     Garante que o usuário autenticado seja admin_liga na liga.
     Suporta papel como Enum (ex: LigaRole.admin_liga) ou string.
     """
-    membro = (
-        db.query(LigaMembro)
-        .filter(LigaMembro.liga_id == liga_id, LigaMembro.usuario_id == current_user_id)
-        .first()
-    )
-
-    role_raw = membro.papel if membro else None
+    role_raw = obter_papel_liga(db, liga_id, current_user_id)
 
     # Normaliza role para string "admin_liga"
     role: str | None = None
@@ -72,15 +68,26 @@ def api_upsert_cobranca_mes(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@router.get("/pagamentos_liga/{liga_id}", response_model=List[LigaPagamentoResponse])
+@router.get("/pagamentos_liga/{liga_id}", response_model=Union[List[LigaPagamentoResponse], Pagina[LigaPagamentoResponse]])
 def api_listar_pagamentos(
     liga_id: int,
     usuario_id: Optional[int] = Query(None),
+    pagina: ParametrosPagina = Depends(),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     exigir_admin_liga(db, liga_id=liga_id, current_user_id=current_user.id)
-    return listar_pagamentos(db, liga_id=liga_id, usuario_id=usuario_id)
+    if not pagina.paginado:
+        return listar_pagamentos(db, liga_id=liga_id, usuario_id=usuario_id)
+
+    pagamentos = listar_pagamentos(
+        db,
+        liga_id=liga_id,
+        usuario_id=usuario_id,
+        limite=pagina.limit + 1,
+        apos=pagina.chave(int, int),
+    )
+    return montar_pagina(pagamentos, pagina.limit, lambda p: (p.usuario_id, p.mes))
 
 
 @router.put("/pagamentos_liga/{liga_id}/usuarios/{usuario_id}", response_model=LigaPagamentoResponse)
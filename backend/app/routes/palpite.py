@@ -1,12 +1,14 @@
 # app/routes/palpite.py
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
-from app.core.dependencies import get_current_user
+from app.database import get_async_db, get_db, get_read_db
+from app.core.dependencies import get_current_user, get_current_user_async
+from app.core.respostas import JSONRapidaResponse
 from app.models.usuario import Usuario
-from app.schemas.palpite import PalpiteCreate, PalpiteJogoLigaResponse, PalpiteResponse, PalpiteRodadaResponse
-from app.services.palpites import meu_palpite_no_jogo, palpite_response_do_jogo, palpites_do_jogo_na_liga, palpites_usuario_na_rodada, upsert_palpite, remover_meu_palpite, validar_membro_liga
+from app.schemas.palpite import PalpiteCreate, PalpiteJogoCreate, PalpiteMultiLigasCreate, PalpiteMultiLigasResponse, PalpiteJogoLigaResponse, PalpiteResponse, PalpiteRodadaResponse
+from app.services.palpites import meu_palpite_no_jogo, palpite_response_do_jogo, palpites_do_jogo_na_liga, palpites_usuario_na_rodada, palpites_usuario_na_rodada_async, upsert_palpite, upsert_palpites_rodada, upsert_palpites_multiligas, remover_meu_palpite, validar_membro_liga
 from app.models.palpite import Palpite
 
 router = APIRouter(prefix="/palpites", tags=["Palpites"])
@@ -28,6 +30,34 @@ def criar_ou_atualizar_meu_palpite(
     return resp
 
 
+@router.put("/ligas/{liga_id}/rodadas/{rodada}/meus", response_model=list[PalpiteRodadaResponse])
+
+def criar_ou_atualizar_meus_palpites_na_rodada(
+    liga_id: int,
+    rodada: int,
+    body: list[PalpiteJogoCreate],
+    db: Session = Depends(get_db),
+    usuario_logado: Usuario = Depends(get_current_user),
+):
+    if not body:
+        raise HTTPException(status_code=400, detail="Informe ao menos um palpite.")
+
+    upsert_palpites_rodada(db, liga_id, usuario_logado.id, rodada, body)
+    return palpites_usuario_na_rodada(db, liga_id, usuario_logado.id, rodada)
+
+
+@router.put("/temporadas/{temporada_id}/meus", response_model=PalpiteMultiLigasResponse)
+
+def replicar_meus_palpites_nas_ligas(
+    temporada_id: int,
+    body: PalpiteMultiLigasCreate,
+    db: Session = Depends(get_db),
+    usuario_logado: Usuario = Depends(get_current_user),
+):
+    ligas = upsert_palpites_multiligas(db, usuario_logado.id, temporada_id, body.palpites, body.liga_ids)
+    return {"liga_ids": ligas, "palpites_gravados": len(ligas) * len(body.palpites)}
+
+
 @router.get("/ligas/{liga_id}/jogos/{jogo_id}/meu", response_model=PalpiteRodadaResponse)
 
 def ver_meu_palpite(
@@ -48,22 +78,22 @@ def ver_meu_palpite(
 def listar_palpites_do_jogo_na_liga(
     liga_id: int,
     jogo_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     usuario_logado: Usuario = Depends(get_current_user),
 ):
     validar_membro_liga(db, liga_id, usuario_logado.id)
-    return palpites_do_jogo_na_liga(db, liga_id, jogo_id)
+    # dicts já com os campos de PalpiteJogoLigaResponse: serializa direto
+    return JSONRapidaResponse(palpites_do_jogo_na_liga(db, liga_id, jogo_id))
 
 @router.get("/{liga_id}/rodadas/{rodada}/usuarios/me/palpites", response_model=list[PalpiteRodadaResponse],)
 
-def meus_palpites_na_rodada(
+async def meus_palpites_na_rodada(
     liga_id: int,
     rodada: int,
-    db: Session = Depends(get_db),
-    usuario_logado: Usuario = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    usuario_logado: Usuario = Depends(get_current_user_async),
 ):
-    validar_membro_liga(db, liga_id, usuario_logado.id)
-    return palpites_usuario_na_rodada(db, liga_id, usuario_logado.id, rodada)
+    return await palpites_usuario_na_rodada_async(db, liga_id, usuario_logado.id, rodada)
 
 
 @router.delete("/ligas/{liga_id}/jogos/{jogo_id}/meu", status_code=status.HTTP_204_NO_CONTENT)
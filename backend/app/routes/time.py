@@ -2,30 +2,37 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.core.permissions import require_admin
+from app.core.permissions import Admin, require_admin
 from app.schemas.time import TimeCreate, TimeUpdate, TimeResponse
 from app.crud.time import criar_time, listar_times, buscar_time, atualizar_time, deletar_time
+from app.core.cache_http import cache_referencia
 from app.core.dependencies import get_current_user
+from app.core.paginacao import ParametrosPagina, montar_pagina
+from app.schemas.paginacao import Pagina
 
 
 router = APIRouter(prefix="/times", tags=["Times"])
 
 
 @router.post("", response_model=TimeResponse, status_code=status.HTTP_201_CREATED)
-def criar(body: TimeCreate, db: Session = Depends(get_db), admin=Depends(require_admin)):
+def criar(body: TimeCreate, db: Session = Depends(get_db), admin: Admin = Depends(require_admin)):
     try:
         return criar_time(db, body)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("", response_model=list[TimeResponse])
-def listar(db: Session = Depends(get_db), usuario_logado=Depends(get_current_user)):
-    return listar_times(db)
+@router.get("", response_model=list[TimeResponse] | Pagina[TimeResponse])
+def listar(pagina: ParametrosPagina = Depends(), db: Session = Depends(get_db), usuario_logado=Depends(get_current_user), _cache=Depends(cache_referencia("times"))):
+    if not pagina.paginado:
+        return listar_times(db)
+
+    times = listar_times(db, limite=pagina.limit + 1, apos=pagina.chave(str, int))
+    return montar_pagina(times, pagina.limit, lambda t: (t.nome, t.id))
 
 
 @router.get("/{time_id}", response_model=TimeResponse)
-def busca_time(time_id: int, db: Session = Depends(get_db), usuario_logado=Depends(get_current_user)):
+def busca_time(time_id: int, db: Session = Depends(get_db), usuario_logado=Depends(get_current_user), _cache=Depends(cache_referencia("times"))):
     time = buscar_time(db, time_id)
     if not time:
         raise HTTPException(status_code=404, detail="Time não encontrado.")
@@ -33,7 +40,7 @@ def busca_time(time_id: int, db: Session = Depends(get_db), usuario_logado=Depen
 
 
 @router.put("/{time_id}", response_model=TimeResponse)
-def atualiza_time(time_id: int, body: TimeUpdate, db: Session = Depends(get_db), admin=Depends(require_admin)):
+def atualiza_time(time_id: int, body: TimeUpdate, db: Session = Depends(get_db), admin: Admin = Depends(require_admin)):
     time = buscar_time(db, time_id)
     if not time:
         raise HTTPException(status_code=404, detail="Time não encontrado.")
@@ -41,7 +48,7 @@ def atualiza_time(time_id: int, body: TimeUpdate, db: Session = Depends(get_db),
 
 
 @router.delete("/{time_id}", status_code=status.HTTP_204_NO_CONTENT)
-def exclui_time(time_id: int, db: Session = Depends(get_db), admin=Depends(require_admin)):
+def exclui_time(time_id: int, db: Session = Depends(get_db), admin: Admin = Depends(require_admin)):
     time = buscar_time(db, time_id)
     if not time:
         raise HTTPException(status_code=404, detail="Time não encontrado.")
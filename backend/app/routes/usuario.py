@@ -1,14 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Union
 
 from app.schemas.usuario import UsuarioCreate, UsuarioResponse, UsuarioUpdate, UsuarioMeUpdate
 from app.crud.usuario import criar_usuario, listar_usuarios, buscar_usuario_por_id, atualizar_usuario, deletar_usuario, atualizar_me_usuario
 from app.database import get_db
 from app.core.dependencies import get_current_user
 from app.models.usuario import Usuario
-from app.core.permissions import require_admin
+from app.core.permissions import Admin, require_admin
+from app.core.paginacao import ParametrosPagina, montar_pagina
+from app.schemas.paginacao import Pagina
 
 
 router = APIRouter(prefix="/usuarios", tags=["Usuarios"])
@@ -55,14 +57,18 @@ def deletar_me(db: Session = Depends(get_db), usuario_logado: Usuario = Depends(
 
 
 # region Rotas Admin    
-@router.get("/", response_model=List[UsuarioResponse])
+@router.get("/", response_model=Union[List[UsuarioResponse], Pagina[UsuarioResponse]])
 
-def listar(db: Session = Depends(get_db), admin = Depends(require_admin)):
-    return listar_usuarios(db)
+def listar(pagina: ParametrosPagina = Depends(), db: Session = Depends(get_db), admin: Admin = Depends(require_admin)):
+    if not pagina.paginado:
+        return listar_usuarios(db)
+
+    usuarios = listar_usuarios(db, limite=pagina.limit + 1, apos=pagina.chave(int))
+    return montar_pagina(usuarios, pagina.limit, lambda u: (u.id,))
 
 @router.get("/{usuario_id}", response_model=UsuarioResponse)
 
-def buscar(usuario_id: int, db: Session = Depends(get_db), admin = Depends(require_admin)):
+def buscar(usuario_id: int, db: Session = Depends(get_db), admin: Admin = Depends(require_admin)):
     usuario = buscar_usuario_por_id(db, usuario_id)
     if not usuario:
         raise HTTPException(status_code=404, detail="Usuário não encontrado.")
@@ -70,7 +76,7 @@ def buscar(usuario_id: int, db: Session = Depends(get_db), admin = Depends(requi
 
 @router.put("/{usuario_id}", response_model=UsuarioResponse)
 
-def atualizar(usuario_id: int, dados: UsuarioUpdate, db: Session = Depends(get_db), admin = Depends(require_admin)):
+def atualizar(usuario_id: int, dados: UsuarioUpdate, db: Session = Depends(get_db), admin: Admin = Depends(require_admin)):
     usuario = atualizar_usuario(db, usuario_id, dados)
     if not usuario:
         raise HTTPException(status_code=404, detail="Usuário não encontrado.")
@@ -78,7 +84,7 @@ def atualizar(usuario_id: int, dados: UsuarioUpdate, db: Session = Depends(get_d
 
 @router.delete("/{usuario_id}")
 
-def deletar(usuario_id: int, db: Session = Depends(get_db), admin = Depends(require_admin)):
+def deletar(usuario_id: int, db: Session = Depends(get_db), admin: Admin = Depends(require_admin)):
     sucesso = deletar_usuario(db, usuario_id)
     if not sucesso:
         raise HTTPException(status_code=404, detail="Usuário não encontrado.")
@@ -16,6 +16,9 @@ class JogoUpdate(BaseModel):
 class JogoResultadoUpdate(BaseModel):
     gols_casa: int
     gols_fora: int
+
+class JogoResultadoLoteItem(JogoResultadoUpdate):
+    jogo_id: int
     
 
 class TimeResumo(BaseModel):
@@ -59,4 +59,14 @@ class PontuacaoAcumuladaSerie(BaseModel):
 
 class PontuacaoAcumuladaSeriesResponse(BaseModel):
     max_rodada: int
-    series: List[PontuacaoAcumuladaSerie]
\ No newline at end of file
+    series: List[PontuacaoAcumuladaSerie]
+
+class EvolucaoRankingSerie(BaseModel):
+    nome: str
+    # um item por rodada de `rodadas`; None se o usuário ainda não era membro
+    posicoes: List[Optional[int]]
+    pontos: List[Optional[int]]
+
+class EvolucaoRankingResponse(BaseModel):
+    rodadas: List[int]
+    series: List[EvolucaoRankingSerie]
@@ -1,11 +1,22 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class PalpiteCreate(BaseModel):
     placar_casa: int = Field(ge=0,le=20)
     placar_fora: int = Field(ge=0,le=20)
 
+class PalpiteJogoCreate(PalpiteCreate):
+    jogo_id: int
+
+class PalpiteMultiLigasCreate(BaseModel):
+    palpites: List[PalpiteJogoCreate] = Field(min_length=1)
+    liga_ids: Optional[List[int]] = Field(default=None, min_length=1)  # None = todas as ligas da temporada
+
+class PalpiteMultiLigasResponse(BaseModel):
+    liga_ids: List[int]
+    palpites_gravados: int
+
 class PalpiteResponse(BaseModel):
     jogo_id: int
     time_casa: str
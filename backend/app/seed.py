@@ -2,13 +2,14 @@ import os
 from sqlalchemy.orm import Session
 
 
-from app.database import Sessionlocal 
+from app.database import SessionLocal
 from app import models 
 from app.models.competicao import Competicao
 from app.models.usuario import Usuario
 from app.models.temporada import Temporada
 from app.models.time import Time
 from app.core.security import get_password_hash
+from app.crud.versao_tabela import incrementar_versao
 
 
 TIMES_BRASILEIRAO_2025 = [
@@ -102,6 +103,7 @@ def seed_competicao_temporada(db: Session):
         comp = Competicao(nome="Brasileirão Série A", pais="Brasil", tipo="liga")
         db.add(comp)
         db.flush()
+        incrementar_versao(db, "competicoes")
         print("✅ Competição criada.")
     else:
         print("✅ Competição já existe.")
@@ -116,6 +118,7 @@ def seed_competicao_temporada(db: Session):
         temp = Temporada(competicao_id=comp.id, ano=2025, status="planejada")
         db.add(temp)
         db.flush()
+        incrementar_versao(db, "temporadas")
         print("✅ Temporada 2025 criada.")
     else:
         print("✅ Temporada 2025 já existe.")
@@ -127,10 +130,13 @@ def seed_times(db: Session):
         if not time:
             db.add(Time(nome=nome, sigla=sigla))
             criados += 1
+    if criados:
+        # invalida o cache HTTP (ETag) de GET /times
+        incrementar_versao(db, "times")
     print(f"✅ Times inseridos: {criados} (idempotente).")
 
 def run_seed():
-    db = Sessionlocal()
+    db = SessionLocal()
     try:
         seed_admin(db)
         seed_usuarios(db)
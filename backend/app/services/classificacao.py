@@ -0,0 +1,178 @@
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database import dialect_insert
+from app.models.jogo import Jogo
+from app.models.liga import Liga
+from app.models.liga_classificacao import LigaClassificacao
+from app.models.liga_membro import LigaMembro
+from app.models.palpite import Palpite
+
+CAMPOS_CLASSIFICACAO = (
+    "pontos",
+    "acertos_placar",
+    "acertos_saldo",
+    "acertos_resultado",
+    "erros",
+    "palpites_feitos",
+)
+
+# SQLite limita a quantidade de parâmetros por statement
+_LOTE_UPSERT = 500
+
+
+def contribuicao(pontos: int | None) -> dict:
+    """Quanto um palpite com `pontos` soma em cada coluna da classificação."""
+    if pontos is None:
+        return {c: 0 for c in CAMPOS_CLASSIFICACAO}
+
+    return {
+        "pontos": pontos,
+        "acertos_placar": int(pontos == 5),
+        "acertos_saldo": int(pontos == 4),
+        "acertos_resultado": int(pontos == 3),
+        "erros": int(pontos == 0),
+        "palpites_feitos": 1,
+    }
+
+
+def acumular_delta(deltas: dict, liga_id: int, usuario_id: int, pontos_antes: int | None, pontos_depois: int | None) -> None:
+    antes = contribuicao(pontos_antes)
+    depois = contribuicao(pontos_depois)
+
+    atual = deltas.setdefault((liga_id, usuario_id), {c: 0 for c in CAMPOS_CLASSIFICACAO})
+    for c in CAMPOS_CLASSIFICACAO:
+        atual[c] += depois[c] - antes[c]
+
+
+def _contribuicoes_sql(pontos) -> dict:
+    """Versão SQL de `contribuicao`: uma expressão por coluna, avaliada linha a linha."""
+    return {
+        "pontos": func.coalesce(pontos, 0),
+        "acertos_placar": case((pontos == 5, 1), else_=0),
+        "acertos_saldo": case((pontos == 4, 1), else_=0),
+        "acertos_resultado": case((pontos == 3, 1), else_=0),
+        "erros": case((pontos == 0, 1), else_=0),
+        "palpites_feitos": case((pontos.isnot(None), 1), else_=0),
+    }
+
+
+def colunas_agregadas(pontos):
+    """Expressões de agregação (SUM) equivalentes a `contribuicao` somada."""
+    return [
+        func.coalesce(func.sum(expr), 0).label(c)
+        for c, expr in _contribuicoes_sql(pontos).items()
+    ]
+
+
+def colunas_delta(pontos_antes, pontos_depois):
+    """SUM(contribuição depois - contribuição antes), por coluna da classificação."""
+    antes = _contribuicoes_sql(pontos_antes)
+    depois = _contribuicoes_sql(pontos_depois)
+    return [
+        func.coalesce(func.sum(depois[c] - antes[c]), 0).label(c)
+        for c in CAMPOS_CLASSIFICACAO
+    ]
+
+
+def aplicar_deltas_classificacao(db: Session, deltas: dict) -> None:
+    """
+    Soma os deltas {(liga_id, usuario_id): {campo: delta}} na tabela liga_classificacao
+    com INSERT ... ON CONFLICT DO UPDATE. Não faz commit: roda na transação de quem chamou.
+    """
+    rows = [
+        {"liga_id": liga_id, "usuario_id": usuario_id, **d}
+        for (liga_id, usuario_id), d in deltas.items()
+        if any(d.values())
+    ]
+
+    for i in range(0, len(rows), _LOTE_UPSERT):
+        stmt = dialect_insert(db, LigaClassificacao).values(rows[i:i + _LOTE_UPSERT])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["liga_id", "usuario_id"],
+            set_={c: getattr(LigaClassificacao, c) + getattr(stmt.excluded, c) for c in CAMPOS_CLASSIFICACAO},
+        )
+        db.execute(stmt)
+
+
+def estornar_jogos(db: Session, jogo_ids: list[int]) -> None:
+    """Remove da classificação a pontuação já lançada dos jogos informados (ex.: antes de excluí-los)."""
+    rows = (
+        db.query(
+            Palpite.liga_id,
+            Palpite.usuario_id,
+            *colunas_agregadas(Palpite.pontos),
+        )
+        .filter(Palpite.jogo_id.in_(jogo_ids), Palpite.pontos.isnot(None))
+        .group_by(Palpite.liga_id, Palpite.usuario_id)
+        .all()
+    )
+
+    deltas = {
+        (r.liga_id, r.usuario_id): {c: -int(getattr(r, c)) for c in CAMPOS_CLASSIFICACAO}
+        for r in rows
+    }
+    aplicar_deltas_classificacao(db, deltas)
+    invalidar_ranking_por_jogos(db, jogo_ids)
+
+
+def invalidar_ranking_ligas(db: Session, liga_ids) -> None:
+    """
+    Incrementa ligas.ranking_versao (ETag/cache das rotas de ranking). `liga_ids`
+    pode ser uma lista ou um select de ids. Não faz commit.
+    """
+    db.execute(
+        update(Liga)
+        .where(Liga.id.in_(liga_ids))
+        .values(ranking_versao=Liga.ranking_versao + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def invalidar_ranking_por_jogos(db: Session, jogo_ids: list[int]) -> None:
+    """Resultado lançado/corrigido/excluído: muda o ranking de todas as ligas da temporada."""
+    invalidar_ranking_ligas(
+        db,
+        select(Liga.id).where(
+            Liga.temporada_id.in_(select(Jogo.temporada_id).where(Jogo.id.in_(jogo_ids)))
+        ),
+    )
+
+
+def invalidar_ranking_por_usuario(db: Session, usuario_id: int) -> None:
+    """Nome do usuário mudou: aparece no ranking de todas as ligas dele."""
+    invalidar_ranking_ligas(db, select(LigaMembro.liga_id).where(LigaMembro.usuario_id == usuario_id))
+
+
+def versao_ranking(db: Session, liga_id: int) -> int | None:
+    """None se a liga não existe."""
+    return db.execute(select(Liga.ranking_versao).where(Liga.id == liga_id)).scalar()
+
+
+async def versao_ranking_async(db: AsyncSession, liga_id: int) -> int | None:
+    return (await db.execute(select(Liga.ranking_versao).where(Liga.id == liga_id))).scalar()
+
+
+def reconstruir_classificacao(db: Session, liga_id: int | None = None) -> None:
+    """Regera a classificação do zero a partir dos palpites pontuados (uma liga ou todas)."""
+    q_delete = db.query(LigaClassificacao)
+    if liga_id is not None:
+        q_delete = q_delete.filter(LigaClassificacao.liga_id == liga_id)
+    q_delete.delete(synchronize_session=False)
+
+    agregado = (
+        select(Palpite.liga_id, Palpite.usuario_id, *colunas_agregadas(Palpite.pontos))
+        .where(Palpite.pontos.isnot(None))
+        .group_by(Palpite.liga_id, Palpite.usuario_id)
+    )
+    if liga_id is not None:
+        agregado = agregado.where(Palpite.liga_id == liga_id)
+
+    db.execute(
+        insert(LigaClassificacao).from_select(
+            ["liga_id", "usuario_id", *CAMPOS_CLASSIFICACAO],
+            agregado,
+        )
+    )
+    db.commit()
@@ -0,0 +1,239 @@
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models import Jogo, Liga, LigaMembro, LigaRodadaSnapshot, Palpite, Usuario
+from app.models.jogo import STATUS_ENCERRADOS
+
+_CAMPOS = ("pontos", "acertos_placar", "acertos_saldo", "acertos_resultado")
+
+
+def _rodadas_fechadas(db: Session, temporada_id: int, a_partir_da_rodada: int = 1, entre: set[int] | None = None) -> list[int]:
+    """
+    Rodadas da temporada cujos jogos estão todos encerrados (finalizados ou
+    cancelados); com `entre`, só as dessas rodadas.
+    """
+    stmt = select(Jogo.rodada).where(Jogo.temporada_id == temporada_id, Jogo.rodada >= a_partir_da_rodada)
+    if entre is not None:
+        stmt = stmt.where(Jogo.rodada.in_(entre))
+    return list(
+        db.execute(
+            stmt
+            .group_by(Jogo.rodada)
+            .having(func.sum(case((Jogo.status.in_(STATUS_ENCERRADOS), 0), else_=1)) == 0)
+            .order_by(Jogo.rodada)
+        ).scalars()
+    )
+
+
+def _classificacao_por_rodada(db: Session, temporada_id: int, liga_ids: list[int], rodadas: list[int]):
+    """
+    Para cada rodada pedida, a classificação acumulada de cada liga:
+    {rodada: {liga_id: [linha, ...]}}, linhas já em ordem de posição.
+
+    Uma consulta traz os pontos por (liga, usuário, rodada) de todos os jogos
+    finalizados até a maior rodada pedida; o acúmulo é feito aqui. O desempate é o
+    mesmo do ranking geral (pontos, placar, saldo, resultado, nome).
+    """
+    if not rodadas or not liga_ids:
+        return {}
+    ultima = max(rodadas)
+
+    membros = db.execute(
+        select(LigaMembro.liga_id, Usuario.id, Usuario.nome)
+        .join(Usuario, Usuario.id == LigaMembro.usuario_id)
+        .where(LigaMembro.liga_id.in_(liga_ids))
+    ).all()
+
+    por_rodada = db.execute(
+        select(
+            Palpite.liga_id,
+            Palpite.usuario_id,
+            Jogo.rodada,
+            func.coalesce(func.sum(Palpite.pontos), 0),
+            func.sum(case((Palpite.pontos == 5, 1), else_=0)),
+            func.sum(case((Palpite.pontos == 4, 1), else_=0)),
+            func.sum(case((Palpite.pontos == 3, 1), else_=0)),
+        )
+        .join(Jogo, Jogo.id == Palpite.jogo_id)
+        .where(
+            Palpite.liga_id.in_(liga_ids),
+            Jogo.temporada_id == temporada_id,
+            Jogo.status == "finalizado",
+            Jogo.rodada <= ultima,
+        )
+        .group_by(Palpite.liga_id, Palpite.usuario_id, Jogo.rodada)
+    ).all()
+
+    # (liga, usuario) -> {rodada: (pontos, placar, saldo, resultado)}
+    parciais: dict[tuple[int, int], dict[int, tuple[int, ...]]] = {}
+    for liga_id, usuario_id, rodada, *valores in por_rodada:
+        parciais.setdefault((liga_id, usuario_id), {})[rodada] = tuple(int(v or 0) for v in valores)
+
+    acumulado = {
+        (liga_id, usuario_id): {"usuario_id": usuario_id, "nome": nome, **{c: 0 for c in _CAMPOS}}
+        for liga_id, usuario_id, nome in membros
+    }
+
+    pedidas = set(rodadas)
+    resultado = {}
+    for rodada in range(1, ultima + 1):
+        for chave, linha in acumulado.items():
+            valores = parciais.get(chave, {}).get(rodada)
+            linha["pontos_rodada"] = valores[0] if valores else 0
+            if valores:
+                for campo, valor in zip(_CAMPOS, valores):
+                    linha[campo] += valor
+
+        if rodada not in pedidas:
+            continue
+
+        por_liga: dict[int, list[dict]] = {liga_id: [] for liga_id in liga_ids}
+        for (liga_id, _), linha in acumulado.items():
+            por_liga[liga_id].append(dict(linha))
+        for linhas in por_liga.values():
+            linhas.sort(key=lambda l: (-l["pontos"], -l["acertos_placar"], -l["acertos_saldo"], -l["acertos_resultado"], l["nome"]))
+            for posicao, linha in enumerate(linhas, start=1):
+                linha["posicao"] = posicao
+        resultado[rodada] = por_liga
+
+    return resultado
+
+
+def _gravar_snapshots(db: Session, temporada_id: int, liga_ids: list[int], rodadas: list[int]) -> None:
+    rows = [
+        {
+            "liga_id": liga_id,
+            "rodada": rodada,
+            "usuario_id": linha["usuario_id"],
+            "posicao": linha["posicao"],
+            "pontos": linha["pontos"],
+            "pontos_rodada": linha["pontos_rodada"],
+            "acertos_placar": linha["acertos_placar"],
+            "acertos_saldo": linha["acertos_saldo"],
+            "acertos_resultado": linha["acertos_resultado"],
+        }
+        for rodada, por_liga in _classificacao_por_rodada(db, temporada_id, liga_ids, rodadas).items()
+        for liga_id, linhas in por_liga.items()
+        for linha in linhas
+    ]
+    if rows:
+        db.execute(insert(LigaRodadaSnapshot), rows)
+
+
+def _ligas_da_temporada(db: Session, temporada_id: int) -> list[int]:
+    return list(db.execute(select(Liga.id).where(Liga.temporada_id == temporada_id)).scalars())
+
+
+def recalcular_snapshots(db: Session, temporada_id: int, a_partir_da_rodada: int = 1) -> None:
+    """
+    Regrava liga_rodada_snapshot das rodadas fechadas >= `a_partir_da_rodada` em
+    todas as ligas da temporada. A posição é acumulada, então corrigir um jogo da
+    rodada 3 refaz também as rodadas fechadas depois dela.
+    Não faz commit: roda na transação de quem chamou.
+    """
+    liga_ids = _ligas_da_temporada(db, temporada_id)
+    if not liga_ids:
+        return
+
+    db.execute(
+        delete(LigaRodadaSnapshot)
+        .where(LigaRodadaSnapshot.liga_id.in_(liga_ids), LigaRodadaSnapshot.rodada >= a_partir_da_rodada)
+        .execution_options(synchronize_session=False)
+    )
+    _gravar_snapshots(db, temporada_id, liga_ids, _rodadas_fechadas(db, temporada_id, a_partir_da_rodada))
+
+
+def atualizar_snapshots_rodadas(db: Session, temporada_id: int, rodadas: set[int]) -> None:
+    """
+    Jogos das `rodadas` mudaram (resultado, status, exclusão): grava só o que mudou.
+
+    - nenhuma snapshot a partir dessas rodadas: grava as rodadas que acabaram de
+      fechar (nenhuma, no caso comum de resultado com a rodada ainda aberta);
+    - já há snapshot (resultado corrigido, rodada reaberta ou fechada fora de
+      ordem): as posições acumuladas das rodadas seguintes mudam, então refaz a
+      partir da menor rodada afetada.
+
+    Não faz commit: roda na transação de quem chamou.
+    """
+    desde = min(rodadas)
+    ja_gravada = db.execute(
+        select(LigaRodadaSnapshot.id)
+        .join(Liga, Liga.id == LigaRodadaSnapshot.liga_id)
+        .where(Liga.temporada_id == temporada_id, LigaRodadaSnapshot.rodada >= desde)
+        .limit(1)
+    ).first()
+    if ja_gravada:
+        recalcular_snapshots(db, temporada_id, desde)
+        return
+
+    fechadas = _rodadas_fechadas(db, temporada_id, desde, entre=rodadas)
+    if fechadas:
+        liga_ids = _ligas_da_temporada(db, temporada_id)
+        if liga_ids:
+            _gravar_snapshots(db, temporada_id, liga_ids, fechadas)
+
+
+def atualizar_snapshots_por_jogos(db: Session, jogo_ids: list[int]) -> None:
+    """Resultado lançado/corrigido: atualiza os snapshots das rodadas desses jogos (ver atualizar_snapshots_rodadas)."""
+    if not jogo_ids:
+        return
+
+    por_temporada: dict[int, set[int]] = {}
+    for temporada_id, rodada in db.execute(
+        select(Jogo.temporada_id, Jogo.rodada).where(Jogo.id.in_(jogo_ids)).distinct()
+    ):
+        por_temporada.setdefault(temporada_id, set()).add(rodada)
+    for temporada_id, rodadas in por_temporada.items():
+        atualizar_snapshots_rodadas(db, temporada_id, rodadas)
+
+
+def evolucao_ranking(db: Session, liga_id: int) -> dict:
+    """
+    Posição e pontos acumulados de cada membro depois de cada rodada.
+
+    Rodadas fechadas vêm de liga_rodada_snapshot; as que ainda têm jogo por
+    finalizar (ou ficaram sem snapshot) são calculadas na hora, numa consulta só.
+    """
+    temporada_id = db.query(Liga.temporada_id).filter(Liga.id == liga_id).scalar()
+
+    ultima = (
+        db.query(func.max(Jogo.rodada))
+        .filter(Jogo.temporada_id == temporada_id, Jogo.status == "finalizado")
+        .scalar()
+    )
+    if not ultima:
+        return {"rodadas": [], "series": []}
+    rodadas = list(range(1, int(ultima) + 1))
+
+    membros = db.execute(
+        select(Usuario.id, Usuario.nome)
+        .join(LigaMembro, LigaMembro.usuario_id == Usuario.id)
+        .where(LigaMembro.liga_id == liga_id)
+    ).all()
+
+    coluna = {rodada: i for i, rodada in enumerate(rodadas)}
+    series = {
+        usuario_id: {"nome": nome, "posicoes": [None] * len(rodadas), "pontos": [None] * len(rodadas)}
+        for usuario_id, nome in membros
+    }
+
+    com_snapshot = set()
+    for rodada, usuario_id, posicao, pontos in db.execute(
+        select(LigaRodadaSnapshot.rodada, LigaRodadaSnapshot.usuario_id, LigaRodadaSnapshot.posicao, LigaRodadaSnapshot.pontos)
+        .where(LigaRodadaSnapshot.liga_id == liga_id, LigaRodadaSnapshot.rodada <= ultima)
+    ):
+        com_snapshot.add(rodada)
+        serie = series.get(usuario_id)
+        if serie is not None:
+            serie["posicoes"][coluna[rodada]] = posicao
+            serie["pontos"][coluna[rodada]] = pontos
+
+    faltando = [r for r in rodadas if r not in com_snapshot]
+    for rodada, por_liga in _classificacao_por_rodada(db, temporada_id, [liga_id], faltando).items():
+        for linha in por_liga[liga_id]:
+            serie = series[linha["usuario_id"]]
+            serie["posicoes"][coluna[rodada]] = linha["posicao"]
+            serie["pontos"][coluna[rodada]] = linha["pontos"]
+
+    ordem = sorted(series.values(), key=lambda s: (s["posicoes"][-1] is None, s["posicoes"][-1] or 0, s["nome"]))
+    return {"rodadas": rodadas, "series": ordem}
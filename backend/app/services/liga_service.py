@@ -1,10 +1,13 @@
+import numpy as np
 from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, case
+from sqlalchemy import and_, func, case, select
 
 
 from app.core.liga_roles import LigaRole
-from app.models import Palpite, Jogo, LigaMembro, Liga, Usuario
+from app.core.papel_liga import invalidar_papel_liga
+from app.models import Palpite, Jogo, LigaMembro, Liga, Usuario, LigaClassificacao
 
 def transferir_posse_liga(
         db: Session,
@@ -43,32 +46,36 @@ def transferir_posse_liga(
         db.rollback()
         raise 
 
+    invalidar_papel_liga(db, liga_id, dono_atual_id)
+    invalidar_papel_liga(db, liga_id, novo_dono_id)
 
-def ranking_liga(db: Session, liga_id: int):
-    temporada_id = (
-        db.query(Liga.temporada_id)
-        .filter(Liga.id == liga_id)
-        .scalar()
-    )
 
-    jogo_encerrado = (Jogo.status == "finalizado")
+def _select_ranking_liga(liga_id: int):
+    # Lê a classificação materializada (liga_classificacao), mantida por delta em
+    # atualizar_resultado; membros sem palpite pontuado entram zerados.
+    # Statement único para ranking_liga e ranking_liga_async.
+    temporada_liga_sq = (
+        select(Liga.temporada_id)
+        .where(Liga.id == liga_id)
+        .scalar_subquery()
+    )
 
     total_jogos_encerrados_sq = (
-        db.query(func.count(Jogo.id))
-        .filter(Jogo.temporada_id == temporada_id)
-        .filter(jogo_encerrado)
+        select(func.count(Jogo.id))
+        .where(Jogo.temporada_id == temporada_liga_sq)
+        .where(Jogo.status == "finalizado")
         .scalar_subquery()
     )
 
-    pontos_expr = func.coalesce(func.sum(Palpite.pontos), 0)
-    placar_expr = func.coalesce(func.sum(case((Palpite.pontos == 5, 1), else_=0)), 0)
-    saldo_expr = func.coalesce(func.sum(case((Palpite.pontos == 4, 1), else_=0)), 0)
-    resultado_expr = func.coalesce(func.sum(case((Palpite.pontos == 3, 1), else_=0)), 0)
-    erros_expr = func.coalesce(func.sum(case((Palpite.pontos == 0, 1), else_=0)), 0)
-    palpites_expr = func.coalesce(func.count(Palpite.id), 0)
+    pontos_expr = func.coalesce(LigaClassificacao.pontos, 0)
+    placar_expr = func.coalesce(LigaClassificacao.acertos_placar, 0)
+    saldo_expr = func.coalesce(LigaClassificacao.acertos_saldo, 0)
+    resultado_expr = func.coalesce(LigaClassificacao.acertos_resultado, 0)
+    erros_expr = func.coalesce(LigaClassificacao.erros, 0)
+    palpites_expr = func.coalesce(LigaClassificacao.palpites_feitos, 0)
 
-    q = (
-        db.query(
+    return (
+        select(
             Usuario.nome.label("nome"),
             pontos_expr.label("pontos"),
             placar_expr.label("acertos_placar"),
@@ -79,23 +86,14 @@ def ranking_liga(db: Session, liga_id: int):
             palpites_expr.label("palpites_feitos"),
         )
         .join(LigaMembro, LigaMembro.usuario_id == Usuario.id)
-        .filter(LigaMembro.liga_id == liga_id)
+        .where(LigaMembro.liga_id == liga_id)
         .outerjoin(
-            Palpite,
+            LigaClassificacao,
             and_(
-                Palpite.liga_id == LigaMembro.liga_id,
-                Palpite.usuario_id == LigaMembro.usuario_id,
+                LigaClassificacao.liga_id == LigaMembro.liga_id,
+                LigaClassificacao.usuario_id == LigaMembro.usuario_id,
             ),
         )
-        .outerjoin(
-            Jogo,
-            and_(
-                Jogo.id == Palpite.jogo_id,
-                Jogo.temporada_id == temporada_id,
-                jogo_encerrado,
-            ),
-        )
-        .group_by(Usuario.id)
         .order_by(
             pontos_expr.desc(),
             placar_expr.desc(),
@@ -105,8 +103,16 @@ def ranking_liga(db: Session, liga_id: int):
         )
     )
 
-    rows = q.all()
 
+def ranking_liga(db: Session, liga_id: int):
+    return _montar_ranking(db.execute(_select_ranking_liga(liga_id)).all())
+
+
+async def ranking_liga_async(db: AsyncSession, liga_id: int):
+    return _montar_ranking((await db.execute(_select_ranking_liga(liga_id))).all())
+
+
+def _montar_ranking(rows):
     out = []
     for r in rows:
         jogos = int(r.jogos_encerrados or 0)
@@ -327,3 +333,71 @@ def pontuacao_acumulada_todos(db, liga_id: int, rodada: int | None = None):
                 "pontuacao_acumulada": acumulado,
             })
     return out
+
+
+def pontuacao_acumulada_series_todos(db: Session, liga_id: int, rodada: int | None = None) -> dict:
+    """
+    Mesmo resultado de pontuacao_acumulada_todos já no formato series, sem a
+    lista flat intermediária: uma consulta traz os pontos por (usuário, rodada),
+    que viram uma matriz usuários × rodadas acumulada com cumsum.
+    """
+    temporada_id = db.query(Liga.temporada_id).filter(Liga.id == liga_id).scalar()
+
+    if rodada is None:
+        rodada = (
+            db.query(func.max(Jogo.rodada))
+            .filter(Jogo.temporada_id == temporada_id, Jogo.status == "finalizado")
+            .scalar()
+        )
+    if not rodada:
+        return {"max_rodada": 0, "series": []}
+    rodada = int(rodada)
+
+    rows = db.execute(
+        select(
+            Usuario.id,
+            Usuario.nome,
+            Jogo.rodada,
+            func.coalesce(func.sum(Palpite.pontos), 0),
+        )
+        .select_from(Palpite)
+        .join(Jogo, Jogo.id == Palpite.jogo_id)
+        .join(
+            LigaMembro,
+            and_(LigaMembro.liga_id == Palpite.liga_id, LigaMembro.usuario_id == Palpite.usuario_id),
+        )
+        .join(Usuario, Usuario.id == Palpite.usuario_id)
+        .where(
+            Palpite.liga_id == liga_id,
+            Jogo.temporada_id == temporada_id,
+            Jogo.status == "finalizado",
+            Jogo.rodada <= rodada,
+        )
+        .group_by(Usuario.id, Usuario.nome, Jogo.rodada)
+    ).all()
+
+    if not rows:
+        return {"max_rodada": 0, "series": []}
+
+    # só entra quem tem ao menos um palpite em jogo finalizado, como no flat
+    linha_por_usuario: dict[int, int] = {}
+    nomes: list[str] = []
+    linhas = np.empty(len(rows), dtype=np.intp)
+    for i, (usuario_id, nome, _, _) in enumerate(rows):
+        linha = linha_por_usuario.get(usuario_id)
+        if linha is None:
+            linha = linha_por_usuario[usuario_id] = len(nomes)
+            nomes.append(nome)
+        linhas[i] = linha
+
+    colunas = np.fromiter((r[2] - 1 for r in rows), dtype=np.intp, count=len(rows))
+    pontos = np.fromiter((r[3] for r in rows), dtype=np.int64, count=len(rows))
+
+    matriz = np.zeros((len(nomes), rodada), dtype=np.int64)
+    matriz[linhas, colunas] = pontos
+    acumulado = np.cumsum(matriz, axis=1).tolist()
+
+    return {
+        "max_rodada": rodada,
+        "series": [{"nome": nome, "data": data} for nome, data in zip(nomes, acumulado)],
+    }
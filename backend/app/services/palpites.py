@@ -1,6 +1,7 @@
 # app/services/palpites.py  (pode ser app/crud/palpite.py se preferir)
 from datetime import datetime, timezone
-from sqlalchemy import and_
+from sqlalchemy import and_, case, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, aliased
 from fastapi import HTTPException
 
@@ -10,17 +11,23 @@ from app.models.jogo import Jogo
 from app.models.palpite import Palpite
 from app.models.time import Time
 from app.models.usuario import Usuario
+from app.database import dialect_insert
+from app.core.papel_liga import obter_papel_liga, obter_papel_liga_async
+from app.services.classificacao import CAMPOS_CLASSIFICACAO, acumular_delta, aplicar_deltas_classificacao, colunas_delta, invalidar_ranking_ligas, invalidar_ranking_por_jogos
+from app.services.evolucao_ranking import atualizar_snapshots_por_jogos
+
+# SQLite limita a quantidade de parâmetros por statement
+_LOTE_UPSERT_PALPITES = 500
 
 def utcnow():
     return datetime.now(timezone.utc)
 
 def validar_membro_liga(db: Session, liga_id: int, usuario_id: int) -> None:
-    membro = (
-        db.query(LigaMembro)
-        .filter(LigaMembro.liga_id == liga_id, LigaMembro.usuario_id == usuario_id)
-        .first()
-    )
-    if not membro:
+    if obter_papel_liga(db, liga_id, usuario_id) is None:
+        raise HTTPException(status_code=403, detail="Você não é membro desta liga.")
+
+async def validar_membro_liga_async(db: AsyncSession, liga_id: int, usuario_id: int) -> None:
+    if await obter_papel_liga_async(db, liga_id, usuario_id) is None:
         raise HTTPException(status_code=403, detail="Você não é membro desta liga.")
 
 def buscar_liga(db: Session, liga_id: int) -> Liga:
@@ -99,10 +106,118 @@ def remover_meu_palpite(db: Session, liga_id: int, usuario_id: int, jogo_id: int
     if not palpite:
         raise HTTPException(status_code=404, detail="Palpite não encontrado.")
 
+    if palpite.pontos is not None:
+        deltas = {}
+        acumular_delta(deltas, liga_id, usuario_id, palpite.pontos, None)
+        aplicar_deltas_classificacao(db, deltas)
+        invalidar_ranking_ligas(db, [liga_id])
+
     db.delete(palpite)
     db.commit()
 
 
+def buscar_temporada_se_membro(db: Session, liga_id: int, usuario_id: int) -> int | None:
+    """Valida pertencimento (via cache de papéis) e devolve a temporada da liga."""
+    validar_membro_liga(db, liga_id, usuario_id)
+    return db.query(Liga.temporada_id).filter(Liga.id == liga_id).scalar()
+
+def validar_jogos_para_palpite(db: Session, jogo_ids: list[int], temporada_id: int | None, rodada: int | None = None) -> list[Jogo]:
+    """Carrega os jogos numa query e aplica as mesmas validações de upsert_palpite a cada um."""
+    if len(set(jogo_ids)) != len(jogo_ids):
+        raise HTTPException(status_code=400, detail="Jogo repetido na lista de palpites.")
+
+    jogos = db.query(Jogo).filter(Jogo.id.in_(jogo_ids)).all()
+    if len(jogos) != len(jogo_ids):
+        raise HTTPException(status_code=404, detail="Jogo não encontrado.")
+
+    for jogo in jogos:
+        if temporada_id is not None and jogo.temporada_id != temporada_id:
+            raise HTTPException(status_code=400, detail="Este jogo não pertence à temporada da liga.")
+        if rodada is not None and jogo.rodada != rodada:
+            raise HTTPException(status_code=400, detail="Este jogo não pertence à rodada informada.")
+        validar_lock(jogo)
+
+    return jogos
+
+def upsert_palpites_em_lote(db: Session, rows: list[dict]) -> None:
+    """
+    Grava vários palpites com um único
+    INSERT ... ON CONFLICT (liga_id, usuario_id, jogo_id) DO UPDATE.
+    Cada row: liga_id, usuario_id, jogo_id, placar_casa, placar_fora.
+    """
+    agora = utcnow()
+
+    for i in range(0, len(rows), _LOTE_UPSERT_PALPITES):
+        stmt = dialect_insert(db, Palpite).values(rows[i:i + _LOTE_UPSERT_PALPITES])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["liga_id", "usuario_id", "jogo_id"],
+            set_={
+                "placar_casa": stmt.excluded.placar_casa,
+                "placar_fora": stmt.excluded.placar_fora,
+                "ultima_atualizacao": agora,
+            },
+        )
+        db.execute(stmt)
+
+def upsert_palpites_rodada(db: Session, liga_id: int, usuario_id: int, rodada: int, palpites: list) -> None:
+    temporada_id = buscar_temporada_se_membro(db, liga_id, usuario_id)
+    validar_jogos_para_palpite(db, [p.jogo_id for p in palpites], temporada_id, rodada)
+
+    upsert_palpites_em_lote(db, [
+        {
+            "liga_id": liga_id,
+            "usuario_id": usuario_id,
+            "jogo_id": p.jogo_id,
+            "placar_casa": p.placar_casa,
+            "placar_fora": p.placar_fora,
+        }
+        for p in palpites
+    ])
+    db.commit()
+
+
+def upsert_palpites_multiligas(db: Session, usuario_id: int, temporada_id: int, palpites: list, liga_ids: list[int] | None = None) -> list[int]:
+    """
+    Replica os mesmos palpites em todas as ligas do usuário na temporada
+    (ou só nas `liga_ids` informadas). Retorna as ligas gravadas.
+    """
+    q = (
+        db.query(Liga.id)
+        .join(LigaMembro, LigaMembro.liga_id == Liga.id)
+        .filter(Liga.temporada_id == temporada_id, LigaMembro.usuario_id == usuario_id)
+    )
+    if liga_ids is not None:
+        q = q.filter(Liga.id.in_(liga_ids))
+    ligas = sorted(r.id for r in q.all())
+
+    if liga_ids is not None:
+        fora = sorted(set(liga_ids) - set(ligas))
+        if fora:
+            raise HTTPException(
+                status_code=403,
+                detail=f"Você não é membro destas ligas nesta temporada: {', '.join(map(str, fora))}.",
+            )
+    if not ligas:
+        raise HTTPException(status_code=404, detail="Você não participa de nenhuma liga nesta temporada.")
+
+    validar_jogos_para_palpite(db, [p.jogo_id for p in palpites], temporada_id)
+
+    upsert_palpites_em_lote(db, [
+        {
+            "liga_id": liga_id,
+            "usuario_id": usuario_id,
+            "jogo_id": p.jogo_id,
+            "placar_casa": p.placar_casa,
+            "placar_fora": p.placar_fora,
+        }
+        for liga_id in ligas
+        for p in palpites
+    ])
+    db.commit()
+
+    return ligas
+
+
 def calcular_pontuacao(gols_casa_palpite: int, gols_fora_palpite: int, gols_casa_real: int, gols_fora_real: int) -> int:
     #acertou placar exato leva 5 pontos
     if gols_casa_palpite == gols_casa_real and gols_fora_palpite == gols_fora_real:
@@ -125,15 +240,81 @@ def calcular_pontuacao(gols_casa_palpite: int, gols_fora_palpite: int, gols_casa
 
     return 0
 
-def palpites_usuario_na_rodada(db: Session, liga_id: int, usuario_id: int, rodada: int):
-    validar_membro_liga(db, liga_id, usuario_id)
-    temporada_id = db.query(Liga.temporada_id).filter(Liga.id == liga_id).scalar()
+def calcular_pontuacao_sql(gols_casa_palpite, gols_fora_palpite, gols_casa_real, gols_fora_real):
+    """
+    Mesma regra de `calcular_pontuacao` como expressão CASE, para pontuar
+    em lote num único UPDATE. Os argumentos são colunas/expressões SQL.
+    """
+    diferenca_palpite = gols_casa_palpite - gols_fora_palpite
+    diferenca_real = gols_casa_real - gols_fora_real
+
+    return case(
+        # placar exato
+        (and_(gols_casa_palpite == gols_casa_real, gols_fora_palpite == gols_fora_real), 5),
+        # houve empate: 3 se apostou empate, senão 0
+        (and_(diferenca_real == 0, diferenca_palpite == 0), 3),
+        (diferenca_real == 0, 0),
+        # acertou a diferença de gols
+        (diferenca_palpite == diferenca_real, 4),
+        # acertou o lado vencedor
+        (
+            or_(
+                and_(diferenca_palpite > 0, diferenca_real > 0),
+                and_(diferenca_palpite < 0, diferenca_real < 0),
+            ),
+            3,
+        ),
+        else_=0,
+    )
+
+def pontuar_jogos(db: Session, jogo_ids: list[int]) -> None:
+    """
+    Pontua todos os palpites dos jogos informados a partir de jogos.gols_casa/gols_fora
+    (já gravados na sessão) e aplica a diferença na liga_classificacao.
+    Não faz commit: roda na transação de quem chamou.
+    """
+    if not jogo_ids:
+        return
+
+    db.flush()
+
+    pontos_novos = calcular_pontuacao_sql(Palpite.placar_casa, Palpite.placar_fora, Jogo.gols_casa, Jogo.gols_fora)
+
+    # 1. diferença de classificação por (liga, usuario), calculada antes de sobrescrever os pontos
+    rows = (
+        db.query(Palpite.liga_id, Palpite.usuario_id, *colunas_delta(Palpite.pontos, pontos_novos))
+        .join(Jogo, Jogo.id == Palpite.jogo_id)
+        .filter(Jogo.id.in_(jogo_ids))
+        .group_by(Palpite.liga_id, Palpite.usuario_id)
+        .all()
+    )
+    deltas = {
+        (r.liga_id, r.usuario_id): {c: int(getattr(r, c)) for c in CAMPOS_CLASSIFICACAO}
+        for r in rows
+    }
+
+    # 2. UPDATE palpites SET pontos = CASE ... FROM jogos (um statement para todos os jogos)
+    db.execute(
+        update(Palpite)
+        .where(Palpite.jogo_id == Jogo.id, Jogo.id.in_(jogo_ids))
+        .values(pontos=pontos_novos)
+        .execution_options(synchronize_session=False)
+    )
+
+    aplicar_deltas_classificacao(db, deltas)
+    invalidar_ranking_por_jogos(db, jogo_ids)
+
+    # a rodada pode ter acabado de fechar (ou um resultado antigo foi corrigido)
+    atualizar_snapshots_por_jogos(db, jogo_ids)
+
+def _select_palpites_usuario_na_rodada(liga_id: int, usuario_id: int, rodada: int):
+    temporada_id_sq = select(Liga.temporada_id).where(Liga.id == liga_id).scalar_subquery()
 
     Casa = aliased(Time)
     Fora = aliased(Time)
 
-    rows = (
-        db.query(
+    return (
+        select(
             Jogo.id.label("jogo_id"),
             Jogo.data_hora,
             Casa.nome.label("time_casa"),
@@ -156,14 +337,14 @@ def palpites_usuario_na_rodada(db: Session, liga_id: int, usuario_id: int, rodad
                 Palpite.usuario_id == usuario_id,
             ),
         )
-        .filter(
-            Jogo.temporada_id == temporada_id,
+        .where(
+            Jogo.temporada_id == temporada_id_sq,
             Jogo.rodada == rodada,
         )
         .order_by(Jogo.data_hora.asc().nullslast(), Jogo.id.asc())
-        .all()
     )
 
+def _palpites_rodada_response(rows) -> list[dict]:
     return [
     {
         "jogo_id": r.jogo_id,
@@ -180,6 +361,16 @@ def palpites_usuario_na_rodada(db: Session, liga_id: int, usuario_id: int, rodad
     for r in rows
 ]
 
+def palpites_usuario_na_rodada(db: Session, liga_id: int, usuario_id: int, rodada: int):
+    validar_membro_liga(db, liga_id, usuario_id)
+    rows = db.execute(_select_palpites_usuario_na_rodada(liga_id, usuario_id, rodada)).all()
+    return _palpites_rodada_response(rows)
+
+async def palpites_usuario_na_rodada_async(db: AsyncSession, liga_id: int, usuario_id: int, rodada: int):
+    await validar_membro_liga_async(db, liga_id, usuario_id)
+    rows = (await db.execute(_select_palpites_usuario_na_rodada(liga_id, usuario_id, rodada))).all()
+    return _palpites_rodada_response(rows)
+
 def meu_palpite_no_jogo(db: Session, liga_id: int, usuario_id: int, jogo_id: int):
     Casa = aliased(Time)
     Fora = aliased(Time)
@@ -1,8 +1,10 @@
+import os
+import time
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 from sqlalchemy.orm import Session
 from sqlalchemy.orm import aliased
-from sqlalchemy import exists, and_
+from sqlalchemy import case, exists, and_, insert, or_, update
 
 from app.models.jogo import Jogo
 from app.models.liga import Liga
@@ -11,7 +13,10 @@ from app.models.liga_membro import LigaMembro
 from app.models.palpite import Palpite
 from app.models.push_token import PushToken
 from app.models.push_alert_log import PushAlertLog
-from app.services.push_sender import send_to_token
+from app.models.push_alert_schedule import PushAlertSchedule
+from app.crud.push_alert_schedule import ALERT_OFFSETS_MIN, to_utc  # noqa: F401  (re-export)
+from app.services.push_sender import enviar_mensagens
+from app.core.metricas import registrar_tick_push
 
 from firebase_admin._messaging_utils import UnregisteredError
 import logging
@@ -22,14 +27,12 @@ logger = logging.getLogger(__name__)
 
 TZ = ZoneInfo("America/Sao_Paulo")
 
-# minutos antes do jogo
-ALERT_OFFSETS_MIN = [480, 240, 120, 60, 30, 15, 10, 5, 2, 1]  # 8h, 4h, 2h, 1h, 30m, 15m, 10m, 5m, 2m, 1m
+# Reivindicação de uma linha da outbox sem conclusão (worker morreu no meio do
+# envio) volta a valer depois disso
+PUSH_CLAIM_TTL_SECONDS = int(os.getenv("PUSH_CLAIM_TTL_SECONDS", "300"))
 
-
-def to_utc(dt: datetime) -> datetime:
-    if dt.tzinfo is None:
-        return dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc)
+# Tentativas de envio de um alerta antes de desistir dele (fica no log como erro)
+PUSH_MAX_TENTATIVAS = int(os.getenv("PUSH_MAX_TENTATIVAS", "5"))
 
 
 def _format_offset(minutes: int) -> str:
@@ -39,135 +42,344 @@ def _format_offset(minutes: int) -> str:
     return f"{minutes} min"
 
 
-def run_missing_bet_alerts(db: Session):
-    dialect = db.get_bind().dialect.name
-    now_local = datetime.now(TZ)
-    now_utc = now_local.astimezone(timezone.utc)
+def _desativar_tokens(db: Session, tokens: list[str]) -> None:
+    if not tokens:
+        return
+    (
+        db.query(PushToken)
+        .filter(PushToken.token.in_(tokens))
+        .update({PushToken.is_active: False}, synchronize_session=False)
+    )
 
-    try:
-        for offset in ALERT_OFFSETS_MIN:
-            alert_type = f"PRE_{offset}"
-
-            if dialect == "sqlite":
-                start_local = now_local + timedelta(minutes=offset)
-                end_local = now_local + timedelta(minutes=offset + 1)
-                start_cmp = start_local.replace(tzinfo=None)
-                end_cmp = end_local.replace(tzinfo=None)
-            else:
-                start_cmp = now_utc + timedelta(minutes=offset)
-                end_cmp = now_utc + timedelta(minutes=offset + 1)
-
-            jogos = (
-                db.query(Jogo)
-                .filter(
-                    Jogo.status == "agendado",
-                    Jogo.data_hora.isnot(None),
-                    Jogo.data_hora >= start_cmp,
-                    Jogo.data_hora < end_cmp,
+
+def _coletar_envios(db: Session, now_utc: datetime, stats: dict) -> tuple[list[dict], dict[int, dict]]:
+    """
+    Fase de banco: reivindica as linhas vencidas da outbox (FOR UPDATE SKIP LOCKED,
+    seguro com vários workers) e devolve o que enviar, só com valores simples
+    (nada de objetos ORM que precisem do banco depois).
+
+    A linha enviada ganha só claimed_at (+1 em attempts); sent_at e os
+    PushAlertLog ficam para _concluir_envios, depois do envio. Reivindicações
+    mais velhas que PUSH_CLAIM_TTL_SECONDS (worker que morreu no meio) voltam a
+    valer. Linha com tokens_pendentes (tentativa anterior falhou para alguns
+    tokens) reenvia só para eles, sem recalcular os destinatários.
+    Devolve (envios, reivindicados), reivindicados por jogo_id.
+    """
+    pendentes = (
+        db.query(PushAlertSchedule)
+        .filter(
+            PushAlertSchedule.sent_at.is_(None),
+            PushAlertSchedule.due_at <= now_utc,
+            or_(
+                PushAlertSchedule.claimed_at.is_(None),
+                PushAlertSchedule.claimed_at <= now_utc - timedelta(seconds=PUSH_CLAIM_TTL_SECONDS),
+            ),
+        )
+        .order_by(PushAlertSchedule.due_at.asc())
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+    # Se mais de um offset do mesmo jogo venceu (worker atrasado), só o mais
+    # próximo do início é enviado ("faltam 15 min" vale mais que um "faltam 8h"
+    # atrasado); os anteriores são baixados e contados em stats["offsets_pulados"].
+    por_jogo: dict[int, PushAlertSchedule] = {}
+    for item in pendentes:
+        atual = por_jogo.get(item.jogo_id)
+        if atual is None or item.offset_min < atual.offset_min:
+            por_jogo[item.jogo_id] = item
+
+    pulados: dict[int, list[int]] = {}
+    for item in pendentes:
+        if por_jogo[item.jogo_id] is not item:
+            item.sent_at = now_utc
+            pulados.setdefault(item.jogo_id, []).append(item.offset_min)
+    for jogo_id, offsets in pulados.items():
+        logger.info(
+            "Jogo %s: alertas PRE_%s vencidos sem envio (substituídos por PRE_%s)",
+            jogo_id, ",".join(str(o) for o in sorted(offsets, reverse=True)), por_jogo[jogo_id].offset_min,
+        )
+    stats["offsets_pulados"] = sum(len(o) for o in pulados.values())
+
+    if not por_jogo:
+        return [], {}
+
+    mandante = aliased(Time)
+    visitante = aliased(Time)
+
+    jogos = (
+        db.query(Jogo, mandante.nome.label("mandante_nome"), visitante.nome.label("visitante_nome"))
+        .join(mandante, mandante.id == Jogo.time_casa_id)
+        .join(visitante, visitante.id == Jogo.time_fora_id)
+        .filter(Jogo.id.in_(list(por_jogo.keys())))
+        .all()
+    )
+
+    # jogo_id -> (offset, "mandante x visitante") só para os jogos ainda válidos
+    validos: dict[int, tuple[int, str]] = {}
+    for jogo, mandante_nome, visitante_nome in jogos:
+        if jogo.status != "agendado" or jogo.data_hora is None or to_utc(jogo.data_hora) <= now_utc:
+            continue
+        validos[jogo.id] = (por_jogo[jogo.id].offset_min, f"{mandante_nome} x {visitante_nome}")
+
+    # jogo cancelado/começou: nada a enviar, a linha é só baixada
+    for jogo_id, item in por_jogo.items():
+        if jogo_id not in validos:
+            item.sent_at = now_utc
+
+    stats["jogos"] = len(validos)
+    if not validos:
+        return [], {}
+
+    reivindicados: dict[int, dict] = {}
+    envios = []
+    novos = []
+    for jogo_id, (offset, confronto) in validos.items():
+        item = por_jogo[jogo_id]
+        item.claimed_at = now_utc
+        item.attempts = (item.attempts or 0) + 1
+        reivindicados[jogo_id] = {
+            "schedule_id": item.id,
+            "tentativa": item.attempts,
+            "alert_type": f"PRE_{item.offset_min}",
+            "ligas": set(),
+        }
+        if item.tokens_pendentes:
+            # reenvio: os logs das ligas já foram gravados na primeira tentativa
+            envios.extend(
+                _mensagem(jogo_id, offset, confronto, tuple(grupo["ligas"]), grupo["tokens"])
+                for grupo in item.tokens_pendentes
+            )
+        else:
+            novos.append(jogo_id)
+
+    if not novos:
+        return envios, reivindicados
+
+    # alert_type de cada jogo como expressão SQL, para o anti-join com o log
+    alert_type_sql = case(
+        {jogo_id: f"PRE_{validos[jogo_id][0]}" for jogo_id in novos},
+        value=Jogo.id,
+    )
+    nao_alertado = ~exists().where(
+        and_(
+            PushAlertLog.jogo_id == Jogo.id,
+            PushAlertLog.liga_id == Liga.id,
+            PushAlertLog.alert_type == alert_type_sql,
+        )
+    )
+
+    # (jogo, liga) ainda não alertados: todos ganham PushAlertLog (com ou sem
+    # destinatário) quando o envio do jogo for concluído
+    pares = (
+        db.query(Jogo.id, Liga.id)
+        .join(Liga, Liga.temporada_id == Jogo.temporada_id)
+        .filter(Jogo.id.in_(novos), nao_alertado)
+        .all()
+    )
+    for jogo_id, liga_id in pares:
+        reivindicados[jogo_id]["ligas"].add(liga_id)
+
+    if not pares:
+        return envios, reivindicados
+
+    # Todas as tuplas (jogo, liga, usuario, token) do tick numa única consulta:
+    # jogos -> ligas da temporada -> membros -> tokens ativos, sem palpite e sem log
+    destinatarios = (
+        db.query(Jogo.id, Liga.id, LigaMembro.usuario_id, PushToken.token)
+        .join(Liga, Liga.temporada_id == Jogo.temporada_id)
+        .join(LigaMembro, LigaMembro.liga_id == Liga.id)
+        .join(PushToken, and_(PushToken.user_id == LigaMembro.usuario_id, PushToken.is_active.is_(True)))
+        .filter(
+            Jogo.id.in_(novos),
+            nao_alertado,
+            ~exists().where(
+                and_(
+                    Palpite.liga_id == Liga.id,
+                    Palpite.jogo_id == Jogo.id,
+                    Palpite.usuario_id == LigaMembro.usuario_id,
                 )
-                .all()
+            ),
+        )
+        .yield_per(1000)
+    )
+
+    # jogo -> usuario -> (ligas pendentes, tokens)
+    por_usuario: dict[int, dict[int, tuple[set, set]]] = {}
+    for jogo_id, liga_id, usuario_id, token in destinatarios:
+        ligas, tokens = por_usuario.setdefault(jogo_id, {}).setdefault(usuario_id, (set(), set()))
+        ligas.add(liga_id)
+        tokens.add(token)
+
+    for jogo_id, usuarios in por_usuario.items():
+        offset, confronto = validos[jogo_id]
+
+        # uma mensagem por usuário (não por liga); usuários com o mesmo conjunto
+        # de ligas pendentes recebem o mesmo payload, então vão no mesmo multicast
+        tokens_por_ligas: dict[tuple[int, ...], list[str]] = {}
+        for ligas, tokens in usuarios.values():
+            tokens_por_ligas.setdefault(tuple(sorted(ligas)), []).extend(tokens)
+
+        for ligas_pendentes, tokens_grupo in tokens_por_ligas.items():
+            envios.append(_mensagem(jogo_id, offset, confronto, ligas_pendentes, tokens_grupo))
+
+    return envios, reivindicados
+
+
+def _mensagem(jogo_id: int, offset: int, confronto: str, ligas: tuple[int, ...], tokens: list[str]) -> dict:
+    return {
+        "jogo_id": jogo_id,
+        "ligas": ligas,
+        "tokens": tokens,
+        "title": "Palpite pendente 👀",
+        "body": f"Faltam {_format_offset(offset)} pro jogo {confronto}. Envie seu palpite!",
+        "data": {
+            "kind": "missing_bet",
+            "jogo_id": str(jogo_id),
+            "liga_id": str(ligas[0]),
+            "liga_ids": ",".join(str(lid) for lid in ligas),
+            "offset_min": str(offset),
+        },
+    }
+
+
+def _apurar(envio: dict, resultados: dict, stats: dict, desativar: set[str]) -> list[str]:
+    """
+    Resultado de um envio: conta os entregues, separa os tokens não registrados
+    (desativados) e devolve os que falharam por outro motivo (rede, FCM fora...),
+    que são os únicos tentados de novo no próximo tick.
+    """
+    falharam = []
+    for token, erro in resultados.items():
+        if erro is None:
+            stats["enviados"] += 1
+        elif isinstance(erro, UnregisteredError):
+            desativar.add(token)
+        else:
+            falharam.append(token)
+            logger.warning(
+                "Falha ao enviar push (token fica para o reenvio): %s",
+                erro,
+                extra={"token_prefix": token[:20], **envio["data"]},
             )
+    return falharam
 
-            for jogo in jogos:
-                ligas = db.query(Liga).filter(Liga.temporada_id == jogo.temporada_id).all()
-                if not ligas:
-                    continue
-
-                for liga in ligas:
-                    already = (
-                        db.query(PushAlertLog)
-                        .filter(
-                            PushAlertLog.jogo_id == jogo.id,
-                            PushAlertLog.liga_id == liga.id,
-                            PushAlertLog.alert_type == alert_type,
-                        )
-                        .first()
-                    )
-                    if already:
-                        continue
-
-                    missing_users = (
-                        db.query(LigaMembro.usuario_id)
-                        .filter(LigaMembro.liga_id == liga.id)
-                        .filter(
-                            ~exists().where(
-                                and_(
-                                    Palpite.liga_id == liga.id,
-                                    Palpite.jogo_id == jogo.id,
-                                    Palpite.usuario_id == LigaMembro.usuario_id,
-                                )
-                            )
-                        )
-                        .all()
-                    )
-                    user_ids = [r[0] for r in missing_users]
-
-                    if not user_ids:
-                        db.add(PushAlertLog(jogo_id=jogo.id, liga_id=liga.id, alert_type=alert_type))
-                        continue  # ✅ sem commit aqui, acumula e commita no final
-
-                    tokens = (
-                        db.query(PushToken)
-                        .filter(PushToken.user_id.in_(user_ids), PushToken.is_active.is_(True))
-                        .all()
-                    )
-
-                    offset_txt = _format_offset(offset)
-                    jogo_dt = jogo.data_hora
-
-                    if jogo_dt is not None:
-                        if dialect == "sqlite":
-                            jogo_dt_sp = jogo_dt.replace(tzinfo=TZ)
-                        else:
-                            jogo_dt_sp = to_utc(jogo_dt).astimezone(TZ)
-
-                        mandante = aliased(Time)
-                        visitante = aliased(Time)
-
-                        row = (
-                            db.query(Jogo, mandante.nome.label("mandante_nome"), visitante.nome.label("visitante_nome"))
-                            .join(mandante, mandante.id == Jogo.time_casa_id)
-                            .join(visitante, visitante.id == Jogo.time_fora_id)
-                            .filter(Jogo.id == jogo.id)
-                            .first()
-                        )
-                        jogo_obj, mandante_nome, visitante_nome = row
-                        body = f"Faltam {offset_txt} pro jogo {mandante_nome} x {visitante_nome}. Envie seu palpite!"
-                    else:
-                        body = f"Faltam {offset_txt} pro jogo. Envie seu palpite!"
-
-                    title = "Palpite pendente 👀"
-
-                    for t in tokens:
-                        try:
-                            send_to_token(
-                                t.token, title, body,
-                                {
-                                    "kind": "missing_bet",
-                                    "jogo_id": str(jogo.id),
-                                    "liga_id": str(liga.id),
-                                    "offset_min": str(offset),
-                                },
-                            )
-                        except UnregisteredError:
-                            t.is_active = False
-                        except Exception as e:
-                            logger.exception(
-                                "Falha ao enviar push (mantendo token ativo)",
-                                extra={
-                                    "user_id": getattr(t, "user_id", None),
-                                    "push_token_id": getattr(t, "id", None),
-                                    "jogo_id": jogo.id,
-                                    "liga_id": liga.id,
-                                    "alert_type": alert_type,
-                                },
-                            )
-
-                    db.add(PushAlertLog(jogo_id=jogo.id, liga_id=liga.id, alert_type=alert_type))
-
-        # ✅ Um único commit no final de tudo
-        db.commit()
 
+def _concluir_envios(
+    db: Session,
+    reivindicados: dict[int, dict],
+    pendentes: dict[int, list[dict]],
+    desativar: set[str],
+    now_utc: datetime,
+    stats: dict,
+) -> None:
+    """
+    Fase de banco depois dos envios: grava os PushAlertLog das ligas alertadas,
+    marca sent_at nos jogos entregues e, nos que tiveram tokens com falha, solta
+    a reivindicação guardando só esses tokens em tokens_pendentes (o próximo tick
+    reenvia para eles, até PUSH_MAX_TENTATIVAS). Não faz commit.
+    """
+    # os destinatários já foram decididos: as ligas entram no log mesmo com
+    # reenvio pendente, e o reenvio sai de tokens_pendentes
+    logs = [
+        {"jogo_id": jogo_id, "liga_id": liga_id, "alert_type": info["alert_type"]}
+        for jogo_id, info in reivindicados.items()
+        for liga_id in info["ligas"]
+    ]
+
+    entregues: list[int] = []
+    reenviar: list[dict] = []
+    for jogo_id, info in reivindicados.items():
+        grupos = pendentes.get(jogo_id)
+        if not grupos:
+            entregues.append(info["schedule_id"])
+        elif info["tentativa"] >= PUSH_MAX_TENTATIVAS:
+            logger.error(
+                "Alerta %s do jogo %s descartado após %s tentativas (%s tokens sem entrega)",
+                info["alert_type"], jogo_id, info["tentativa"], sum(len(g["tokens"]) for g in grupos),
+            )
+            entregues.append(info["schedule_id"])
+            stats["descartados"] += 1
+        else:
+            reenviar.append({"id": info["schedule_id"], "claimed_at": None, "tokens_pendentes": grupos})
+            stats["reenvios"] += 1
+
+    # o log continua por liga, mesmo que o envio seja consolidado por usuário
+    if logs:
+        db.execute(insert(PushAlertLog), logs)
+    if entregues:
+        (
+            db.query(PushAlertSchedule)
+            .filter(PushAlertSchedule.id.in_(entregues))
+            .update(
+                {PushAlertSchedule.sent_at: now_utc, PushAlertSchedule.claimed_at: None, PushAlertSchedule.tokens_pendentes: None},
+                synchronize_session=False,
+            )
+        )
+    if reenviar:
+        # UPDATE por chave primária, um statement para todas as linhas
+        db.execute(update(PushAlertSchedule), reenviar)
+
+    _desativar_tokens(db, list(desativar))
+    stats["tokens_desativados"] = len(desativar)
+
+
+def run_missing_bet_alerts(db: Session):
+    """
+    Dispara os alertas de palpite pendente vencidos na outbox push_alert_schedule.
+
+    1. transação curta: reivindica a outbox e monta os envios;
+    2. envios ao FCM em lote (multicast), todos juntos no executor do
+       push_sender, sem transação aberta;
+    3. transação curta: grava os logs, marca como enviadas as linhas entregues,
+       devolve à fila as que tiveram tokens com falha (só esses tokens são
+       reenviados) e desativa os tokens não registrados.
+
+    Entrega "pelo menos uma vez": se o processo morrer entre 2 e 3, a linha é
+    reenviada quando a reivindicação expirar.
+
+    Cada execução entra nas métricas push_alerts_* (GET /metrics).
+    """
+    inicio = time.perf_counter()
+    stats = None
+    try:
+        stats = _run_missing_bet_alerts(db)
+        return stats
+    finally:
+        registrar_tick_push(time.perf_counter() - inicio, stats)
+
+
+def _run_missing_bet_alerts(db: Session) -> dict:
+    now_utc = datetime.now(timezone.utc)
+    stats = {"jogos": 0, "enviados": 0, "tokens_desativados": 0, "offsets_pulados": 0, "reenvios": 0, "descartados": 0}
+
+    try:
+        envios, reivindicados = _coletar_envios(db, now_utc, stats)
+        db.commit()
     except Exception:
         db.rollback()  # ✅ Garante limpeza se algo explodir no meio
-        raise
\ No newline at end of file
+        raise
+
+    try:
+        resultados = enviar_mensagens(envios)
+    except Exception as e:
+        # nada saiu (credencial, init do Firebase...): todos os tokens ficam para o reenvio
+        logger.exception("Falha ao enviar push")
+        resultados = [dict.fromkeys(envio["tokens"], e) for envio in envios]
+
+    desativar: set[str] = set()
+    pendentes: dict[int, list[dict]] = {}
+    for envio, resultado in zip(envios, resultados):
+        falharam = _apurar(envio, resultado, stats, desativar)
+        if falharam:
+            pendentes.setdefault(envio["jogo_id"], []).append({"ligas": list(envio["ligas"]), "tokens": falharam})
+
+    if reivindicados or desativar:
+        try:
+            _concluir_envios(db, reivindicados, pendentes, desativar, now_utc, stats)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+    return stats
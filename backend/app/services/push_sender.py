@@ -1,19 +1,97 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from firebase_admin import messaging
 from app.core.firebase import get_firebase_app
 
+logger = logging.getLogger(__name__)
+
+# limite do FCM por chamada de send_each / multicast
+FCM_MAX_TOKENS_POR_LOTE = 500
+
+# lotes enviados em paralelo (cada lote é uma requisição HTTP ao FCM)
+PUSH_SEND_WORKERS = int(os.getenv("PUSH_SEND_WORKERS", "4"))
+
+# um executor para o processo todo: os lotes de todas as mensagens de um tick
+# dividem os mesmos PUSH_SEND_WORKERS
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
 
-def send_to_token(token: str, title: str, body: str, data: dict | None = None):
-    get_firebase_app()  # garante init
 
-    payload = {
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=max(1, PUSH_SEND_WORKERS), thread_name_prefix="push")
+    return _executor
+
+
+def _payload(title: str, body: str, data: dict | None = None) -> dict:
+    return {
         "title": title,
         "body": body,
         **{k: str(v) for k, v in (data or {}).items()},
     }
 
+
+def send_to_token(token: str, title: str, body: str, data: dict | None = None):
+    get_firebase_app()  # garante init
+
     msg = messaging.Message(
-        data=payload,
+        data=_payload(title, body, data),
         token=token,
     )
 
     return messaging.send(msg)
+
+
+def _enviar_lote(lote: list[str], payload: dict) -> list[tuple[str, Exception | None]]:
+    try:
+        resp = messaging.send_each_for_multicast(
+            messaging.MulticastMessage(data=payload, tokens=lote)
+        )
+    except Exception as e:
+        # falha do lote inteiro (rede, credencial...): vale para todos os tokens dele
+        logger.exception("Falha ao enviar lote de push (%s tokens)", len(lote))
+        return [(token, e) for token in lote]
+
+    return [
+        (token, None if r.success else r.exception)
+        for token, r in zip(lote, resp.responses)
+    ]
+
+
+def enviar_mensagens(mensagens: list[dict]) -> list[dict[str, Exception | None]]:
+    """
+    Envia várias mensagens ({"tokens", "title", "body", "data"}) via multicast,
+    em lotes de 500: os lotes de todas vão juntos para o executor do módulo, com
+    até PUSH_SEND_WORKERS requisições ao FCM em paralelo.
+    Retorna, na ordem das mensagens, {token: None} para sucesso ou {token: exceção}.
+    Não toca no banco: chame fora de transação.
+    """
+    if not any(m["tokens"] for m in mensagens):
+        return [{} for _ in mensagens]
+
+    get_firebase_app()  # garante init
+
+    executor = _get_executor()
+    futuros = []
+    for i, mensagem in enumerate(mensagens):
+        payload = _payload(mensagem["title"], mensagem["body"], mensagem.get("data"))
+        tokens = mensagem["tokens"]
+        for inicio in range(0, len(tokens), FCM_MAX_TOKENS_POR_LOTE):
+            lote = tokens[inicio:inicio + FCM_MAX_TOKENS_POR_LOTE]
+            futuros.append((i, executor.submit(_enviar_lote, lote, payload)))
+
+    resultados: list[dict[str, Exception | None]] = [{} for _ in mensagens]
+    for i, futuro in futuros:
+        resultados[i].update(futuro.result())
+    return resultados
+
+
+def send_to_tokens(tokens: list[str], title: str, body: str, data: dict | None = None) -> dict[str, Exception | None]:
+    """A mesma mensagem para vários tokens (ver enviar_mensagens)."""
+    return enviar_mensagens([{"tokens": tokens, "title": title, "body": body, "data": data}])[0]
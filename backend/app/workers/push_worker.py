@@ -1,15 +1,86 @@
+"""
+Worker dos alertas de palpite pendente.
+
+Roda run_missing_bet_alerts a cada virada de minuto do relógio (sem acumular
+atraso pelo tempo de execução) e encerra de forma limpa com SIGTERM/SIGINT.
+
+Janelas perdidas (worker parado, deploy, execução lenta) não se perdem: o
+cursor persistente é a própria outbox push_alert_schedule — toda linha com
+due_at <= agora e sent_at IS NULL entra no próximo tick. sent_at só é gravado
+depois do envio ao FCM: se o envio falha, a linha volta para a fila só com os
+tokens que falharam (até PUSH_MAX_TENTATIVAS); se o processo morre no meio, ela é reenviada quando a
+reivindicação expira (PUSH_CLAIM_TTL_SECONDS).
+
+Com METRICS_PORT definido, expõe GET /metrics nessa porta (contadores
+push_alerts_* e pool do banco deste processo).
+
+Uso:
+  cd backend
+  python -m app.workers.push_worker
+"""
+
+import logging
+import os
+import signal
+import threading
 import time
-from app.database import Sessionlocal
+
+from app.core.metricas import servir_metricas
+from app.database import SessionLocal
 from app.services.push_scheduler import run_missing_bet_alerts
 
+logger = logging.getLogger(__name__)
+
+INTERVALO_SEGUNDOS = 60
+
+_parar = threading.Event()
+
+
+def _proximo_tick(agora: float) -> float:
+    """Próxima virada de minuto (epoch) estritamente depois de `agora`."""
+    return (agora // INTERVALO_SEGUNDOS + 1) * INTERVALO_SEGUNDOS
+
+
+def _tratar_sinal(signum, _frame):
+    logger.info("Sinal %s recebido, encerrando após o ciclo atual.", signum)
+    _parar.set()
+
+
+def executar_ciclo() -> None:
+    db = SessionLocal()
+    try:
+        stats = run_missing_bet_alerts(db)
+        logger.info("Alertas de palpite pendente: %s", stats)
+    except Exception:
+        # não derruba o worker: as linhas sem sent_at voltam a valer quando a
+        # reivindicação expirar
+        logger.exception("Falha ao executar alertas de palpite pendente")
+    finally:
+        db.close()
+
+
 def main():
-    while True:
-        db = Sessionlocal()
-        try:
-            run_missing_bet_alerts(db)
-        finally:
-            db.close()
-        time.sleep(60)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    signal.signal(signal.SIGTERM, _tratar_sinal)
+    signal.signal(signal.SIGINT, _tratar_sinal)
+
+    porta_metricas = os.getenv("METRICS_PORT")
+    if porta_metricas:
+        servir_metricas(int(porta_metricas))
+        logger.info("Métricas em :%s/metrics", porta_metricas)
+
+    # roda já na subida para recuperar o que venceu enquanto o worker estava parado
+    executar_ciclo()
+
+    while not _parar.is_set():
+        espera = _proximo_tick(time.time()) - time.time()
+        if _parar.wait(max(0.0, espera)):
+            break
+        executar_ciclo()
+
+    logger.info("Worker de push encerrado.")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,77 @@
+"""add push_alert_schedule
+
+Revision ID: 3c9e4d2b7a10
+Revises: f7d01b618a52
+Create Date: 2026-10-18 11:40:02.118734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e4d2b7a10'
+down_revision: Union[str, Sequence[str], None] = 'f7d01b618a52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+ALERT_OFFSETS_MIN = [480, 240, 120, 60, 30, 15, 10, 5, 2, 1]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "push_alert_schedule",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("jogo_id", sa.Integer(), nullable=False),
+        sa.Column("offset_min", sa.Integer(), nullable=False),
+        sa.Column("due_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.ForeignKeyConstraint(["jogo_id"], ["jogos.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("jogo_id", "offset_min", name="uq_push_alert_schedule_jogo_offset"),
+    )
+    op.create_index("ix_push_alert_schedule_jogo_id", "push_alert_schedule", ["jogo_id"])
+    op.create_index(
+        "ix_push_alert_schedule_pendentes",
+        "push_alert_schedule",
+        ["due_at"],
+        postgresql_where=sa.text("sent_at IS NULL"),
+        sqlite_where=sa.text("sent_at IS NULL"),
+    )
+
+    # Agenda os jogos futuros que já existem no banco
+    offsets = ", ".join(f"({o})" for o in ALERT_OFFSETS_MIN)
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            f"""
+            INSERT INTO push_alert_schedule (jogo_id, offset_min, due_at)
+            SELECT j.id, o.offset_min, j.data_hora - make_interval(mins => o.offset_min)
+            FROM jogos j
+            CROSS JOIN (VALUES {offsets}) AS o(offset_min)
+            WHERE j.status = 'agendado'
+              AND j.data_hora IS NOT NULL
+              AND j.data_hora - make_interval(mins => o.offset_min) > now()
+            """
+        )
+    else:
+        op.execute(
+            f"""
+            WITH o(offset_min) AS (VALUES {offsets})
+            INSERT INTO push_alert_schedule (jogo_id, offset_min, due_at)
+            SELECT j.id, o.offset_min, datetime(j.data_hora, '-' || o.offset_min || ' minutes')
+            FROM jogos j, o
+            WHERE j.status = 'agendado'
+              AND j.data_hora IS NOT NULL
+              AND datetime(j.data_hora, '-' || o.offset_min || ' minutes') > datetime('now')
+            """
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_push_alert_schedule_pendentes", table_name="push_alert_schedule")
+    op.drop_index("ix_push_alert_schedule_jogo_id", table_name="push_alert_schedule")
+    op.drop_table("push_alert_schedule")
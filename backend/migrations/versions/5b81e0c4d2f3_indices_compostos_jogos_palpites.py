@@ -0,0 +1,52 @@
+"""indices compostos em jogos e palpites
+
+Revision ID: 5b81e0c4d2f3
+Revises: 3c9e4d2b7a10
+Create Date: 2026-10-18 14:05:47.551902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b81e0c4d2f3'
+down_revision: Union[str, Sequence[str], None] = '3c9e4d2b7a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (temporada_id, rodada) já é atendido por uq_jogo_temporada_rodada_times e
+    # (liga_id, usuario_id, jogo_id) por uq_palpite_liga_usuario_jogo.
+    op.create_index("ix_jogos_temporada_status", "jogos", ["temporada_id", "status"])
+    op.create_index(
+        "ix_jogos_agendados_data_hora",
+        "jogos",
+        ["data_hora"],
+        postgresql_where=sa.text("status = 'agendado'"),
+        sqlite_where=sa.text("status = 'agendado'"),
+    )
+    op.create_index(
+        "ix_palpites_jogo_liga_usuario",
+        "palpites",
+        ["jogo_id", "liga_id", "usuario_id"],
+        postgresql_include=["placar_casa", "placar_fora", "pontos"],
+    )
+
+    # redundantes: prefixo de um índice composto
+    op.drop_index("ix_jogos_temporada_id", table_name="jogos")
+    op.drop_index("ix_palpites_liga_id", table_name="palpites")
+    op.drop_index("ix_palpites_jogo_id", table_name="palpites")
+
+
+def downgrade() -> None:
+    op.create_index("ix_palpites_jogo_id", "palpites", ["jogo_id"])
+    op.create_index("ix_palpites_liga_id", "palpites", ["liga_id"])
+    op.create_index("ix_jogos_temporada_id", "jogos", ["temporada_id"])
+
+    op.drop_index("ix_palpites_jogo_liga_usuario", table_name="palpites")
+    op.drop_index("ix_jogos_agendados_data_hora", table_name="jogos")
+    op.drop_index("ix_jogos_temporada_status", table_name="jogos")
@@ -0,0 +1,29 @@
+"""add ranking_versao em ligas
+
+Revision ID: 8d2f6a1c9e47
+Revises: 5b81e0c4d2f3
+Create Date: 2026-10-18 16:22:10.318044
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f6a1c9e47'
+down_revision: Union[str, Sequence[str], None] = '5b81e0c4d2f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "ligas",
+        sa.Column("ranking_versao", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("ligas", "ranking_versao")
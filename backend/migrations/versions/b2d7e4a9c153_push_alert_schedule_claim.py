@@ -0,0 +1,28 @@
+"""push_alert_schedule: claimed_at e attempts (envio confirmado)
+
+Revision ID: b2d7e4a9c153
+Revises: f5c2d8a7b316
+Create Date: 2026-10-18 21:05:44.602117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d7e4a9c153'
+down_revision: Union[str, Sequence[str], None] = 'f5c2d8a7b316'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("push_alert_schedule", sa.Column("claimed_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("push_alert_schedule", sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    op.drop_column("push_alert_schedule", "attempts")
+    op.drop_column("push_alert_schedule", "claimed_at")
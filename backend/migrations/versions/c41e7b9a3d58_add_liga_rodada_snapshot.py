@@ -0,0 +1,113 @@
+"""add liga_rodada_snapshot
+
+Revision ID: c41e7b9a3d58
+Revises: 8d2f6a1c9e47
+Create Date: 2026-10-18 17:03:44.120587
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e7b9a3d58'
+down_revision: Union[str, Sequence[str], None] = '8d2f6a1c9e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mesmo resultado de services/evolucao_ranking.recalcular_snapshots, em SQL:
+# rodada fechada = todos os jogos 'finalizado' ou 'cancelado'; os totais são
+# acumulados até a rodada (jogos finalizados de qualquer rodada anterior, fechada
+# ou não) e a posição segue o desempate do ranking (pontos, placar, saldo,
+# resultado, nome).
+CARGA_INICIAL = """
+    INSERT INTO liga_rodada_snapshot
+        (liga_id, rodada, usuario_id, posicao, pontos, pontos_rodada,
+         acertos_placar, acertos_saldo, acertos_resultado)
+    WITH rodadas_fechadas AS (
+        SELECT temporada_id, rodada
+        FROM jogos
+        GROUP BY temporada_id, rodada
+        HAVING SUM(CASE WHEN status IN ('finalizado', 'cancelado') THEN 0 ELSE 1 END) = 0
+    ),
+    por_rodada AS (
+        SELECT
+            p.liga_id,
+            p.usuario_id,
+            j.rodada,
+            COALESCE(SUM(p.pontos), 0) AS pontos,
+            SUM(CASE WHEN p.pontos = 5 THEN 1 ELSE 0 END) AS acertos_placar,
+            SUM(CASE WHEN p.pontos = 4 THEN 1 ELSE 0 END) AS acertos_saldo,
+            SUM(CASE WHEN p.pontos = 3 THEN 1 ELSE 0 END) AS acertos_resultado
+        FROM palpites p
+        JOIN ligas l ON l.id = p.liga_id
+        JOIN jogos j ON j.id = p.jogo_id AND j.temporada_id = l.temporada_id
+        WHERE j.status = 'finalizado'
+        GROUP BY p.liga_id, p.usuario_id, j.rodada
+    ),
+    acumulado AS (
+        SELECT
+            lm.liga_id,
+            rf.rodada,
+            lm.usuario_id,
+            COALESCE(SUM(pr.pontos), 0) AS pontos,
+            COALESCE(SUM(CASE WHEN pr.rodada = rf.rodada THEN pr.pontos END), 0) AS pontos_rodada,
+            COALESCE(SUM(pr.acertos_placar), 0) AS acertos_placar,
+            COALESCE(SUM(pr.acertos_saldo), 0) AS acertos_saldo,
+            COALESCE(SUM(pr.acertos_resultado), 0) AS acertos_resultado
+        FROM liga_membros lm
+        JOIN ligas l ON l.id = lm.liga_id
+        JOIN rodadas_fechadas rf ON rf.temporada_id = l.temporada_id
+        LEFT JOIN por_rodada pr
+            ON pr.liga_id = lm.liga_id AND pr.usuario_id = lm.usuario_id AND pr.rodada <= rf.rodada
+        GROUP BY lm.liga_id, rf.rodada, lm.usuario_id
+    )
+    SELECT
+        a.liga_id,
+        a.rodada,
+        a.usuario_id,
+        ROW_NUMBER() OVER (
+            PARTITION BY a.liga_id, a.rodada
+            ORDER BY a.pontos DESC, a.acertos_placar DESC, a.acertos_saldo DESC, a.acertos_resultado DESC, u.nome
+        ),
+        a.pontos,
+        a.pontos_rodada,
+        a.acertos_placar,
+        a.acertos_saldo,
+        a.acertos_resultado
+    FROM acumulado a
+    JOIN usuarios u ON u.id = a.usuario_id
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "liga_rodada_snapshot",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("liga_id", sa.Integer(), nullable=False),
+        sa.Column("rodada", sa.Integer(), nullable=False),
+        sa.Column("usuario_id", sa.Integer(), nullable=False),
+        sa.Column("posicao", sa.Integer(), nullable=False),
+        sa.Column("pontos", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("pontos_rodada", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("acertos_placar", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("acertos_saldo", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("acertos_resultado", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["liga_id"], ["ligas.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["usuario_id"], ["usuarios.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("liga_id", "rodada", "usuario_id", name="uq_liga_rodada_snapshot_liga_rodada_usuario"),
+    )
+    op.create_index("ix_liga_rodada_snapshot_id", "liga_rodada_snapshot", ["id"])
+    op.create_index("ix_liga_rodada_snapshot_usuario_id", "liga_rodada_snapshot", ["usuario_id"])
+
+    # Carga inicial: rodadas já fechadas
+    op.execute(CARGA_INICIAL)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_liga_rodada_snapshot_usuario_id", table_name="liga_rodada_snapshot")
+    op.drop_index("ix_liga_rodada_snapshot_id", table_name="liga_rodada_snapshot")
+    op.drop_table("liga_rodada_snapshot")
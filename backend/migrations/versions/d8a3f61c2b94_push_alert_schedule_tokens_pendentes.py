@@ -0,0 +1,26 @@
+"""push_alert_schedule: tokens_pendentes (reenvio só para quem falhou)
+
+Revision ID: d8a3f61c2b94
+Revises: b2d7e4a9c153
+Create Date: 2026-10-18 21:48:12.530961
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8a3f61c2b94'
+down_revision: Union[str, Sequence[str], None] = 'b2d7e4a9c153'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("push_alert_schedule", sa.Column("tokens_pendentes", sa.JSON(none_as_null=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("push_alert_schedule", "tokens_pendentes")
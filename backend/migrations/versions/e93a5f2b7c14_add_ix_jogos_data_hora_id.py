@@ -0,0 +1,27 @@
+"""indice de paginacao em jogos (data_hora, id)
+
+Revision ID: e93a5f2b7c14
+Revises: c41e7b9a3d58
+Create Date: 2026-10-18 18:10:27.904316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e93a5f2b7c14'
+down_revision: Union[str, Sequence[str], None] = 'c41e7b9a3d58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # keyset de GET /jogos?limit=...: ORDER BY data_hora, id com WHERE (data_hora, id) > (...)
+    op.create_index("ix_jogos_data_hora_id", "jogos", ["data_hora", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jogos_data_hora_id", table_name="jogos")
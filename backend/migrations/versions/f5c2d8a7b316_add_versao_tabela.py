@@ -0,0 +1,37 @@
+"""add versao_tabela (ETag dos dados de referencia)
+
+Revision ID: f5c2d8a7b316
+Revises: e93a5f2b7c14
+Create Date: 2026-10-18 20:12:05.318274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5c2d8a7b316'
+down_revision: Union[str, Sequence[str], None] = 'e93a5f2b7c14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    versao_tabela = op.create_table(
+        "versao_tabela",
+        sa.Column("tabela", sa.String(length=50), nullable=False),
+        sa.Column("versao", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("tabela"),
+    )
+    # começa em 1: ETags emitidos antes da migração não existem, nada a invalidar
+    op.bulk_insert(versao_tabela, [
+        {"tabela": "times", "versao": 1},
+        {"tabela": "competicoes", "versao": 1},
+        {"tabela": "temporadas", "versao": 1},
+    ])
+
+
+def downgrade() -> None:
+    op.drop_table("versao_tabela")
@@ -0,0 +1,67 @@
+"""add liga_classificacao
+
+Revision ID: f7d01b618a52
+Revises: a383b29a8310
+Create Date: 2026-10-18 10:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7d01b618a52'
+down_revision: Union[str, Sequence[str], None] = 'a383b29a8310'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "liga_classificacao",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("liga_id", sa.Integer(), nullable=False),
+        sa.Column("usuario_id", sa.Integer(), nullable=False),
+        sa.Column("pontos", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("acertos_placar", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("acertos_saldo", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("acertos_resultado", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("erros", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("palpites_feitos", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["liga_id"], ["ligas.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["usuario_id"], ["usuarios.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("liga_id", "usuario_id", name="uq_liga_classificacao_liga_usuario"),
+    )
+    op.create_index("ix_liga_classificacao_id", "liga_classificacao", ["id"])
+    op.create_index("ix_liga_classificacao_usuario_id", "liga_classificacao", ["usuario_id"])
+    op.create_index("ix_liga_classificacao_liga_pontos", "liga_classificacao", ["liga_id", "pontos"])
+
+    # Carga inicial a partir dos palpites já pontuados
+    op.execute(
+        """
+        INSERT INTO liga_classificacao
+            (liga_id, usuario_id, pontos, acertos_placar, acertos_saldo, acertos_resultado, erros, palpites_feitos)
+        SELECT
+            liga_id,
+            usuario_id,
+            COALESCE(SUM(pontos), 0),
+            SUM(CASE WHEN pontos = 5 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN pontos = 4 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN pontos = 3 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN pontos = 0 THEN 1 ELSE 0 END),
+            COUNT(pontos)
+        FROM palpites
+        WHERE pontos IS NOT NULL
+        GROUP BY liga_id, usuario_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_liga_classificacao_liga_pontos", table_name="liga_classificacao")
+    op.drop_index("ix_liga_classificacao_usuario_id", table_name="liga_classificacao")
+    op.drop_index("ix_liga_classificacao_id", table_name="liga_classificacao")
+    op.drop_table("liga_classificacao")
@@ -0,0 +1,53 @@
+"""
+Regera a agenda de alertas de palpite pendente (push_alert_schedule) dos jogos
+ainda agendados.
+
+criar_jogo/atualizar_jogo já mantêm a agenda; rode este script depois de
+importar jogos direto no banco (ex.: scripts/import_jogos_*.py).
+
+Uso:
+  cd backend
+  python scripts/agendar_alertas_push.py                  # todas as temporadas
+  python scripts/agendar_alertas_push.py --temporada 3
+"""
+
+import argparse
+import os
+import sys
+
+# Adiciona o diretório pai ao path para importar o app
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from dotenv import load_dotenv
+load_dotenv(os.path.join(os.path.dirname(__file__), "..", "..", ".env"))
+
+from app.database import SessionLocal
+from app.crud.push_alert_schedule import agendar_alertas
+from app.models.jogo import Jogo
+import app.models  # noqa: F401  garante que todos os models foram importados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regera push_alert_schedule")
+    parser.add_argument("--temporada", type=int, default=None, help="ID da temporada (padrão: todas)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        q = db.query(Jogo).filter(Jogo.status == "agendado", Jogo.data_hora.isnot(None))
+        if args.temporada is not None:
+            q = q.filter(Jogo.temporada_id == args.temporada)
+        jogos = q.all()
+
+        agendar_alertas(db, jogos)
+        db.commit()
+        print(f"✅ Agenda de alertas regerada para {len(jogos)} jogos.")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Benchmark ponta a ponta das rotas quentes da API sobre uma base gerada por
+scripts/gerar_dados_carga.py.
+
+Mede latência (p50/p95/p99), vazão e consultas SQL por requisição de:
+  - ranking            GET  /servicos/{liga_id}/ranking
+  - palpites_rodada    GET  /palpites/{liga_id}/rodadas/{rodada}/usuarios/me/palpites
+  - upsert_palpite     PUT  /palpites/ligas/{liga_id}/jogos/{jogo_id}/meu
+  - info_rodadas       GET  /jogos/info-rodadas?temporada_id=...
+  - envia_alertas      POST /push/envia_alertas (outbox rearmada antes de cada chamada)
+
+Por padrão roda a API em processo (TestClient), com o envio ao FCM trocado por
+um no-op. Com --url mede um uvicorn já rodando (httpx); nesse modo envia_alertas
+só roda com --incluir-alertas (envia de verdade). As consultas por requisição vêm
+do cabeçalho X-DB-Queries (DB_METRICS_HEADERS ligado no servidor).
+O servidor precisa usar o mesmo SECRET_KEY/ALGORITHM e o mesmo banco deste script.
+
+Os usuários, ligas e jogos são sorteados com --seed (Cenario, em
+app/dados_carga.py), então execuções seguidas sobre a mesma base fazem as
+mesmas requisições.
+
+Uso:
+  cd backend
+  python scripts/gerar_dados_carga.py --database-url sqlite:///./carga.db --criar-tabelas
+  python scripts/bench_api.py --database-url sqlite:///./carga.db
+  python scripts/bench_api.py --requisicoes 500 --concorrencia 16 --rotas ranking info_rodadas
+  python scripts/bench_api.py --sem-cache            # desliga o cache de respostas do ranking
+  uvicorn app.main:app --workers 4 &  python scripts/bench_api.py --url http://localhost:8000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Adiciona o diretório pai ao path para importar o app
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from dotenv import load_dotenv
+load_dotenv(os.path.join(os.path.dirname(__file__), "..", "..", ".env"))
+
+ROTAS = ("ranking", "palpites_rodada", "upsert_palpite", "info_rodadas", "envia_alertas")
+
+
+def _percentil(valores: list[float], p: float) -> float:
+    if not valores:
+        return 0.0
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p))]
+
+
+def _medir(cliente, cenario, rota: str, n: int, concorrencia: int, antes=None) -> dict:
+    latencias: list[float] = []
+    erros: dict[int, int] = {}
+    lock = threading.Lock()
+
+    # sorteio fora da medição e na mesma ordem em toda execução
+    requisicoes = [cenario.requisicao(rota) for _ in range(n)]
+
+    tempo_antes = 0.0
+
+    def executar(req):
+        nonlocal tempo_antes
+        metodo, caminho, headers, corpo = req
+        if antes:
+            inicio_antes = time.perf_counter()
+            antes()
+            with lock:
+                tempo_antes += time.perf_counter() - inicio_antes
+        inicio = time.perf_counter()
+        r = cliente.request(metodo, caminho, headers=headers, json=corpo)
+        duracao = time.perf_counter() - inicio
+        with lock:
+            if r.status_code >= 400:
+                erros[r.status_code] = erros.get(r.status_code, 0) + 1
+            else:
+                latencias.append(duracao)
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concorrencia) as pool:
+        list(pool.map(executar, requisicoes))
+    # o preparo (antes) só é usado em rotas seriais; fica fora da vazão
+    total = time.perf_counter() - inicio - tempo_antes
+
+    return {
+        "req_s": n / total,
+        "p50": statistics.median(latencias) * 1000 if latencias else 0.0,
+        "p95": _percentil(latencias, 0.95) * 1000,
+        "p99": _percentil(latencias, 0.99) * 1000,
+        "erros": erros,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das rotas quentes da API")
+    parser.add_argument("--tag", default="carga", help="tag usada em gerar_dados_carga.py")
+    parser.add_argument("--rotas", nargs="+", choices=ROTAS, default=list(ROTAS))
+    parser.add_argument("--requisicoes", type=int, default=200, help="por rota")
+    parser.add_argument("--concorrencia", type=int, default=8)
+    parser.add_argument("--amostras-consultas", type=int, default=20, help="requisições sequenciais para contar SQL")
+    parser.add_argument("--jogos-alerta", type=int, default=10, help="jogos com alerta vencido por chamada de envia_alertas")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--url", default=None, help="mede um servidor já rodando em vez do TestClient")
+    parser.add_argument("--incluir-alertas", action="store_true", help="com --url: roda envia_alertas (envia push de verdade)")
+    parser.add_argument("--sem-cache", action="store_true", help="RESPONSE_CACHE_TTL_SECONDS=0 (só em processo)")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    if args.sem_cache:
+        os.environ["RESPONSE_CACHE_TTL_SECONDS"] = "0"
+    os.environ.setdefault("PUSH_CRON_SECRET", "bench")
+    # bench em processo: bcrypt não entra em nenhuma destas rotas
+    os.environ.setdefault("PASSWORD_POOL_WORKERS", "0")
+
+    from app.dados_carga import Cenario, rearmar_alertas
+    from app.database import SessionLocal
+
+    rotas = list(args.rotas)
+    if args.url and "envia_alertas" in rotas and not args.incluir_alertas:
+        rotas.remove("envia_alertas")
+        print("ℹ️  envia_alertas ignorada com --url (use --incluir-alertas para enviar de verdade)")
+
+    db = SessionLocal()
+    try:
+        cenario = Cenario(db, args.tag, random.Random(args.seed))
+    except ValueError as e:
+        raise SystemExit(f"❌ {e}. Rode scripts/gerar_dados_carga.py antes.")
+    finally:
+        db.close()
+
+    if args.url:
+        import httpx
+
+        cliente = httpx.Client(base_url=args.url, timeout=60)
+    else:
+        from fastapi.testclient import TestClient
+
+        import app.services.push_scheduler as push_scheduler
+        from app.main import app
+
+        push_scheduler.enviar_mensagens = lambda mensagens: [dict.fromkeys(m["tokens"]) for m in mensagens]
+        cliente = TestClient(app).__enter__()
+
+    print(f"base '{args.tag}' (temporada {cenario.temporada_id}): {len(cenario.membros)} membros em ligas, "
+          f"{len(cenario.jogos_abertos)} jogos abertos")
+    print(f"{args.requisicoes} requisições por rota, concorrência {args.concorrencia}"
+          f"{', cache de respostas desligado' if args.sem_cache else ''}")
+    print(f"{'rota':<17} {'req/s':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'SQL/req':>8}  erros")
+
+    try:
+        for rota in rotas:
+            antes = None
+            if rota == "envia_alertas":
+                def antes():
+                    with SessionLocal() as db:
+                        rearmar_alertas(db, cenario.temporada_id, args.jogos_alerta)
+
+            # aquecimento (caches, pool de conexões) e depois a contagem de consultas, sequenciais
+            contagens = []
+            for contar in (False, True):
+                for _ in range(args.amostras_consultas):
+                    metodo, caminho, headers, corpo = cenario.requisicao(rota)
+                    if antes:
+                        antes()
+                    r = cliente.request(metodo, caminho, headers=headers, json=corpo)
+                    if contar and "x-db-queries" in r.headers:
+                        contagens.append(int(r.headers["x-db-queries"]))
+            sql_req = f"{sum(contagens) / len(contagens):.1f}" if contagens else "-"
+
+            # envia_alertas é serial por natureza (um tick de cada vez)
+            concorrencia = 1 if rota == "envia_alertas" else args.concorrencia
+            r = _medir(cliente, cenario, rota, args.requisicoes, concorrencia, antes)
+            erros = ", ".join(f"{k}×{v}" for k, v in sorted(r["erros"].items())) or "-"
+            print(f"{rota:<17} {r['req_s']:>8.1f} {r['p50']:>9.1f} {r['p95']:>9.1f} {r['p99']:>9.1f} {sql_req:>8}  {erros}")
+    finally:
+        if args.url:
+            cliente.close()
+        else:
+            cliente.__exit__(None, None, None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark de throughput do /auth/login, com e sem o pool de processos do bcrypt.
+
+Sobe a API em processo (TestClient) sobre um SQLite temporário, cria um usuário
+e dispara uma rajada de logins concorrentes enquanto outra thread mede a latência
+de uma rota que não tem nada a ver com senha (GET /). Roda duas vezes:
+
+  - inline: bcrypt na própria thread da requisição (comportamento antigo)
+  - pool:   bcrypt no pool de processos (PASSWORD_POOL_WORKERS / _MAX_PENDING)
+
+Não usa o DATABASE_URL do .env: o banco é criado e apagado pelo próprio script.
+
+Uso:
+  cd backend
+  python scripts/bench_login.py
+  python scripts/bench_login.py --logins 200 --concorrencia 32 --rounds 12
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Adiciona o diretório pai ao path para importar o app
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+_DB_PATH = os.path.join(tempfile.mkdtemp(prefix="bench_login_"), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_PATH}"
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+
+EMAIL = "bench@example.com"
+SENHA = "senha-do-benchmark"
+
+
+def _percentil(valores: list[float], p: float) -> float:
+    if not valores:
+        return 0.0
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p))]
+
+
+def _rodar(client, n_logins: int, concorrencia: int) -> dict:
+    latencias_login: list[float] = []
+    latencias_outra: list[float] = []
+    status_503 = 0
+    parar = threading.Event()
+
+    def login(_):
+        inicio = time.perf_counter()
+        r = client.post("/auth/login", data={"username": EMAIL, "password": SENHA})
+        return r.status_code, time.perf_counter() - inicio
+
+    def rota_sem_senha():
+        while not parar.is_set():
+            inicio = time.perf_counter()
+            client.get("/")
+            latencias_outra.append(time.perf_counter() - inicio)
+            time.sleep(0.01)
+
+    sonda = threading.Thread(target=rota_sem_senha, daemon=True)
+    sonda.start()
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concorrencia) as pool:
+        for codigo, duracao in pool.map(login, range(n_logins)):
+            if codigo == 503:
+                status_503 += 1
+            else:
+                latencias_login.append(duracao)
+    total = time.perf_counter() - inicio
+
+    parar.set()
+    sonda.join()
+
+    return {
+        "logins_s": len(latencias_login) / total,
+        "login_p50_ms": statistics.median(latencias_login) * 1000 if latencias_login else 0.0,
+        "login_p95_ms": _percentil(latencias_login, 0.95) * 1000,
+        "outra_p95_ms": _percentil(latencias_outra, 0.95) * 1000,
+        "503": status_503,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput do login com e sem pool de bcrypt")
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concorrencia", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=12, help="custo do bcrypt (BCRYPT_ROUNDS)")
+    args = parser.parse_args()
+
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.database import Base, SessionLocal, engine
+    from app.models.usuario import Usuario
+    from app.core import password_pool
+
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    db.add(Usuario(nome="Bench", email_login=EMAIL, senha=password_pool.pwd_context.hash(SENHA), funcao="user"))
+    db.commit()
+    db.close()
+
+    workers_pool = password_pool.PASSWORD_POOL_WORKERS or min(os.cpu_count() or 2, 4)
+    # sobe os processos antes das threads do TestClient, como o startup do app faz
+    password_pool.PASSWORD_POOL_WORKERS = workers_pool
+    password_pool.iniciar_pool()
+
+    print(f"bcrypt rounds={args.rounds}  logins={args.logins}  concorrência={args.concorrencia}  "
+          f"pool={workers_pool} processos, fila máx. {password_pool.PASSWORD_POOL_MAX_PENDING}")
+    print(f"{'modo':>7} {'logins/s':>9} {'p50 (ms)':>9} {'p95 (ms)':>9} {'GET / p95 (ms)':>15} {'503':>5}")
+
+    try:
+        with TestClient(app) as client:
+            for modo, workers in (("inline", 0), ("pool", workers_pool)):
+                password_pool.PASSWORD_POOL_WORKERS = workers
+
+                r = _rodar(client, args.logins, args.concorrencia)
+                print(f"{modo:>7} {r['logins_s']:>9.1f} {r['login_p50_ms']:>9.0f} {r['login_p95_ms']:>9.0f} "
+                      f"{r['outra_p95_ms']:>15.1f} {r['503']:>5}")
+    finally:
+        password_pool.encerrar_pool()
+        engine.dispose()
+        os.remove(_DB_PATH)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Benchmark do tick de alertas de palpite pendente (run_missing_bet_alerts).
+
+Monta um banco SQLite temporário com N jogos vencendo agora, M ligas na mesma
+temporada e U usuários (membros de todas as ligas, com token e metade dos
+palpites feitos), roda um tick e conta as consultas SQL executadas.
+
+A versão antiga fazia ~4 consultas por (jogo, liga) — O(jogos × ligas); a
+atual resolve os destinatários de todos os jogos e ligas numa consulta só,
+então o número de consultas por tick é constante.
+
+O envio ao FCM é substituído por um no-op (não há rede no benchmark).
+Não usa o DATABASE_URL do .env: o banco é criado e apagado pelo próprio script.
+
+Uso:
+  cd backend
+  python scripts/bench_missing_bet_alerts.py
+  python scripts/bench_missing_bet_alerts.py --jogos 1 5 20 --ligas 1 5 20 --usuarios 50
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+# Adiciona o diretório pai ao path para importar o app
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+_DB_PATH = os.path.join(tempfile.mkdtemp(prefix="bench_push_"), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_PATH}"
+
+from sqlalchemy import event
+
+from app.database import Base, SessionLocal, engine
+from app.models import (
+    Competicao,
+    Jogo,
+    Liga,
+    LigaMembro,
+    Palpite,
+    PushAlertLog,
+    PushAlertSchedule,
+    PushToken,
+    Temporada,
+    Time,
+    Usuario,
+)
+import app.services.push_scheduler as push_scheduler
+
+OFFSET_MIN = 15
+
+
+def _envio_noop(mensagens):
+    return [dict.fromkeys(m["tokens"]) for m in mensagens]
+
+
+def _popular(db, n_jogos: int, n_ligas: int, n_usuarios: int) -> None:
+    for model in (PushAlertLog, PushAlertSchedule, Palpite, PushToken, LigaMembro, Liga, Jogo, Time, Usuario, Temporada, Competicao):
+        db.query(model).delete()
+
+    rnd = random.Random(42)
+    agora = datetime.now(timezone.utc)
+
+    comp = Competicao(nome="Bench", pais="BR", tipo="liga")
+    db.add(comp)
+    db.flush()
+    temp = Temporada(competicao_id=comp.id, ano=2026, status="ativa")
+    db.add(temp)
+    db.flush()
+
+    times = [Time(nome=f"Time {i}", sigla=f"T{i:02d}") for i in range(2 * n_jogos)]
+    usuarios = [
+        Usuario(nome=f"Usuário {i}", email_login=f"bench{i}@example.com", senha="x", funcao="user")
+        for i in range(n_usuarios)
+    ]
+    db.add_all(times + usuarios)
+    db.flush()
+
+    db.add_all([PushToken(user_id=u.id, token=f"token-{u.id}") for u in usuarios])
+
+    ligas = [
+        Liga(nome=f"Liga {i}", temporada_id=temp.id, codigo_convite=f"bench{i}", id_dono=usuarios[0].id)
+        for i in range(n_ligas)
+    ]
+    db.add_all(ligas)
+    db.flush()
+    db.add_all([LigaMembro(liga_id=l.id, usuario_id=u.id, papel="membro") for l in ligas for u in usuarios])
+
+    jogos = [
+        Jogo(
+            temporada_id=temp.id,
+            rodada=1,
+            time_casa_id=times[2 * i].id,
+            time_fora_id=times[2 * i + 1].id,
+            data_hora=agora + timedelta(minutes=OFFSET_MIN),
+        )
+        for i in range(n_jogos)
+    ]
+    db.add_all(jogos)
+    db.flush()
+
+    db.add_all([
+        PushAlertSchedule(jogo_id=j.id, offset_min=OFFSET_MIN, due_at=agora - timedelta(seconds=1))
+        for j in jogos
+    ])
+    db.add_all([
+        Palpite(liga_id=l.id, usuario_id=u.id, jogo_id=j.id, placar_casa=1, placar_fora=0)
+        for l in ligas
+        for u in usuarios
+        for j in jogos
+        if rnd.random() < 0.5
+    ])
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Conta consultas SQL por tick de run_missing_bet_alerts")
+    parser.add_argument("--jogos", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--ligas", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--usuarios", type=int, default=30)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(engine)
+    push_scheduler.enviar_mensagens = _envio_noop
+
+    consultas = {"n": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _contar(conn, cursor, statement, parameters, context, executemany):
+        consultas["n"] += 1
+
+    print(f"{'jogos':>6} {'ligas':>6} {'usuários':>9} {'consultas':>10} {'enviados':>9} {'tempo (ms)':>11}")
+    db = SessionLocal()
+    try:
+        for n_jogos in args.jogos:
+            for n_ligas in args.ligas:
+                _popular(db, n_jogos, n_ligas, args.usuarios)
+
+                consultas["n"] = 0
+                inicio = time.perf_counter()
+                stats = push_scheduler.run_missing_bet_alerts(db)
+                ms = (time.perf_counter() - inicio) * 1000
+
+                print(f"{n_jogos:>6} {n_ligas:>6} {args.usuarios:>9} {consultas['n']:>10} {stats['enviados']:>9} {ms:>11.1f}")
+    finally:
+        db.close()
+        engine.dispose()
+        os.remove(_DB_PATH)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Microbenchmark da serialização das listas grandes: custo por 1.000 linhas.
+
+Compara, para o formato de cada rota, os dois caminhos de saída:
+  - antes:  o que o FastAPI faz com o retorno da rota — valida cada item contra o
+            response_model, converte de volta (serialize) e gera o corpo com o
+            JSONResponse (json da stdlib);
+  - depois: a rota devolve JSONRapidaResponse(dados) — orjson direto nos dicts
+            montados pelo serviço, sem passar pelo response_model.
+
+Também confere que os dois corpos decodificam para o mesmo JSON (e se são
+idênticos byte a byte). Não usa banco: as linhas são sintéticas, no formato que
+os serviços devolvem (jogos como objetos ORM soltos, com os times carregados).
+
+Uso:
+  cd backend
+  python scripts/bench_serializacao.py
+  python scripts/bench_serializacao.py --linhas 5000 --repeticoes 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+# Adiciona o diretório pai ao path para importar o app
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# importar as rotas exige a configuração de autenticação; o banco nunca é aberto
+from dotenv import load_dotenv
+load_dotenv(os.path.join(os.path.dirname(__file__), "..", "..", ".env"))
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core import respostas
+from app.core.respostas import JSONRapidaResponse
+from app.models import Jogo, Time
+from app.routes.jogo import _jogo_dict
+from app.schemas.jogo import JogoResponse
+from app.schemas.liga import PontuacaoAcumuladaResponse, RankingLigaResponse
+from app.schemas.palpite import PalpiteJogoLigaResponse
+
+AGORA = datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def _ranking(rnd: random.Random, n: int) -> list[dict]:
+    linhas = []
+    for i in range(n):
+        jogos = rnd.randint(1, 380)
+        placar, saldo, resultado = rnd.randint(0, jogos // 4), rnd.randint(0, jogos // 4), rnd.randint(0, jogos // 4)
+        pontos = placar * 5 + saldo * 4 + resultado * 3
+        linhas.append({
+            "nome": f"Usuário {i}",
+            "pontos": pontos,
+            "acertos_placar": placar,
+            "acertos_saldo": saldo,
+            "acertos_resultado": resultado,
+            "erros": jogos - placar - saldo - resultado,
+            "aproveitamento": pontos / (jogos * 5),
+            "perc_placar": placar / jogos,
+            "perc_saldo": saldo / jogos,
+            "perc_resultado": resultado / jogos,
+        })
+    return linhas
+
+
+def _palpites_do_jogo(rnd: random.Random, n: int) -> list[dict]:
+    return [
+        {
+            "usuario_nome": f"Usuário {i}",
+            "time_casa": "Time A",
+            "placar_real_casa": 2,
+            "placar_real_fora": 1,
+            "time_fora": "Time B",
+            "data_hora": AGORA - timedelta(minutes=rnd.randint(0, 10_000)),
+            "status": "finalizado",
+            "palpite_casa": rnd.randint(0, 4) if i % 5 else None,
+            "palpite_fora": rnd.randint(0, 4) if i % 5 else None,
+            "pontos": rnd.choice((0, 3, 4, 5)) if i % 5 else None,
+        }
+        for i in range(n)
+    ]
+
+
+def _pontuacao_flat(rnd: random.Random, n: int) -> list[dict]:
+    rodadas = 38
+    linhas = []
+    for u in range(n // rodadas + 1):
+        acumulado = 0
+        for rodada in range(1, rodadas + 1):
+            acumulado += rnd.randint(0, 30)
+            linhas.append({"nome": f"Usuário {u}", "rodada": rodada, "pontuacao_acumulada": acumulado})
+    return linhas[:n]
+
+
+def _jogos(rnd: random.Random, n: int) -> list[Jogo]:
+    times = [Time(id=i, nome=f"Time {i}", sigla=f"T{i:02d}", escudo_url=None) for i in range(20)]
+    jogos = []
+    for i in range(n):
+        casa, fora = rnd.sample(times, 2)
+        encerrado = i < n // 2
+        jogos.append(Jogo(
+            id=i + 1,
+            temporada_id=1,
+            rodada=i // 10 + 1,
+            time_casa_id=casa.id,
+            time_fora_id=fora.id,
+            time_casa=casa,
+            time_fora=fora,
+            gols_casa=rnd.randint(0, 4) if encerrado else None,
+            gols_fora=rnd.randint(0, 4) if encerrado else None,
+            data_hora=AGORA + timedelta(days=i // 10 * 7 - 140, hours=i % 4 * 2),
+            status="finalizado" if encerrado else "agendado",
+        ))
+    return jogos
+
+
+# rota -> (response_model, gerador dos dados como o serviço devolve, conversão feita na rota)
+CASOS = {
+    "ranking": (RankingLigaResponse, _ranking, None),
+    "palpites_do_jogo": (PalpiteJogoLigaResponse, _palpites_do_jogo, None),
+    "pontuacao_acumulada": (PontuacaoAcumuladaResponse, _pontuacao_flat, None),
+    "listar_jogos": (JogoResponse, _jogos, lambda jogos: [_jogo_dict(j) for j in jogos]),
+}
+
+
+_LOOP = asyncio.new_event_loop()
+
+
+def _antes(campo, dados) -> bytes:
+    conteudo = _LOOP.run_until_complete(serialize_response(field=campo, response_content=dados))
+    return JSONResponse(conteudo).body
+
+
+def _depois(converter, dados) -> bytes:
+    return JSONRapidaResponse(converter(dados) if converter else dados).body
+
+
+def _medir(funcao, repeticoes: int) -> float:
+    """Melhor tempo (s) entre as repetições: o ruído do processo só soma."""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Custo de serialização por 1.000 linhas, antes e depois")
+    parser.add_argument("--linhas", type=int, default=1000)
+    parser.add_argument("--repeticoes", type=int, default=30)
+    parser.add_argument("--casos", nargs="+", choices=list(CASOS), default=list(CASOS))
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    motor = "orjson" if respostas.orjson is not None else "json (stdlib, orjson ausente)"
+    print(f"{args.linhas} linhas, melhor de {args.repeticoes}; depois = JSONRapidaResponse com {motor}\n")
+    print(f"{'rota':<22} {'antes ms/1k':>12} {'depois ms/1k':>13} {'ganho':>7}  mesmo JSON")
+
+    escala = 1000 / args.linhas * 1000  # segundos -> ms por 1.000 linhas
+    for nome in args.casos:
+        modelo, gerar, converter = CASOS[nome]
+        dados = gerar(random.Random(args.seed), args.linhas)
+        campo = create_model_field(name="Response_" + nome, type_=list[modelo], mode="serialization")
+
+        corpo_antes, corpo_depois = _antes(campo, dados), _depois(converter, dados)
+        if json.loads(corpo_antes) != json.loads(corpo_depois):
+            raise SystemExit(f"❌ {nome}: o caminho rápido gerou um JSON diferente")
+        igual = "sim (bytes idênticos)" if corpo_antes == corpo_depois else "sim"
+
+        antes = _medir(lambda: _antes(campo, dados), args.repeticoes) * escala
+        depois = _medir(lambda: _depois(converter, dados), args.repeticoes) * escala
+        print(f"{nome:<22} {antes:>12.2f} {depois:>13.2f} {antes / depois:>6.1f}x  {igual}")
+
+
+if __name__ == "__main__":
+    main()
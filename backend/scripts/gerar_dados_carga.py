@@ -0,0 +1,95 @@
+"""
+Gera uma base sintética em escala de produção para benchmarks (ver scripts/bench_api.py).
+A geração fica em app/dados_carga.py (gerar_base), também usada pelos testes.
+
+Cria, com inserts em lote, uma competição/temporada própria com:
+  - 20 times e os 380 jogos do Brasileirão (turno e returno, 38 rodadas de 10 jogos);
+    as primeiras --rodadas-encerradas já finalizadas, a seguinte começando em ~2 dias
+  - --usuarios usuários (mesma senha: --senha) e --ligas ligas de --membros membros
+  - palpites de cada membro até a rodada seguinte às encerradas (com probabilidade
+    --taxa-palpite por jogo), pontuados pelo mesmo caminho de atualizar_resultado
+  - tokens de push para --taxa-tokens dos usuários e a agenda de alertas dos jogos futuros
+
+Tudo é identificado por --tag (nomes de competição/times/e-mails), então dá para
+gerar mais de uma base no mesmo banco; rodar de novo com a mesma tag é recusado.
+
+Usa o DATABASE_URL do .env (SQLite ou Postgres) ou --database-url.
+
+Uso:
+  cd backend
+  python scripts/gerar_dados_carga.py
+  python scripts/gerar_dados_carga.py --usuarios 5000 --ligas 200 --membros 40 --tag carga2
+  python scripts/gerar_dados_carga.py --database-url sqlite:///./carga.db --criar-tabelas
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+# Adiciona o diretório pai ao path para importar o app
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from dotenv import load_dotenv
+load_dotenv(os.path.join(os.path.dirname(__file__), "..", "..", ".env"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera dados sintéticos para benchmark")
+    parser.add_argument("--usuarios", type=int, default=2000)
+    parser.add_argument("--ligas", type=int, default=50, help="ligas na temporada gerada")
+    parser.add_argument("--membros", type=int, default=30, help="membros por liga")
+    parser.add_argument("--rodadas-encerradas", type=int, default=19)
+    parser.add_argument("--taxa-palpite", type=float, default=0.8)
+    parser.add_argument("--taxa-tokens", type=float, default=0.6, help="fração dos usuários com token de push")
+    parser.add_argument("--ano", type=int, default=datetime.now(timezone.utc).year)
+    parser.add_argument("--tag", default="carga")
+    parser.add_argument("--senha", default="carga123")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--criar-tabelas", action="store_true", help="create_all antes (bancos novos, sem alembic)")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    if args.membros > args.usuarios:
+        parser.error("--membros não pode ser maior que --usuarios")
+
+    from app.dados_carga import gerar_base
+    from app.database import Base, SessionLocal, engine
+
+    if args.criar_tabelas:
+        Base.metadata.create_all(engine)
+
+    inicio_total = time.perf_counter()
+    db = SessionLocal()
+    try:
+        temporada_id = gerar_base(
+            db,
+            tag=args.tag,
+            usuarios=args.usuarios,
+            ligas=args.ligas,
+            membros=args.membros,
+            rodadas_encerradas=args.rodadas_encerradas,
+            taxa_palpite=args.taxa_palpite,
+            taxa_tokens=args.taxa_tokens,
+            ano=args.ano,
+            senha=args.senha,
+            seed=args.seed,
+            progresso=print,
+        )
+    except ValueError as e:
+        db.rollback()
+        raise SystemExit(f"❌ {e}. Use outra --tag.")
+    except BaseException:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    print(f"🏁 Base '{args.tag}' (temporada {temporada_id}) gerada em {time.perf_counter() - inicio_total:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
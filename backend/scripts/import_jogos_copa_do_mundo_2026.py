@@ -42,6 +42,7 @@ from app.models.temporada import Temporada
 from app.models.time import Time
 from app.models.jogo import Jogo
 from app.database import Base
+from app.crud.versao_tabela import TABELAS_REFERENCIA, incrementar_versao
 
 # ─── Configuração do banco ────────────────────────────────────────────────────
 
@@ -411,6 +412,8 @@ def main():
         print(f"  Total de partidas eliminatórias no JSON: {len(fases_especiais)}")
         print("  Execute este script novamente após o fim da fase de grupos para importá-los.")
 
+        # times/competição/temporada podem ter sido criados: invalida o cache HTTP deles
+        incrementar_versao(session, *TABELAS_REFERENCIA)
         session.commit()
 
         print(f"\n=== Resumo ===")
@@ -0,0 +1,46 @@
+"""
+Reconstrói a tabela liga_classificacao a partir dos palpites já pontuados.
+
+A classificação é mantida por delta em atualizar_resultado; use este script
+depois de correções manuais no banco ou se houver suspeita de divergência.
+
+Uso:
+  cd backend
+  python scripts/rebuild_classificacao.py            # todas as ligas
+  python scripts/rebuild_classificacao.py --liga 7   # só a liga 7
+"""
+
+import argparse
+import os
+import sys
+
+# Adiciona o diretório pai ao path para importar o app
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from dotenv import load_dotenv
+load_dotenv(os.path.join(os.path.dirname(__file__), "..", "..", ".env"))
+
+from app.database import SessionLocal
+from app.services.classificacao import reconstruir_classificacao
+import app.models  # noqa: F401  garante que todos os models foram importados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstrói liga_classificacao")
+    parser.add_argument("--liga", type=int, default=None, help="ID da liga (padrão: todas)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        reconstruir_classificacao(db, liga_id=args.liga)
+        alvo = f"liga {args.liga}" if args.liga is not None else "todas as ligas"
+        print(f"✅ Classificação reconstruída ({alvo}).")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
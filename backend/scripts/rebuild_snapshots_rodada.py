@@ -0,0 +1,53 @@
+"""
+Regrava liga_rodada_snapshot (posição acumulada ao fim de cada rodada fechada).
+
+Os snapshots são gravados quando o último jogo da rodada é finalizado (e a
+migração c41e7b9a3d58 já carrega as rodadas fechadas antes dela); use este
+script depois de correções manuais no banco ou se houver suspeita de divergência.
+
+Uso:
+  cd backend
+  python scripts/rebuild_snapshots_rodada.py                 # todas as temporadas
+  python scripts/rebuild_snapshots_rodada.py --temporada 3   # só a temporada 3
+"""
+
+import argparse
+import os
+import sys
+
+# Adiciona o diretório pai ao path para importar o app
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from dotenv import load_dotenv
+load_dotenv(os.path.join(os.path.dirname(__file__), "..", "..", ".env"))
+
+from app.database import SessionLocal
+from app.models import Temporada
+from app.services.evolucao_ranking import recalcular_snapshots
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regrava liga_rodada_snapshot")
+    parser.add_argument("--temporada", type=int, default=None, help="ID da temporada (padrão: todas)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.temporada is not None:
+            temporada_ids = [args.temporada]
+        else:
+            temporada_ids = [t for (t,) in db.query(Temporada.id).all()]
+
+        for temporada_id in temporada_ids:
+            recalcular_snapshots(db, temporada_id)
+            db.commit()
+            print(f"✅ Snapshots da temporada {temporada_id} regravados.")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Configuração comum dos testes.
+
+O app lê a configuração do ambiente na importação (engines, caches, pool de
+senhas), então tudo é definido aqui antes de qualquer `import app`. Os testes
+usam um SQLite próprio num diretório temporário, nunca o DATABASE_URL do .env.
+
+Uso:
+  cd backend
+  python -m pytest tests
+"""
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+# Adiciona o diretório pai ao path para importar o app
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+DIRETORIO_TESTES = tempfile.mkdtemp(prefix="bolao_testes_")
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DIRETORIO_TESTES, 'primario.db')}"
+for variavel in ("DATABASE_READ_URL", "ASYNC_DATABASE_URL", "ASYNC_DATABASE_READ_URL"):
+    os.environ.pop(variavel, None)
+os.environ.setdefault("SECRET_KEY", "testes")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+os.environ["PUSH_CRON_SECRET"] = "testes"
+os.environ["PASSWORD_POOL_WORKERS"] = "0"
+os.environ["DB_METRICS_HEADERS"] = "true"
+# caches desligados: cada requisição vai ao banco (pior caso, e sem estado entre testes)
+os.environ["RESPONSE_CACHE_TTL_SECONDS"] = "0"
+os.environ["USER_CACHE_TTL_SECONDS"] = "0"
+os.environ["LIGA_PAPEL_CACHE_TTL_SECONDS"] = "0"
+
+import pytest
+
+from app.core.metricas_db import contar_consultas
+from app.database import Base, SessionLocal, engine
+import app.models  # noqa: F401  (registra as tabelas no metadata)
+
+
+@pytest.fixture
+def banco():
+    """Tabelas recriadas vazias no SQLite dos testes."""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield engine
+
+
+@pytest.fixture
+def db(banco):
+    sessao = SessionLocal()
+    try:
+        yield sessao
+    finally:
+        sessao.close()
+
+
+@pytest.fixture
+def orcamento_consultas():
+    """
+    Falha o teste se o bloco fizer mais consultas SQL que `maximo`:
+
+        with orcamento_consultas(6) as est:
+            run_missing_bet_alerts(db)
+
+    Conta o que roda na thread do teste. Requisições pelo TestClient rodam em
+    outra thread, com o contexto aberto pelo MetricasDBMiddleware: para elas,
+    use o cabeçalho X-DB-Queries (ver test_orcamento_consultas.py).
+    """
+
+    @contextmanager
+    def verificar(maximo: int):
+        with contar_consultas() as estatisticas:
+            yield estatisticas
+        assert estatisticas.consultas <= maximo, (
+            f"{estatisticas.consultas} consultas SQL, orçamento {maximo}"
+        )
+
+    return verificar
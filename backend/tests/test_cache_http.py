@@ -0,0 +1,95 @@
+"""
+Cache HTTP por ETag (core/cache_http.py): 200 com ETag, 304 com If-None-Match
+igual e ETag novo depois da escrita que incrementa a versão. No ranking, a
+versão é ligas.ranking_versao (pontuar_jogos); nos dados de referência, a
+versao_tabela da tabela (cache_referencia).
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.cache_http import CACHE_CONTROL_REFERENCIA
+from app.core.security import create_access_token
+from app.crud.jogo import atualizar_resultado
+from app.main import app
+from app.models import Competicao, Jogo, Liga, LigaMembro, Palpite, Temporada, Time, Usuario
+from app.routes.liga_services import CACHE_CONTROL_RANKING
+from app.schemas.jogo import JogoResultadoUpdate
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def cenario(db):
+    competicao = Competicao(nome="Brasileirão", pais="BR", tipo="liga")
+    db.add(competicao)
+    db.flush()
+    temporada = Temporada(competicao_id=competicao.id, ano=2026, status="ativa")
+    casa, fora = Time(nome="Casa", sigla="CAS"), Time(nome="Fora", sigla="FOR")
+    admin = Usuario(nome="Admin", email_login="admin@x", senha="x", funcao="admin")
+    usuario = Usuario(nome="Ana", email_login="ana@x", senha="x", funcao="user")
+    db.add_all([temporada, casa, fora, admin, usuario])
+    db.flush()
+    liga = Liga(nome="Liga", temporada_id=temporada.id, codigo_convite="conv", id_dono=usuario.id)
+    jogo = Jogo(
+        temporada_id=temporada.id, rodada=1, time_casa_id=casa.id, time_fora_id=fora.id,
+        data_hora=datetime.now(timezone.utc) + timedelta(days=1),
+    )
+    db.add_all([liga, jogo])
+    db.flush()
+    db.add_all([
+        LigaMembro(liga_id=liga.id, usuario_id=usuario.id, papel="dono"),
+        Palpite(liga_id=liga.id, usuario_id=usuario.id, jogo_id=jogo.id, placar_casa=1, placar_fora=0),
+    ])
+    db.commit()
+    return {
+        "liga": liga.id,
+        "jogo": jogo.id,
+        "usuario": {"Authorization": f"Bearer {create_access_token({'sub': str(usuario.id), 'funcao': 'user'})}"},
+        "admin": {"Authorization": f"Bearer {create_access_token({'sub': str(admin.id), 'funcao': 'admin'})}"},
+    }
+
+
+def _revalida(client, url: str, headers: dict, cache_control: str) -> str:
+    """200 com ETag; o mesmo ETag em If-None-Match dá 304 sem corpo. Devolve o ETag."""
+    r = client.get(url, headers=headers)
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+    assert r.headers["cache-control"] == cache_control
+
+    r = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.headers["etag"] == etag
+    assert r.content == b""
+    return etag
+
+
+def test_ranking_etag_muda_quando_jogo_e_pontuado(client, cenario, db):
+    url = f"/servicos/{cenario['liga']}/ranking"
+    etag = _revalida(client, url, cenario["usuario"], CACHE_CONTROL_RANKING)
+
+    atualizar_resultado(db, db.get(Jogo, cenario["jogo"]), JogoResultadoUpdate(gols_casa=1, gols_fora=0))
+
+    r = client.get(url, headers={**cenario["usuario"], "If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
+    assert r.json()[0]["pontos"] == 5
+    assert _revalida(client, url, cenario["usuario"], CACHE_CONTROL_RANKING) == r.headers["etag"]
+
+
+def test_referencia_etag_muda_quando_tabela_e_alterada(client, cenario):
+    etag = _revalida(client, "/times", cenario["usuario"], CACHE_CONTROL_REFERENCIA)
+    assert CACHE_CONTROL_REFERENCIA.startswith("private")
+
+    r = client.post("/times", json={"nome": "Novo", "sigla": "NOV"}, headers=cenario["admin"])
+    assert r.status_code == 201
+
+    r = client.get("/times", headers={**cenario["usuario"], "If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
@@ -0,0 +1,134 @@
+"""
+liga_rodada_snapshot mantida aos poucos (atualizar_snapshots_rodadas) tem de
+bater com a regravação completa (recalcular_snapshots) depois de cada operação
+sobre os jogos: resultado com a rodada aberta, rodada fechando, correção,
+rodada reaberta, exclusão e rodada fechada fora de ordem. A carga inicial em SQL
+da migração também.
+"""
+
+import importlib.util
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import delete, select, text
+
+from app.crud.jogo import atualizar_jogo, atualizar_resultado, deletar_jogo
+from app.models import Competicao, Jogo, Liga, LigaMembro, LigaRodadaSnapshot, Palpite, Temporada, Time, Usuario
+from app.schemas.jogo import JogoResultadoUpdate, JogoUpdate
+from app.services.evolucao_ranking import recalcular_snapshots
+
+
+def _popular(db) -> dict:
+    competicao = Competicao(nome="Brasileirão", pais="BR", tipo="liga")
+    db.add(competicao)
+    db.flush()
+    temporada = Temporada(competicao_id=competicao.id, ano=2026, status="ativa")
+    times = [Time(nome=f"T{i}", sigla=f"T{i}") for i in range(4)]
+    usuarios = [Usuario(nome=f"U{i}", email_login=f"u{i}@x", senha="x", funcao="user") for i in range(3)]
+    sem_palpites = Usuario(nome="Sem palpites", email_login="sp@x", senha="x", funcao="user")
+    db.add_all([temporada, *times, *usuarios, sem_palpites])
+    db.flush()
+    ligas = [
+        Liga(nome=f"Liga{i}", temporada_id=temporada.id, codigo_convite=f"conv{i}", id_dono=usuarios[0].id)
+        for i in range(2)
+    ]
+    db.add_all(ligas)
+    db.flush()
+    db.add_all([
+        LigaMembro(liga_id=liga.id, usuario_id=u.id, papel="membro")
+        for liga in ligas for u in (*usuarios, sem_palpites)
+    ])
+
+    # 3 rodadas de 2 jogos
+    inicio = datetime.now(timezone.utc) + timedelta(days=1)
+    jogos = {}
+    for rodada in (1, 2, 3):
+        for i, (casa, fora) in enumerate(((0, 1), (2, 3))):
+            jogo = Jogo(
+                temporada_id=temporada.id, rodada=rodada, time_casa_id=times[casa].id, time_fora_id=times[fora].id,
+                data_hora=inicio + timedelta(days=rodada, hours=i),
+            )
+            db.add(jogo)
+            db.flush()
+            jogos[(rodada, i)] = jogo.id
+            for n, usuario in enumerate(usuarios):
+                for liga in ligas:
+                    db.add(Palpite(liga_id=liga.id, usuario_id=usuario.id, jogo_id=jogo.id,
+                                   placar_casa=(n + rodada) % 3, placar_fora=(n + i) % 2))
+    db.commit()
+    return {"temporada": temporada.id, "jogos": jogos}
+
+
+def _snapshots(db):
+    return sorted(
+        db.execute(
+            select(
+                LigaRodadaSnapshot.liga_id, LigaRodadaSnapshot.rodada, LigaRodadaSnapshot.usuario_id,
+                LigaRodadaSnapshot.posicao, LigaRodadaSnapshot.pontos, LigaRodadaSnapshot.pontos_rodada,
+            )
+        ).all()
+    )
+
+
+def _confere_com_recalculo(db, temporada_id):
+    incremental = _snapshots(db)
+    recalcular_snapshots(db, temporada_id)
+    completo = _snapshots(db)
+    db.rollback()
+    assert incremental == completo
+    return {rodada for _, rodada, *_ in incremental}
+
+
+def _resultado(db, jogo_id, casa, fora):
+    atualizar_resultado(db, db.get(Jogo, jogo_id), JogoResultadoUpdate(gols_casa=casa, gols_fora=fora))
+
+
+def test_snapshots_incrementais_batem_com_recalculo(db):
+    ids = _popular(db)
+    temporada_id, jogos = ids["temporada"], ids["jogos"]
+
+    _resultado(db, jogos[(1, 0)], 1, 0)
+    assert _confere_com_recalculo(db, temporada_id) == set()
+
+    _resultado(db, jogos[(1, 1)], 2, 2)
+    assert _confere_com_recalculo(db, temporada_id) == {1}
+
+    # rodada 3 fecha antes da 2 (jogo da 2 adiado)
+    _resultado(db, jogos[(3, 0)], 0, 1)
+    _resultado(db, jogos[(3, 1)], 1, 1)
+    assert _confere_com_recalculo(db, temporada_id) == {1, 3}
+
+    # cancelado também fecha a rodada
+    _resultado(db, jogos[(2, 0)], 2, 0)
+    atualizar_jogo(db, db.get(Jogo, jogos[(2, 1)]), JogoUpdate(status="cancelado"))
+    assert _confere_com_recalculo(db, temporada_id) == {1, 2, 3}
+
+    # correção de resultado numa rodada já fechada muda as posições seguintes
+    _resultado(db, jogos[(1, 0)], 0, 2)
+    assert _confere_com_recalculo(db, temporada_id) == {1, 2, 3}
+
+    # rodada reaberta
+    atualizar_jogo(db, db.get(Jogo, jogos[(3, 1)]), JogoUpdate(status="agendado"))
+    assert _confere_com_recalculo(db, temporada_id) == {1, 2}
+
+    # sem o jogo pendente, a rodada 3 fecha de novo
+    deletar_jogo(db, db.get(Jogo, jogos[(3, 1)]))
+    assert _confere_com_recalculo(db, temporada_id) == {1, 2, 3}
+
+
+def test_carga_inicial_da_migracao_bate_com_recalculo(db):
+    caminho = Path(__file__).resolve().parent.parent / "migrations" / "versions" / "c41e7b9a3d58_add_liga_rodada_snapshot.py"
+    spec = importlib.util.spec_from_file_location("migracao_snapshot", caminho)
+    migracao = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migracao)
+
+    ids = _popular(db)
+    jogos = ids["jogos"]
+    # rodada 1 fechada, 2 aberta com um jogo finalizado, 3 fechada com um cancelado
+    for chave, placar in (((1, 0), (1, 0)), ((1, 1), (2, 2)), ((2, 0), (0, 1)), ((3, 0), (3, 1))):
+        _resultado(db, jogos[chave], *placar)
+    atualizar_jogo(db, db.get(Jogo, jogos[(3, 1)]), JogoUpdate(status="cancelado"))
+
+    db.execute(delete(LigaRodadaSnapshot))
+    db.execute(text(migracao.CARGA_INICIAL))
+    assert _confere_com_recalculo(db, ids["temporada"]) == {1, 3}
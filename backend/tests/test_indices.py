@@ -0,0 +1,119 @@
+"""
+Os índices compostos de jogos e palpites são usados pelas consultas reais.
+
+Cada teste roda a função do app no SQLite dos testes, captura os SELECT/UPDATE
+que ela emitiu e confere no EXPLAIN QUERY PLAN que o índice esperado aparece.
+No SQLite, as UniqueConstraint viram sqlite_autoindex_<tabela>_N.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+
+from app.crud.jogo import listar_jogos
+from app.models import Competicao, Jogo, Liga, LigaMembro, Palpite, Temporada, Time, Usuario
+from app.services.liga_service import ranking_liga
+from app.services.palpites import _select_palpites_usuario_na_rodada, palpites_do_jogo_na_liga, pontuar_jogos
+
+
+@contextmanager
+def _capturar_planos(engine):
+    """Ao sair do bloco, `planos` tem o EXPLAIN QUERY PLAN de cada statement emitido."""
+    emitidos = []
+
+    def capturar(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "WITH")):
+            emitidos.append((statement, parameters))
+
+    planos: list[str] = []
+    event.listen(engine, "before_cursor_execute", capturar)
+    try:
+        yield planos
+    finally:
+        event.remove(engine, "before_cursor_execute", capturar)
+
+    with engine.connect() as conn:
+        for statement, parameters in emitidos:
+            linhas = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+            planos.append("\n".join(linha[-1] for linha in linhas))
+
+
+def _usa(planos: list[str], trecho: str) -> bool:
+    return any(trecho in plano for plano in planos)
+
+
+@pytest.fixture
+def dados(db):
+    competicao = Competicao(nome="Brasileirão", pais="BR", tipo="liga")
+    db.add(competicao)
+    db.flush()
+    temporada = Temporada(competicao_id=competicao.id, ano=2026, status="ativa")
+    db.add(temporada)
+    db.flush()
+    times = [Time(nome=f"Time {i}", sigla=f"T{i}") for i in range(4)]
+    usuarios = [Usuario(nome=f"Usuário {i}", email_login=f"u{i}@x", senha="x", funcao="user") for i in range(3)]
+    db.add_all(times + usuarios)
+    db.flush()
+    liga = Liga(nome="Liga", temporada_id=temporada.id, codigo_convite="conv", id_dono=usuarios[0].id)
+    db.add(liga)
+    db.flush()
+    db.add_all(LigaMembro(liga_id=liga.id, usuario_id=u.id, papel="membro") for u in usuarios)
+
+    agora = datetime.now(timezone.utc)
+    jogos = []
+    for rodada in (1, 2):
+        for k in range(2):
+            jogo = Jogo(
+                temporada_id=temporada.id, rodada=rodada,
+                time_casa_id=times[2 * k].id, time_fora_id=times[2 * k + 1].id,
+                data_hora=agora + timedelta(days=rodada, hours=k),
+            )
+            db.add(jogo)
+            jogos.append(jogo)
+    db.flush()
+    db.add_all(
+        Palpite(liga_id=liga.id, usuario_id=u.id, jogo_id=j.id, placar_casa=1, placar_fora=0)
+        for u in usuarios for j in jogos
+    )
+    db.commit()
+    return {"temporada": temporada.id, "liga": liga.id, "usuario": usuarios[0].id, "jogo": jogos[0].id}
+
+
+def test_ranking_conta_jogos_encerrados_por_temporada_e_status(db, banco, dados):
+    with _capturar_planos(banco) as planos:
+        ranking_liga(db, dados["liga"])
+    assert _usa(planos, "ix_jogos_temporada_status")
+
+
+def test_pontuar_jogo_busca_palpites_pelo_jogo(db, banco, dados):
+    jogo = db.get(Jogo, dados["jogo"])
+    jogo.gols_casa, jogo.gols_fora, jogo.status = 1, 0, "finalizado"
+    with _capturar_planos(banco) as planos:
+        pontuar_jogos(db, [jogo.id])
+        db.commit()
+    assert _usa(planos, "ix_palpites_jogo_liga_usuario")
+
+
+def test_palpites_do_jogo_na_liga_busca_o_palpite_de_cada_membro(db, banco, dados):
+    with _capturar_planos(banco) as planos:
+        palpites_do_jogo_na_liga(db, dados["liga"], dados["jogo"])
+    # parte dos membros da liga: cada palpite sai pela chave completa (liga, usuário, jogo)
+    assert _usa(planos, "palpites USING INDEX sqlite_autoindex_palpites_")
+
+
+def test_palpites_do_usuario_na_rodada(db, banco, dados):
+    with _capturar_planos(banco) as planos:
+        db.execute(_select_palpites_usuario_na_rodada(dados["liga"], dados["usuario"], 1)).all()
+    # jogos por (temporada_id, rodada) em uq_jogo_temporada_rodada_times e o
+    # palpite por (liga_id, usuario_id, jogo_id) em uq_palpite_liga_usuario_jogo
+    assert _usa(planos, "jogos USING INDEX sqlite_autoindex_jogos_")
+    assert _usa(planos, "palpites USING INDEX sqlite_autoindex_palpites_")
+
+
+def test_listagem_paginada_de_jogos_segue_data_hora_e_id(db, banco, dados):
+    with _capturar_planos(banco) as planos:
+        listar_jogos(db, limite=2)
+    assert _usa(planos, "ix_jogos_data_hora_id")
+
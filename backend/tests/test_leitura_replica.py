@@ -0,0 +1,134 @@
+"""
+Roteamento de leitura: com DATABASE_READ_URL, get_read_db/get_async_read_db
+leem da réplica e o resto (escritas, read-your-writes) fica no primário.
+
+A "réplica" é um segundo arquivo SQLite com os mesmos ids e nomes com sufixo,
+então cada resposta mostra de qual banco veio.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+import app.database as database
+from app.core.security import create_access_token
+from app.database import Base
+from app.main import app
+from app.models import Competicao, Jogo, Liga, LigaMembro, Palpite, Temporada, Time, Usuario
+
+SUFIXO = "-replica"
+
+
+def _popular(engine, sufixo: str = "") -> dict:
+    with Session(engine) as db:
+        competicao = Competicao(nome="Brasileirão", pais="BR", tipo="liga")
+        db.add(competicao)
+        db.flush()
+        temporada = Temporada(competicao_id=competicao.id, ano=2026, status="ativa")
+        db.add(temporada)
+        db.flush()
+        casa, fora = Time(nome=f"Casa{sufixo}", sigla="CAS"), Time(nome=f"Fora{sufixo}", sigla="FOR")
+        dono, membro = (
+            Usuario(nome=f"Dono{sufixo}", email_login="dono@x", senha="x", funcao="admin"),
+            Usuario(nome=f"Membro{sufixo}", email_login="membro@x", senha="x", funcao="user"),
+        )
+        db.add_all([casa, fora, dono, membro])
+        db.flush()
+        liga = Liga(nome="Liga", temporada_id=temporada.id, codigo_convite="conv", id_dono=dono.id)
+        db.add(liga)
+        db.flush()
+        db.add_all([
+            LigaMembro(liga_id=liga.id, usuario_id=dono.id, papel="dono"),
+            LigaMembro(liga_id=liga.id, usuario_id=membro.id, papel="membro"),
+        ])
+        jogo = Jogo(
+            temporada_id=temporada.id, rodada=1, time_casa_id=casa.id, time_fora_id=fora.id,
+            data_hora=datetime.now(timezone.utc) + timedelta(days=1),
+        )
+        db.add(jogo)
+        db.flush()
+        db.add(Palpite(liga_id=liga.id, usuario_id=dono.id, jogo_id=jogo.id, placar_casa=1, placar_fora=0))
+        db.commit()
+        return {"temporada": temporada.id, "liga": liga.id, "jogo": jogo.id, "membro": membro.id}
+
+
+@pytest.fixture
+def replica(banco, monkeypatch, tmp_path):
+    url = f"sqlite:///{tmp_path / 'replica.db'}"
+    replica_engine = create_engine(url, connect_args={"check_same_thread": False})
+    Base.metadata.drop_all(replica_engine)
+    Base.metadata.create_all(replica_engine)
+
+    # o mesmo que DATABASE_READ_URL no ambiente, sem reimportar app.database
+    monkeypatch.setitem(database.ReadSessionLocal.kw, "bind", replica_engine)
+    monkeypatch.setattr(database, "DATABASE_READ_URL", url)
+    monkeypatch.setattr(database, "ASYNC_DATABASE_READ_URL", database._url_async(url))
+    monkeypatch.setattr(database, "_async_read_engine", None)
+    monkeypatch.setattr(database, "_AsyncReadSessionLocal", None)
+
+    yield replica_engine
+
+    if database._async_read_engine is not None:
+        database._async_read_engine.sync_engine.dispose()
+    replica_engine.dispose()
+
+
+@pytest.fixture
+def ids(banco, replica):
+    primario = _popular(banco)
+    assert _popular(replica, SUFIXO) == primario
+    return primario
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+def _auth(usuario_id: int) -> dict:
+    return {"Authorization": "Bearer " + create_access_token({"sub": str(usuario_id), "funcao": "user"})}
+
+
+def test_rotas_de_leitura_usam_a_replica(client, ids):
+    headers = _auth(ids["membro"])
+
+    ranking = client.get(f"/servicos/{ids['liga']}/ranking", headers=headers)
+    assert ranking.status_code == 200
+    assert {linha["nome"] for linha in ranking.json()} == {f"Dono{SUFIXO}", f"Membro{SUFIXO}"}
+
+    jogos = client.get(f"/jogos?temporada_id={ids['temporada']}", headers=headers)
+    assert jogos.status_code == 200
+    assert jogos.json()[0]["time_casa"]["nome"] == f"Casa{SUFIXO}"
+
+    palpites = client.get(f"/palpites/ligas/{ids['liga']}/jogos/{ids['jogo']}", headers=headers)
+    assert palpites.status_code == 200
+    assert palpites.json()[0]["usuario_nome"] == f"Dono{SUFIXO}"
+
+
+def test_escritas_e_leitura_propria_ficam_no_primario(client, ids, banco, replica):
+    headers = _auth(ids["membro"])
+
+    assert client.get("/usuarios/me", headers=headers).json()["nome"] == "Membro"
+
+    r = client.put(
+        f"/palpites/ligas/{ids['liga']}/jogos/{ids['jogo']}/meu",
+        json={"placar_casa": 3, "placar_fora": 2},
+        headers=headers,
+    )
+    assert r.status_code == 200
+
+    consulta = select(Palpite.placar_casa, Palpite.placar_fora).where(
+        Palpite.usuario_id == ids["membro"], Palpite.jogo_id == ids["jogo"]
+    )
+    with Session(banco) as db:
+        assert db.execute(consulta).one() == (3, 2)
+    with Session(replica) as db:
+        assert db.execute(consulta).first() is None
+
+    minha_rodada = client.get(f"/palpites/{ids['liga']}/rodadas/1/usuarios/me/palpites", headers=headers)
+    assert minha_rodada.status_code == 200
+    assert (minha_rodada.json()[0]["palpite_casa"], minha_rodada.json()[0]["palpite_fora"]) == (3, 2)
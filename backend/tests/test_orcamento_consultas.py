@@ -0,0 +1,118 @@
+"""
+Orçamento de consultas SQL por rota: um N+1 (uma consulta por liga, jogo,
+membro...) estoura o limite já com a base pequena gerada aqui.
+
+A base e as requisições vêm de app/dados_carga.py (os mesmos do
+scripts/bench_api.py), com os caches desligados (pior caso, ver conftest.py).
+Ao mudar uma rota de propósito, ajuste o número em ORCAMENTOS no mesmo commit.
+"""
+
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+import app.services.push_scheduler as push_scheduler
+from app.dados_carga import Cenario, gerar_base, rearmar_alertas
+from app.database import Base, SessionLocal, engine
+from app.main import app
+from app.models import Jogo
+
+# máximo de consultas por requisição (inclui autenticação e commit)
+ORCAMENTOS = {
+    "ranking": 3,
+    "ranking_por_rodada": 4,
+    "pontuacao_acumulada": 5,
+    "evolucao_ranking": 6,
+    "palpites_rodada": 3,
+    "upsert_palpite": 9,
+    "upsert_palpites_rodada": 7,
+    "info_rodadas": 4,
+    "listar_jogos": 4,
+    # reivindica no outbox, envia fora da transação e conclui (marca enviados/reenvio)
+    "envia_alertas": 7,
+}
+
+# o tick do worker, fora de requisição (a rota só checa o segredo do cron, sem consulta)
+ORCAMENTO_TICK_ALERTAS = 7
+
+REPETICOES = 5
+
+
+@pytest.fixture(scope="module")
+def cenario():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    db = SessionLocal()
+    try:
+        gerar_base(db, usuarios=80, ligas=4, membros=20, rodadas_encerradas=5)
+        cenario = Cenario(db, "carga", random.Random(7))
+        cenario.jogos_da_rodada_aberta = list(db.execute(
+            select(Jogo.id).where(Jogo.temporada_id == cenario.temporada_id, Jogo.rodada == cenario.rodadas[-1])
+        ).scalars())
+    finally:
+        db.close()
+    return cenario
+
+
+@pytest.fixture
+def envio_fcm_falso(monkeypatch):
+    monkeypatch.setattr(push_scheduler, "enviar_mensagens", lambda mensagens: [dict.fromkeys(m["tokens"]) for m in mensagens])
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+def _requisicao(cenario, rota: str):
+    if rota in ("ranking", "palpites_rodada", "upsert_palpite", "info_rodadas", "envia_alertas"):
+        return cenario.requisicao(rota)
+
+    liga_id, usuario_id = cenario.rnd.choice(cenario.membros)
+    headers = cenario._auth(usuario_id)
+    rodada = cenario.rnd.choice(cenario.rodadas)
+    if rota == "ranking_por_rodada":
+        return "GET", f"/servicos/{liga_id}/{rodada}/ranking_por_rodada", headers, None
+    if rota == "pontuacao_acumulada":
+        return "GET", f"/servicos/{liga_id}/pontuacao_acumulada/todos?format=series", headers, None
+    if rota == "evolucao_ranking":
+        return "GET", f"/servicos/{liga_id}/evolucao_ranking", headers, None
+    if rota == "upsert_palpites_rodada":
+        corpo = [
+            {"jogo_id": jogo_id, "placar_casa": cenario.rnd.randint(0, 4), "placar_fora": cenario.rnd.randint(0, 4)}
+            for jogo_id in cenario.jogos_da_rodada_aberta
+        ]
+        return "PUT", f"/palpites/ligas/{liga_id}/rodadas/{cenario.rodadas[-1]}/meus", headers, corpo
+    if rota == "listar_jogos":
+        return "GET", f"/jogos?temporada_id={cenario.temporada_id}&rodada={rodada}", headers, None
+    raise ValueError(rota)
+
+
+@pytest.mark.parametrize("rota", list(ORCAMENTOS))
+def test_consultas_por_rota(rota, cenario, client, envio_fcm_falso):
+    contagens = []
+    for _ in range(REPETICOES):
+        if rota == "envia_alertas":
+            with SessionLocal() as db:
+                rearmar_alertas(db, cenario.temporada_id, 3)
+        metodo, caminho, headers, corpo = _requisicao(cenario, rota)
+        r = client.request(metodo, caminho, headers=headers, json=corpo)
+        assert r.status_code < 400, f"{metodo} {caminho}: {r.status_code} {r.text}"
+        contagens.append(int(r.headers["x-db-queries"]))
+
+    assert max(contagens) <= ORCAMENTOS[rota], f"{rota}: {contagens} consultas, orçamento {ORCAMENTOS[rota]}"
+
+
+def test_consultas_do_tick_de_alertas(cenario, envio_fcm_falso, orcamento_consultas):
+    db = SessionLocal()
+    try:
+        rearmar_alertas(db, cenario.temporada_id, 3)
+        with orcamento_consultas(ORCAMENTO_TICK_ALERTAS):
+            stats = push_scheduler.run_missing_bet_alerts(db)
+    finally:
+        db.close()
+    assert stats["jogos"] == 3
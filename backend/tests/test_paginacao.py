@@ -0,0 +1,93 @@
+"""
+Paginação por cursor (core/paginacao.py): percorrer /jogos e /usuarios página a
+página devolve cada item uma vez, na ordem da chave, sem buracos, inclusive com
+empates em data_hora e jogos sem data (no fim). Cursor malformado é 400.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.paginacao import codificar_cursor
+from app.core.security import create_access_token
+from app.main import app
+from app.models import Competicao, Jogo, Temporada, Time, Usuario
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def cenario(db):
+    competicao = Competicao(nome="Brasileirão", pais="BR", tipo="liga")
+    db.add(competicao)
+    db.flush()
+    temporada = Temporada(competicao_id=competicao.id, ano=2026, status="ativa")
+    casa, fora = Time(nome="Casa", sigla="CAS"), Time(nome="Fora", sigla="FOR")
+    admin = Usuario(nome="Admin", email_login="admin@x", senha="x", funcao="admin")
+    usuarios = [Usuario(nome=f"U{i}", email_login=f"u{i}@x", senha="x", funcao="user") for i in range(6)]
+    db.add_all([temporada, casa, fora, admin, *usuarios])
+    db.flush()
+
+    # três jogos no mesmo horário (empate na data_hora), dois sem data, um antes de todos
+    inicio = datetime(2026, 5, 10, 16, tzinfo=timezone.utc)
+    datas = [inicio + timedelta(hours=2), inicio, None, inicio, inicio, None, inicio - timedelta(days=1)]
+    jogos = [
+        Jogo(temporada_id=temporada.id, rodada=rodada, time_casa_id=casa.id, time_fora_id=fora.id, data_hora=data)
+        for rodada, data in enumerate(datas, start=1)
+    ]
+    db.add_all(jogos)
+    db.commit()
+
+    esperado = sorted(jogos, key=lambda j: (j.data_hora is None, j.data_hora or inicio, j.id))
+    return {
+        "temporada": temporada.id,
+        "jogos": [j.id for j in esperado],
+        "usuarios": sorted(u.id for u in (admin, *usuarios)),
+        "headers": {"Authorization": f"Bearer {create_access_token({'sub': str(admin.id), 'funcao': 'admin'})}"},
+    }
+
+
+def _percorrer(client, url: str, headers: dict, limit: int) -> list[int]:
+    ids, cursor = [], None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        r = client.get(url, params=params, headers=headers)
+        assert r.status_code == 200, r.text
+        pagina = r.json()
+        assert len(pagina["items"]) <= limit
+        ids.extend(item["id"] for item in pagina["items"])
+        cursor = pagina["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 7, 50])
+def test_jogos_pagina_a_pagina(client, cenario, limit):
+    url = f"/jogos?temporada_id={cenario['temporada']}"
+    assert _percorrer(client, url, cenario["headers"], limit) == cenario["jogos"]
+
+
+@pytest.mark.parametrize("limit", [1, 4, 50])
+def test_usuarios_pagina_a_pagina(client, cenario, limit):
+    assert _percorrer(client, "/usuarios/", cenario["headers"], limit) == cenario["usuarios"]
+
+
+@pytest.mark.parametrize(
+    ("url", "cursor"),
+    [
+        ("/jogos", "isso-nao-e-um-cursor!"),
+        ("/jogos", codificar_cursor([1])),  # tamanho errado
+        ("/jogos", codificar_cursor(["ontem", 1])),  # data inválida
+        ("/usuarios/", codificar_cursor(["abc"])),
+        ("/usuarios/", "e30"),  # {} em base64: não é lista
+    ],
+)
+def test_cursor_malformado_e_400(client, cenario, url, cursor):
+    r = client.get(url, params={"cursor": cursor}, headers=cenario["headers"])
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Cursor inválido."
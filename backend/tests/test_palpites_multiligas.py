@@ -0,0 +1,74 @@
+"""
+PUT /palpites/temporadas/{temporada_id}/meus: liga_ids vazio é rejeitado (422)
+e, com ligas de que o usuário não é membro, o 403 diz quais são.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.security import create_access_token
+from app.main import app
+from app.models import Competicao, Jogo, Liga, LigaMembro, Palpite, Temporada, Time, Usuario
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def cenario(db):
+    competicao = Competicao(nome="Brasileirão", pais="BR", tipo="liga")
+    db.add(competicao)
+    db.flush()
+    temporada = Temporada(competicao_id=competicao.id, ano=2026, status="ativa")
+    casa, fora = Time(nome="Casa", sigla="CAS"), Time(nome="Fora", sigla="FOR")
+    usuario = Usuario(nome="Ana", email_login="ana@x", senha="x", funcao="user")
+    db.add_all([temporada, casa, fora, usuario])
+    db.flush()
+    ligas = [
+        Liga(nome=f"Liga{i}", temporada_id=temporada.id, codigo_convite=f"conv{i}", id_dono=usuario.id)
+        for i in range(3)
+    ]
+    jogo = Jogo(
+        temporada_id=temporada.id, rodada=1, time_casa_id=casa.id, time_fora_id=fora.id,
+        data_hora=datetime.now(timezone.utc) + timedelta(days=1),
+    )
+    db.add_all([*ligas, jogo])
+    db.flush()
+    # membro só das duas primeiras
+    db.add_all([LigaMembro(liga_id=liga.id, usuario_id=usuario.id, papel="membro") for liga in ligas[:2]])
+    db.commit()
+    return {
+        "temporada": temporada.id,
+        "ligas": [liga.id for liga in ligas],
+        "jogo": jogo.id,
+        "headers": {"Authorization": f"Bearer {create_access_token({'sub': str(usuario.id), 'funcao': 'user'})}"},
+    }
+
+
+def _put(client, cenario, liga_ids):
+    corpo = {"palpites": [{"jogo_id": cenario["jogo"], "placar_casa": 1, "placar_fora": 0}], "liga_ids": liga_ids}
+    return client.put(f"/palpites/temporadas/{cenario['temporada']}/meus", json=corpo, headers=cenario["headers"])
+
+
+def test_liga_ids_vazio_e_422(client, cenario, db):
+    assert _put(client, cenario, []).status_code == 422
+    assert db.query(Palpite).count() == 0
+
+
+def test_ligas_de_que_nao_e_membro_sao_informadas(client, cenario, db):
+    membro_1, membro_2, fora = cenario["ligas"]
+    inexistente = fora + 100
+
+    r = _put(client, cenario, [membro_1, fora, inexistente])
+    assert r.status_code == 403
+    assert r.json()["detail"].endswith(f": {fora}, {inexistente}.")
+    assert db.query(Palpite).count() == 0
+
+    r = _put(client, cenario, [membro_1, membro_2])
+    assert r.status_code == 200
+    assert r.json() == {"liga_ids": [membro_1, membro_2], "palpites_gravados": 2}
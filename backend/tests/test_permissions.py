@@ -0,0 +1,42 @@
+"""
+require_admin: as duas variantes (usuário do banco ou claim do token, conforme
+AUTH_TRUST_TOKEN_FUNCAO) devolvem o mesmo Admin e barram quem não é admin.
+"""
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.permissions import Admin, _require_admin_pelo_token, _require_admin_pelo_usuario
+from app.core.security import create_access_token
+from app.models import Usuario
+
+
+@pytest.fixture
+def usuarios(db):
+    admin = Usuario(nome="Admin", email_login="admin@x", senha="x", funcao="admin")
+    comum = Usuario(nome="Comum", email_login="comum@x", senha="x", funcao="user")
+    db.add_all([admin, comum])
+    db.commit()
+    return {u.funcao: u.id for u in (admin, comum)}
+
+
+def _headers(usuario_id: int, funcao: str) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(usuario_id), 'funcao': funcao})}"}
+
+
+@pytest.mark.parametrize("dependencia", [_require_admin_pelo_usuario, _require_admin_pelo_token])
+def test_require_admin_devolve_admin(dependencia, usuarios):
+    app = FastAPI()
+
+    @app.get("/quem")
+    def quem(admin: Admin = Depends(dependencia)):
+        assert isinstance(admin, Admin)
+        return {"id": admin.id, "funcao": admin.funcao}
+
+    with TestClient(app) as client:
+        r = client.get("/quem", headers=_headers(usuarios["admin"], "admin"))
+        assert r.status_code == 200
+        assert r.json() == {"id": usuarios["admin"], "funcao": "admin"}
+
+        assert client.get("/quem", headers=_headers(usuarios["user"], "user")).status_code == 403
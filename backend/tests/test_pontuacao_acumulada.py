@@ -0,0 +1,84 @@
+"""
+pontuacao_acumulada_series_todos (matriz usuários × rodadas com cumsum) tem de
+dar o mesmo que a resposta flat de pontuacao_acumulada_todos convertida para
+series, numa temporada com rodada sem jogos, rodada com jogo ainda aberto,
+membro sem palpites e membro que só palpitou em jogos não finalizados.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.crud.jogo import atualizar_resultado
+from app.models import Competicao, Jogo, Liga, LigaMembro, Palpite, Temporada, Time, Usuario
+from app.routes.liga_services import to_series
+from app.schemas.jogo import JogoResultadoUpdate
+from app.services.liga_service import pontuacao_acumulada_series_todos, pontuacao_acumulada_todos
+
+
+@pytest.fixture
+def liga(db):
+    competicao = Competicao(nome="Brasileirão", pais="BR", tipo="liga")
+    db.add(competicao)
+    db.flush()
+    temporada = Temporada(competicao_id=competicao.id, ano=2026, status="ativa")
+    times = [Time(nome=f"T{i}", sigla=f"T{i}") for i in range(4)]
+    palpiteiros = [Usuario(nome=f"U{i}", email_login=f"u{i}@x", senha="x", funcao="user") for i in range(3)]
+    sem_palpites = Usuario(nome="Sem palpites", email_login="sp@x", senha="x", funcao="user")
+    so_abertos = Usuario(nome="Só abertos", email_login="sa@x", senha="x", funcao="user")
+    db.add_all([temporada, *times, *palpiteiros, sem_palpites, so_abertos])
+    db.flush()
+    ligas = [
+        Liga(nome=f"Liga{i}", temporada_id=temporada.id, codigo_convite=f"conv{i}", id_dono=palpiteiros[0].id)
+        for i in range(2)
+    ]
+    db.add_all(ligas)
+    db.flush()
+    liga, outra = ligas
+    db.add_all([
+        LigaMembro(liga_id=liga.id, usuario_id=u.id, papel="membro")
+        for u in (*palpiteiros, sem_palpites, so_abertos)
+    ])
+    db.add(LigaMembro(liga_id=outra.id, usuario_id=palpiteiros[0].id, papel="membro"))
+
+    # rodada 1 e 3 com jogos finalizados, 2 sem jogos, 4 com um jogo ainda aberto
+    inicio = datetime.now(timezone.utc) + timedelta(days=1)
+    jogos = {}
+    for rodada in (1, 3, 4):
+        for i, (casa, fora) in enumerate(((0, 1), (2, 3))):
+            jogo = Jogo(
+                temporada_id=temporada.id, rodada=rodada, time_casa_id=times[casa].id, time_fora_id=times[fora].id,
+                data_hora=inicio + timedelta(days=rodada, hours=i),
+            )
+            db.add(jogo)
+            db.flush()
+            jogos[(rodada, i)] = jogo.id
+            for n, usuario in enumerate(palpiteiros):
+                # U2 não palpita na rodada 3: ponto da série repete o acumulado
+                if n == 2 and rodada == 3:
+                    continue
+                db.add(Palpite(liga_id=liga.id, usuario_id=usuario.id, jogo_id=jogo.id,
+                               placar_casa=(n + rodada) % 3, placar_fora=(n + i) % 2))
+            # palpite em outra liga não entra
+            db.add(Palpite(liga_id=outra.id, usuario_id=palpiteiros[0].id, jogo_id=jogo.id, placar_casa=1, placar_fora=0))
+    db.add(Palpite(liga_id=liga.id, usuario_id=so_abertos.id, jogo_id=jogos[(4, 1)], placar_casa=0, placar_fora=0))
+    db.commit()
+
+    for chave, (gols_casa, gols_fora) in {(1, 0): (1, 0), (1, 1): (2, 2), (3, 0): (0, 1), (3, 1): (1, 1), (4, 0): (2, 1)}.items():
+        atualizar_resultado(db, db.get(Jogo, jogos[chave]), JogoResultadoUpdate(gols_casa=gols_casa, gols_fora=gols_fora))
+    return liga.id
+
+
+def _por_nome(series: dict) -> tuple[int, dict]:
+    return series["max_rodada"], {s["nome"]: s["data"] for s in series["series"]}
+
+
+@pytest.mark.parametrize("rodada", [None, 1, 2, 3, 4, 6])
+def test_series_com_cumsum_igual_ao_flat(liga, db, rodada):
+    flat = pontuacao_acumulada_todos(db, liga, rodada)
+    series = pontuacao_acumulada_series_todos(db, liga, rodada)
+
+    max_rodada = rodada or 4
+    assert _por_nome(series) == _por_nome(to_series(flat, max_rodada))
+    assert set(_por_nome(series)[1]) == {"U0", "U1", "U2"}
+    assert all(len(data) == max_rodada for data in _por_nome(series)[1].values())
@@ -0,0 +1,49 @@
+from itertools import product
+
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, insert, select
+
+from app.services.palpites import calcular_pontuacao, calcular_pontuacao_sql
+
+MAX_GOLS = 10
+
+
+def test_calcular_pontuacao_sql_igual_a_regra_python():
+    """Todos os pares palpite x resultado de 0x0 a 10x10, avaliados pelo SQLite."""
+    metadata = MetaData()
+    casos = Table(
+        "casos",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("palpite_casa", Integer),
+        Column("palpite_fora", Integer),
+        Column("real_casa", Integer),
+        Column("real_fora", Integer),
+    )
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+
+    placares = list(product(range(MAX_GOLS + 1), repeat=2))
+    linhas = [
+        {"palpite_casa": pc, "palpite_fora": pf, "real_casa": rc, "real_fora": rf}
+        for (pc, pf), (rc, rf) in product(placares, placares)
+    ]
+
+    with engine.begin() as conn:
+        conn.execute(insert(casos), linhas)
+        resultado = conn.execute(
+            select(
+                casos.c.palpite_casa,
+                casos.c.palpite_fora,
+                casos.c.real_casa,
+                casos.c.real_fora,
+                calcular_pontuacao_sql(casos.c.palpite_casa, casos.c.palpite_fora, casos.c.real_casa, casos.c.real_fora),
+            )
+        ).all()
+
+    assert len(resultado) == len(placares) ** 2
+    divergentes = [
+        (pc, pf, rc, rf, pontos)
+        for pc, pf, rc, rf, pontos in resultado
+        if pontos != calcular_pontuacao(pc, pf, rc, rf)
+    ]
+    assert divergentes == []
@@ -0,0 +1,135 @@
+"""
+Outbox dos alertas de palpite pendente (services/push_scheduler.py): um alerta
+é reivindicado uma vez só mesmo com dois ticks sobrepostos; o envio que dá certo
+grava sent_at e solta claimed_at; tokens com falha são reenviados (só eles) até
+PUSH_MAX_TENTATIVAS e depois o alerta é descartado.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import app.services.push_scheduler as push_scheduler
+from app.crud.push_alert_schedule import agendar_alertas
+from app.database import SessionLocal
+from app.models import Competicao, Jogo, Liga, LigaMembro, PushAlertLog, PushAlertSchedule, PushToken, Temporada, Time, Usuario
+
+
+@pytest.fixture
+def alerta(db):
+    """Jogo em 20 minutos, dois membros sem palpite (tokens "ok" e "falha") e o alerta de 15 min vencido."""
+    competicao = Competicao(nome="Brasileirão", pais="BR", tipo="liga")
+    db.add(competicao)
+    db.flush()
+    temporada = Temporada(competicao_id=competicao.id, ano=2026, status="ativa")
+    casa, fora = Time(nome="Casa", sigla="CAS"), Time(nome="Fora", sigla="FOR")
+    usuarios = [Usuario(nome=f"U{i}", email_login=f"u{i}@x", senha="x", funcao="user") for i in range(2)]
+    db.add_all([temporada, casa, fora, *usuarios])
+    db.flush()
+    liga = Liga(nome="Liga", temporada_id=temporada.id, codigo_convite="conv", id_dono=usuarios[0].id)
+    agora = datetime.now(timezone.utc)
+    jogo = Jogo(
+        temporada_id=temporada.id, rodada=1, time_casa_id=casa.id, time_fora_id=fora.id,
+        data_hora=agora + timedelta(minutes=20),
+    )
+    db.add_all([liga, jogo])
+    db.flush()
+    db.add_all([LigaMembro(liga_id=liga.id, usuario_id=u.id, papel="membro") for u in usuarios])
+    db.add_all([
+        PushToken(user_id=usuarios[0].id, token="ok", platform="web", is_active=True),
+        PushToken(user_id=usuarios[1].id, token="falha", platform="web", is_active=True),
+    ])
+    agendar_alertas(db, [jogo], agora)
+    alerta = db.query(PushAlertSchedule).filter_by(jogo_id=jogo.id, offset_min=15).one()
+    alerta.due_at = agora - timedelta(seconds=1)
+    db.commit()
+    return alerta.id
+
+
+@pytest.fixture
+def envios(monkeypatch):
+    """Troca o FCM: registra os tokens de cada tick com envio e falha para os de `envios.falhar`."""
+
+    class Envios(list):
+        falhar: set[str] = set()
+        durante = None  # chamado no meio do envio (tick sobreposto)
+
+    registro = Envios()
+
+    def enviar(mensagens):
+        if mensagens:
+            registro.append(sorted(t for m in mensagens for t in m["tokens"]))
+        if registro.durante:
+            registro.durante()
+        return [
+            {t: RuntimeError("FCM fora") if t in registro.falhar else None for t in m["tokens"]}
+            for m in mensagens
+        ]
+
+    monkeypatch.setattr(push_scheduler, "enviar_mensagens", enviar)
+    return registro
+
+
+def _linha(db, alerta_id):
+    db.expire_all()
+    return db.get(PushAlertSchedule, alerta_id)
+
+
+def test_envio_com_sucesso_grava_sent_at_e_solta_reivindicacao(alerta, envios, db):
+    stats = push_scheduler.run_missing_bet_alerts(db)
+
+    assert stats["enviados"] == 2
+    assert envios == [["falha", "ok"]]
+    linha = _linha(db, alerta)
+    assert linha.sent_at is not None
+    assert linha.claimed_at is None
+    assert linha.tokens_pendentes is None
+    assert linha.attempts == 1
+    assert db.query(PushAlertLog).count() == 1
+
+    # nada mais a enviar
+    assert push_scheduler.run_missing_bet_alerts(db)["jogos"] == 0
+    assert len(envios) == 1
+
+
+def test_ticks_sobrepostos_reivindicam_uma_vez(alerta, envios, db):
+    segundo = {}
+
+    def outro_tick():
+        # outro worker roda enquanto o primeiro ainda está enviando
+        envios.durante = None
+        with SessionLocal() as outra:
+            segundo.update(push_scheduler.run_missing_bet_alerts(outra))
+            assert _linha(outra, alerta).claimed_at is not None
+
+    envios.durante = outro_tick
+    push_scheduler.run_missing_bet_alerts(db)
+
+    assert segundo["jogos"] == 0
+    assert envios == [["falha", "ok"]]
+    assert _linha(db, alerta).sent_at is not None
+
+
+def test_falha_reenvia_so_os_tokens_com_erro_e_desiste(alerta, envios, db, monkeypatch):
+    monkeypatch.setattr(push_scheduler, "PUSH_MAX_TENTATIVAS", 2)
+    envios.falhar = {"falha"}
+
+    stats = push_scheduler.run_missing_bet_alerts(db)
+    assert (stats["enviados"], stats["reenvios"]) == (1, 1)
+    linha = _linha(db, alerta)
+    assert linha.sent_at is None
+    assert linha.claimed_at is None
+    assert [g["tokens"] for g in linha.tokens_pendentes] == [["falha"]]
+
+    # segunda e última tentativa: só o token que falhou, e o alerta é descartado
+    stats = push_scheduler.run_missing_bet_alerts(db)
+    assert stats["descartados"] == 1
+    assert envios == [["falha", "ok"], ["falha"]]
+    linha = _linha(db, alerta)
+    assert linha.sent_at is not None
+    assert linha.claimed_at is None
+    assert linha.tokens_pendentes is None
+    assert linha.attempts == 2
+
+    assert push_scheduler.run_missing_bet_alerts(db)["jogos"] == 0
+    assert db.query(PushAlertLog).count() == 1
@@ -0,0 +1,50 @@
+"""
+Cache de usuários (core/user_cache.py): o hash da senha não entra no cache, e
+uma instância montada a partir do cache não apaga nem regrava a senha no banco.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.core.user_cache as user_cache
+from app.core.cache import TTLCache
+from app.main import app
+from app.models import Usuario
+
+
+@pytest.fixture
+def cache_ligado(banco, monkeypatch):
+    monkeypatch.setattr(user_cache, "_cache", TTLCache(60, 100))
+    return user_cache._cache
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+def _login(client, senha: str):
+    return client.post("/auth/login", data={"username": "ana@x", "password": senha})
+
+
+def test_senha_fora_do_cache_e_preservada(cache_ligado, client, db):
+    assert client.post("/usuarios/", json={"nome": "Ana", "email_login": "ana@x", "senha": "segredo1"}).status_code == 200
+    token = _login(client, "segredo1").json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # cache vazio: a leitura vai ao banco e preenche
+    assert client.get("/usuarios/me", headers=headers).json()["nome"] == "Ana"
+    usuario_id = db.query(Usuario.id).filter(Usuario.email_login == "ana@x").scalar()
+    dados = cache_ligado.get(usuario_id)
+    assert dados is not None and "senha" not in dados
+
+    # acerto: instância do cache alterada e commitada sem tocar na senha
+    assert client.put("/usuarios/me", json={"nome": "Ana Maria"}, headers=headers).status_code == 200
+    assert _login(client, "segredo1").status_code == 200
+
+    # e trocando a senha por ela
+    client.get("/usuarios/me", headers=headers)
+    assert client.put("/usuarios/me", json={"senha": "segredo2"}, headers=headers).status_code == 200
+    assert _login(client, "segredo1").status_code == 401
+    assert _login(client, "segredo2").status_code == 200